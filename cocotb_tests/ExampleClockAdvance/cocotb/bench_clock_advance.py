@@ -0,0 +1,149 @@
+"""Clock-advance strategy microbenchmarks on the Example counter.
+
+Each benchmark advances the counter by the same BENCH_CYCLES from reset
+using a different strategy and reports simulated cycles per wall-clock
+second. The counter itself is the check that the distance was covered, so
+the numbers are comparable across strategies and across RyuSim releases:
+
+  - bench_rising_edge: one `await RisingEdge(clk)` per cycle, i.e. one
+    scheduler callback into Python per cycle (the worst case)
+  - bench_clock_cycles: `ClockCycles(clk, n)` for each size in CHUNK_SIZES
+  - bench_timer: `Timer` jumps of n clock periods for each size in
+    CHUNK_SIZES; no edge callbacks reach Python at all
+  - bench_logging: ClockCycles chunks with an INFO log per chunk (as
+    test_first_milestone does) versus logs throttled to LOG_EVERY cycles
+
+They run as the ExampleClockAdvance benchmark design (the Example RTL), so
+the Example functional tests keep their own duration baseline. Results are
+written through tb_common.metrics, so run_benchmarks.py stores them in the
+result's "metrics" field, one group per strategy:
+
+    {"clock_cycles_1000": {"cycles": 100000, "wall_seconds": 0.21,
+                           "cycles_per_sec": 476190.5, "awaits": 100,
+                           "us_per_await": 2100.0}}
+
+`us_per_await` divides the wall time by the number of awaits, which for
+chunk size 1 approximates the per-callback scheduler overhead.
+"""
+
+import time
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge, ClockCycles, Timer
+
+from tb_common.metrics import record_metrics
+
+CLOCK_PERIOD_NS = 10
+BENCH_CYCLES = 100_000            # well below DONE_COUNT, so the counter never freezes
+CHUNK_SIZES = (1, 10, 100, 1_000, 10_000, BENCH_CYCLES)
+LOG_CHUNK = 100
+LOG_EVERY = 10_000
+
+
+async def reset_dut(dut):
+    """Hold rst_n low for 5 cycles; returns with cnt=0 (see test_example)."""
+    dut.rst_n.value = 0
+    await ClockCycles(dut.clk, 5)
+    dut.rst_n.value = 1
+    await RisingEdge(dut.clk)
+
+
+async def measure(dut, name, advance):
+    """Reset, time `advance()` and record its metrics under `name`.
+
+    `advance` is an async callable returning the number of awaits it made.
+    """
+    await reset_dut(dut)
+    start = time.perf_counter()
+    awaits = await advance()
+    wall = time.perf_counter() - start
+
+    # A Timer jump ends exactly on a clock edge, so the counter may not have
+    # been updated for that edge yet
+    cycles = int(dut.cnt.value)
+    assert BENCH_CYCLES - 1 <= cycles <= BENCH_CYCLES, \
+        f"{name}: expected cnt={BENCH_CYCLES}, got {cycles}"
+
+    rate = BENCH_CYCLES / wall if wall > 0 else 0.0
+    dut._log.info("%-20s %10.0f cycles/s  %8d awaits  %.3fs", name, rate, awaits, wall)
+    record_metrics(
+        name,
+        cycles=BENCH_CYCLES,
+        wall_seconds=wall,
+        cycles_per_sec=rate,
+        awaits=awaits,
+        us_per_await=wall * 1e6 / awaits,
+    )
+    return rate
+
+
+@cocotb.test()
+async def bench_rising_edge(dut):
+    """One RisingEdge await per cycle."""
+    cocotb.start_soon(Clock(dut.clk, CLOCK_PERIOD_NS, unit="ns").start())
+
+    async def advance():
+        edge = RisingEdge(dut.clk)
+        for _ in range(BENCH_CYCLES):
+            await edge
+        return BENCH_CYCLES
+
+    await measure(dut, "rising_edge", advance)
+
+
+@cocotb.test()
+async def bench_clock_cycles(dut):
+    """ClockCycles in increasing chunk sizes."""
+    cocotb.start_soon(Clock(dut.clk, CLOCK_PERIOD_NS, unit="ns").start())
+
+    for chunk in CHUNK_SIZES:
+        async def advance(chunk=chunk):
+            for _ in range(BENCH_CYCLES // chunk):
+                await ClockCycles(dut.clk, chunk)
+            return BENCH_CYCLES // chunk
+
+        await measure(dut, f"clock_cycles_{chunk}", advance)
+
+
+@cocotb.test()
+async def bench_timer(dut):
+    """Timer jumps of whole clock periods in increasing chunk sizes."""
+    cocotb.start_soon(Clock(dut.clk, CLOCK_PERIOD_NS, unit="ns").start())
+
+    for chunk in CHUNK_SIZES:
+        async def advance(chunk=chunk):
+            jump = Timer(chunk * CLOCK_PERIOD_NS, unit="ns")
+            for _ in range(BENCH_CYCLES // chunk):
+                await jump
+            return BENCH_CYCLES // chunk
+
+        await measure(dut, f"timer_{chunk}", advance)
+
+
+@cocotb.test()
+async def bench_logging(dut):
+    """ClockCycles chunks with per-chunk versus throttled INFO logging."""
+    cocotb.start_soon(Clock(dut.clk, CLOCK_PERIOD_NS, unit="ns").start())
+
+    async def unthrottled():
+        elapsed = 0
+        for _ in range(BENCH_CYCLES // LOG_CHUNK):
+            await ClockCycles(dut.clk, LOG_CHUNK)
+            elapsed += LOG_CHUNK
+            dut._log.info("cnt=%d / %d", elapsed, BENCH_CYCLES)
+        return BENCH_CYCLES // LOG_CHUNK
+
+    async def throttled():
+        elapsed = 0
+        for _ in range(BENCH_CYCLES // LOG_CHUNK):
+            await ClockCycles(dut.clk, LOG_CHUNK)
+            elapsed += LOG_CHUNK
+            if elapsed % LOG_EVERY == 0:
+                dut._log.info("cnt=%d / %d", elapsed, BENCH_CYCLES)
+        return BENCH_CYCLES // LOG_CHUNK
+
+    loud = await measure(dut, f"log_every_{LOG_CHUNK}", unthrottled)
+    quiet = await measure(dut, f"log_every_{LOG_EVERY}", throttled)
+    if loud > 0:
+        record_metrics("logging", throttled_speedup=quiet / loud)
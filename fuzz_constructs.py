@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""fuzz_constructs.py — Differential fuzzing of combinational SV construct tests.
+
+Drives the same seeded random vectors through RyuSim and a Verilator
+reference for each combinational DUT in uhdm_tests/, compares every output
+sample, and shrinks mismatching vectors to minimal reproducers.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import yaml
+
+from run_tests import TESTS_DIR, get_ryusim_version
+from tb_common.fuzz_vectors import corner_values, generate_block, record_layout
+
+REPO_ROOT = Path(__file__).resolve().parent
+DEFAULT_CATEGORY = "combinational"
+DEFAULT_VECTORS = 1_000_000
+DEFAULT_BLOCK = 4096
+DEFAULT_TIMEOUT = 1800
+REFERENCE_SIM = "verilator"
+CLOCK_PORTS = {"clk", "clock", "clk_i"}
+MAX_SHRINK_CANDIDATES = 128  # per failing vector per minimization round
+
+
+def strip_comments(text):
+    """Remove // and /* */ comments from SystemVerilog source."""
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    return re.sub(r"//[^\n]*", "", text)
+
+
+def parse_ports(sv_text, top_module):
+    """Return [(direction, name), ...] from an ANSI-style module header.
+
+    Only names and directions are taken from the source. Widths are read from
+    the simulator handles at run time, which also covers typedef'd ports.
+    """
+    text = strip_comments(sv_text)
+    match = re.search(rf"\bmodule\s+{re.escape(top_module)}\b", text)
+    if not match:
+        return []
+    pos = match.end()
+
+    # Skip an optional parameter list: #( ... )
+    rest = text[pos:].lstrip()
+    pos = len(text) - len(rest)
+    if rest.startswith("#"):
+        pos = text.index("(", pos)
+        pos = _matching_paren(text, pos) + 1
+    start = text.index("(", pos)
+    end = _matching_paren(text, start)
+    header = text[start + 1:end]
+
+    ports = []
+    direction = None
+    for decl in header.split(","):
+        decl = decl.strip()
+        if not decl:
+            continue
+        head = re.match(r"(input|output|inout)\b", decl)
+        if head:
+            direction = head.group(1)
+        names = re.findall(r"[A-Za-z_][A-Za-z0-9_$]*", re.sub(r"\[[^\]]*\]", "", decl))
+        if direction and names:
+            ports.append((direction, names[-1]))
+    return ports
+
+
+def _matching_paren(text, open_pos):
+    """Return the index of the parenthesis closing the one at open_pos."""
+    depth = 0
+    for i in range(open_pos, len(text)):
+        if text[i] == "(":
+            depth += 1
+        elif text[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+    raise ValueError("unbalanced parentheses in module header")
+
+
+def discover_targets(prefix=DEFAULT_CATEGORY):
+    """Return test directories under uhdm_tests/<prefix> that have a Makefile."""
+    base = TESTS_DIR / prefix
+    if not base.is_dir():
+        return []
+    return sorted(c.parent for c in base.rglob("config.yaml") if (c.parent / "Makefile").exists())
+
+
+def run_simulator(test_path, sim, spec, timeout):
+    """Run tb_common.fuzz_dut under one simulator.
+
+    Returns (meta, bin_path, elapsed, error). meta is None on failure.
+    """
+    build_dir = test_path.resolve() / f"sim_build_fuzz_{sim}"
+    build_dir.mkdir(exist_ok=True)
+    spec = dict(spec, output=str(build_dir / "fuzz"))
+    spec_file = build_dir / "fuzz_spec.json"
+    spec_file.write_text(json.dumps(spec))
+
+    env = dict(os.environ)
+    env["FUZZ_SPEC"] = str(spec_file)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    env["COCOTB_RESULTS_FILE"] = str(build_dir / "results.xml")
+
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(
+            ["make", f"SIM={sim}", "MODULE=tb_common.fuzz_dut", f"SIM_BUILD={build_dir}"],
+            capture_output=True,
+            text=True,
+            cwd=str(test_path),
+            env=env,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return None, None, time.perf_counter() - start, f"{sim} timed out ({timeout}s)"
+    except FileNotFoundError:
+        return None, None, time.perf_counter() - start, "make not found on PATH"
+    elapsed = time.perf_counter() - start
+
+    meta_file = build_dir / "fuzz.json"
+    if result.returncode != 0 or not meta_file.exists():
+        return None, None, elapsed, f"{sim} run failed:\n{result.stdout[-2000:]}{result.stderr[-2000:]}"
+    return json.loads(meta_file.read_text()), build_dir / "fuzz.bin", elapsed, None
+
+
+def record_size(out_widths):
+    """Return the byte size of one output sample record."""
+    out_bytes, mask_bytes = record_layout(out_widths)
+    return sum(out_bytes) + mask_bytes
+
+
+def decode_record(record, names, widths):
+    """Decode one output sample record into {name: int or "X"}."""
+    out_bytes, _ = record_layout(widths)
+    xmask = int.from_bytes(record[sum(out_bytes):], "little")
+    values = {}
+    offset = 0
+    for i, (name, nbytes) in enumerate(zip(names, out_bytes)):
+        if xmask & (1 << i):
+            values[name] = "X"
+        else:
+            values[name] = int.from_bytes(record[offset:offset + nbytes], "little")
+        offset += nbytes
+    return values
+
+
+def compare_outputs(path_a, path_b, rec_size, block, limit):
+    """Compare two sample files block by block.
+
+    Returns (mismatch count, first `limit` mismatching vector indices).
+    """
+    chunk = rec_size * block
+    count = 0
+    indices = []
+    base = 0
+    with open(path_a, "rb") as fa, open(path_b, "rb") as fb:
+        while True:
+            a = fa.read(chunk)
+            b = fb.read(chunk)
+            if not a and not b:
+                break
+            if a != b:
+                n = max(len(a), len(b)) // rec_size
+                for i in range(n):
+                    lo = i * rec_size
+                    if a[lo:lo + rec_size] != b[lo:lo + rec_size]:
+                        count += 1
+                        if len(indices) < limit:
+                            indices.append(base + i)
+            base += len(a) // rec_size
+    return count, indices
+
+
+def regenerate_vectors(seed, in_widths, block, indices):
+    """Replay the seeded stimulus and return {index: vector} for `indices`."""
+    wanted = set(indices)
+    found = {}
+    if not wanted:
+        return found
+    rng = random.Random(seed)
+    corners = [corner_values(w) for w in in_widths]
+    last = max(wanted)
+    base = 0
+    while base <= last:
+        vectors = generate_block(rng, in_widths, corners, block)
+        for i, vector in enumerate(vectors):
+            if base + i in wanted:
+                found[base + i] = vector
+        base += block
+    return found
+
+
+def shrink_candidates(vector):
+    """Return simpler variants of a vector: zero one port, or clear one bit."""
+    candidates = []
+    for i, value in enumerate(vector):
+        if value == 0:
+            continue
+        candidates.append(vector[:i] + (0,) + vector[i + 1:])
+        bit = 0
+        while value >> bit:
+            if (value >> bit) & 1 and value != 1 << bit:
+                candidates.append(vector[:i] + (value & ~(1 << bit),) + vector[i + 1:])
+            bit += 1
+    return candidates[:MAX_SHRINK_CANDIDATES]
+
+
+def vector_weight(vector):
+    """Ordering key for minimization: fewest set bits, then smallest values."""
+    return (sum(bin(v).count("1") for v in vector), vector)
+
+
+def run_explicit(test_path, vectors, spec, timeout):
+    """Run an explicit vector list through both simulators.
+
+    Returns ({sim: [record bytes, ...]}, error).
+    """
+    vector_file = test_path.resolve() / "sim_build_fuzz_vectors.json"
+    vector_file.write_text(json.dumps([list(v) for v in vectors]))
+    spec = dict(spec, vector_file=str(vector_file), vectors=len(vectors))
+    records = {}
+    try:
+        for sim in ("ryusim", REFERENCE_SIM):
+            meta, bin_path, _, error = run_simulator(test_path, sim, spec, timeout)
+            if error:
+                return None, error
+            size = record_size(list(meta["outputs"].values()))
+            data = bin_path.read_bytes()
+            records[sim] = [data[i:i + size] for i in range(0, len(data), size)]
+    finally:
+        vector_file.unlink(missing_ok=True)
+    return records, None
+
+
+def minimize(test_path, failing, spec, timeout, rounds):
+    """Greedily shrink failing vectors while they still mismatch.
+
+    `failing` maps vector index to input tuple. Returns ({index: (vector,
+    ryusim record, reference record)}, error). Vectors that cannot be
+    shrunk are returned unchanged with records set to None.
+    """
+    current = {idx: (vec, None, None) for idx, vec in failing.items()}
+    for _ in range(rounds):
+        candidates = []
+        owners = []
+        for idx, (vec, _, _) in current.items():
+            for cand in shrink_candidates(vec):
+                candidates.append(cand)
+                owners.append(idx)
+        if not candidates:
+            break
+
+        records, error = run_explicit(test_path, candidates, spec, timeout)
+        if error:
+            return current, error
+
+        best = {}
+        for cand, idx, rec_a, rec_b in zip(candidates, owners, records["ryusim"], records[REFERENCE_SIM]):
+            if rec_a != rec_b and (idx not in best or vector_weight(cand) < vector_weight(best[idx][0])):
+                best[idx] = (cand, rec_a, rec_b)
+        if not best:
+            break
+        current.update(best)
+    return current, None
+
+
+def fuzz_test(test_path, vectors, block, seed, timeout, max_reproducers, minimize_rounds):
+    """Fuzz a single DUT against the reference simulator.
+
+    Returns a dict with fuzz results.
+    """
+    test_name = str(test_path.relative_to(TESTS_DIR))
+    start_time = time.perf_counter()
+    result = {
+        "test": test_name,
+        "path": str(test_path),
+        "status": "error",
+        "vectors": vectors,
+        "simulators": {},
+        "mismatches": 0,
+        "reproducers": [],
+        "duration": 0,
+        "stderr": "",
+    }
+
+    with open(test_path / "config.yaml") as f:
+        config = yaml.safe_load(f) or {}
+    top_module = config.get("top_module", "dut")
+
+    ports = []
+    for sv_file in sorted(test_path.glob("*.sv")) + sorted(test_path.glob("*.v")):
+        ports = parse_ports(sv_file.read_text(), top_module)
+        if ports:
+            break
+    inputs = [name for direction, name in ports if direction == "input"]
+    outputs = [name for direction, name in ports if direction == "output"]
+
+    if not inputs or not outputs:
+        result["status"] = "skipped"
+        result["stderr"] = f"Could not parse ports of module {top_module}"
+        return result
+    if CLOCK_PORTS & set(inputs):
+        result["status"] = "skipped"
+        result["stderr"] = "Sequential DUT (has a clock input)"
+        return result
+
+    spec = {
+        "inputs": inputs,
+        "outputs": outputs,
+        "seed": seed,
+        "vectors": vectors,
+        "block": block,
+        "vector_file": None,
+    }
+
+    metas = {}
+    bins = {}
+    for sim in ("ryusim", REFERENCE_SIM):
+        meta, bin_path, elapsed, error = run_simulator(test_path, sim, spec, timeout)
+        if error:
+            result["stderr"] = error
+            result["duration"] = time.perf_counter() - start_time
+            return result
+        metas[sim] = meta
+        bins[sim] = bin_path
+        result["simulators"][sim] = {
+            "elapsed": elapsed,
+            "drive_seconds": meta["drive_seconds"],
+            "vectors_per_sec": meta["vectors_per_sec"],
+        }
+
+    ours, ref = metas["ryusim"], metas[REFERENCE_SIM]
+    if ours["inputs"] != ref["inputs"] or ours["outputs"] != ref["outputs"]:
+        result["status"] = "failed"
+        result["stderr"] = (
+            f"Port widths differ: ryusim {ours['inputs']} -> {ours['outputs']}, "
+            f"{REFERENCE_SIM} {ref['inputs']} -> {ref['outputs']}"
+        )
+        result["duration"] = time.perf_counter() - start_time
+        return result
+
+    out_names = list(ours["outputs"])
+    out_widths = list(ours["outputs"].values())
+    in_names = list(ours["inputs"])
+    in_widths = list(ours["inputs"].values())
+
+    count, indices = compare_outputs(
+        bins["ryusim"], bins[REFERENCE_SIM], record_size(out_widths), block, max_reproducers,
+    )
+    result["mismatches"] = count
+    result["status"] = "failed" if count else "passed"
+
+    if indices:
+        original = regenerate_vectors(seed, in_widths, block, indices)
+        shrunk, error = minimize(test_path, original, spec, timeout, minimize_rounds)
+        if error:
+            result["stderr"] = f"Minimization aborted: {error}"
+
+        size = record_size(out_widths)
+        with open(bins["ryusim"], "rb") as fa, open(bins[REFERENCE_SIM], "rb") as fb:
+            for idx in indices:
+                vec, rec_a, rec_b = shrunk[idx]
+                if rec_a is None:
+                    fa.seek(idx * size)
+                    fb.seek(idx * size)
+                    rec_a, rec_b = fa.read(size), fb.read(size)
+                result["reproducers"].append({
+                    "vector_index": idx,
+                    "original_inputs": {n: hex(v) for n, v in zip(in_names, original[idx])},
+                    "inputs": {n: hex(v) for n, v in zip(in_names, vec)},
+                    "ryusim": decode_record(rec_a, out_names, out_widths),
+                    REFERENCE_SIM: decode_record(rec_b, out_names, out_widths),
+                })
+
+    result["duration"] = time.perf_counter() - start_time
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Differential fuzzing of combinational SV construct tests (RyuSim vs Verilator)",
+    )
+    parser.add_argument("--all", action="store_true", help=f"Fuzz all tests under {DEFAULT_CATEGORY}/")
+    parser.add_argument("--category", type=str, help="Fuzz tests under a path prefix (e.g., combinational/operators)")
+    parser.add_argument("--test", type=str, help="Fuzz a specific test (e.g., combinational/operators/add_sub)")
+    parser.add_argument("--vectors", type=int, default=DEFAULT_VECTORS, help=f"Vectors per DUT (default: {DEFAULT_VECTORS})")
+    parser.add_argument("--block", type=int, default=DEFAULT_BLOCK, help=f"Vectors per generated block (default: {DEFAULT_BLOCK})")
+    parser.add_argument("--seed", type=int, help="Random seed (default: time-based, recorded in output)")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT, help=f"Per-simulator run timeout in seconds (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--max-reproducers", type=int, default=5, help="Mismatching vectors to minimize and report per DUT (default: 5)")
+    parser.add_argument("--minimize-rounds", type=int, default=8, help="Shrinking rounds per reproducer (default: 8, 0 disables)")
+    parser.add_argument("--output", type=str, help="Output JSON file path")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Print per-DUT progress to stderr")
+    args = parser.parse_args()
+
+    if not args.all and not args.category and not args.test:
+        parser.print_help()
+        sys.exit(0)
+
+    if args.test:
+        test_path = TESTS_DIR / args.test
+        if not test_path.is_dir():
+            print(f"Error: test '{args.test}' not found", file=sys.stderr)
+            sys.exit(1)
+        tests = [test_path]
+    else:
+        tests = discover_targets(args.category or DEFAULT_CATEGORY)
+
+    seed = args.seed if args.seed is not None else int(time.time())
+    ryusim_version = get_ryusim_version()
+    timestamp = datetime.now(timezone.utc).isoformat()
+
+    results = []
+    for test in tests:
+        result = fuzz_test(
+            test,
+            vectors=args.vectors,
+            block=args.block,
+            seed=seed,
+            timeout=args.timeout,
+            max_reproducers=args.max_reproducers,
+            minimize_rounds=args.minimize_rounds,
+        )
+        results.append(result)
+        if args.verbose:
+            rates = ", ".join(
+                f"{sim} {s['vectors_per_sec']:.0f} vec/s" for sim, s in result["simulators"].items()
+            )
+            print(
+                f"  {result['test']}: {result['status']} "
+                f"({result['mismatches']} mismatches, {rates or 'no runs'}, {result['duration']:.2f}s)",
+                file=sys.stderr,
+            )
+
+    summary = {
+        "runner": "fuzz_constructs",
+        "total": len(results),
+        "passed": sum(1 for r in results if r["status"] == "passed"),
+        "failed": sum(1 for r in results if r["status"] == "failed"),
+        "error": sum(1 for r in results if r["status"] == "error"),
+        "skipped": sum(1 for r in results if r["status"] == "skipped"),
+        "seed": seed,
+        "vectors": args.vectors,
+        "reference": REFERENCE_SIM,
+        "ryusim_version": ryusim_version,
+        "timestamp": timestamp,
+        "results": results,
+    }
+
+    print(json.dumps(summary, indent=2))
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(summary, indent=2) + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+    if summary["failed"] > 0 or summary["error"] > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""generate_dashboard.py — Render a static HTML performance dashboard from the results history.
+
+The history (default results/) is first synced into the SQLite results
+database (harness/resultsdb.py): only JSON files that are new or changed
+since the last generation are parsed, so regenerating stays fast as the
+history grows. The page is then built from the database and needs no server
+or external assets:
+
+    compile / execute     run_benchmarks time per design and RyuSim version
+    cycles/s              testbench rate metrics (tb_common.metrics *_per_sec)
+    peak RSS              highest compile-phase RSS of the make process tree
+    RyuSim / Verilator    RyuSim make time over Verilator make time
+                          (runs with --compare-verilator)
+    pass rate             uhdm_tests results per category, passed or
+                          expected_fail over all
+
+Each cell is the median over the passed results of that version (the
+pass-rate table counts all results); each row ends with a sparkline and the
+change from the previous version. Only runs with each runner's baseline
+configuration are shown by default ("default" for run_benchmarks, "level1"
+for run_tests), so ccache, instrumented or level 2 runs do not skew the
+trends; --configuration picks another label and --all-configurations mixes
+them all.
+
+Usage:
+    python generate_dashboard.py
+    python generate_dashboard.py --configuration ccache --versions 6 --output results/dashboard.html
+"""
+
+import argparse
+import html
+import statistics
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from harness.history import DEFAULT_HISTORY
+from harness.resultsdb import DEFAULT_CONFIGURATION, DEFAULT_DB, connect, sync
+
+DEFAULT_OUTPUT = Path("results/dashboard.html")
+DEFAULT_VERSIONS = 10
+
+# (section title, measure, unit, scale); lower is better for all of these
+TIME_SECTIONS = (
+    ("Compile time", "compile", "s", 1),
+    ("Execute time", "execute", "s", 1),
+    ("Peak RSS", "peak_rss_kb", "MiB", 1 / 1024),
+)
+RATE_SUFFIX = "_per_sec"
+PASS_STATUSES = ("passed", "expected_fail")
+# Configuration label of each runner's plain run (run_tests labels by --level)
+BASELINE_CONFIGURATIONS = {"run_benchmarks": DEFAULT_CONFIGURATION, "run_tests": "level1"}
+
+
+def _where(configuration=None, host=None):
+    clauses = []
+    params = []
+    for column, value in (("runs.configuration", configuration), ("runs.host", host)):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    return (" AND ".join(clauses) or "1"), params
+
+
+def versions(db, runner, limit, configuration=None, host=None):
+    """Return the newest `limit` RyuSim versions `runner` ran, oldest first (by first run)."""
+    where, params = _where(configuration, host)
+    rows = db.execute(
+        f"SELECT ryusim_version, MIN(timestamp) AS first FROM runs WHERE runner = ? AND {where}"
+        f" GROUP BY ryusim_version ORDER BY first DESC LIMIT ?",
+        [runner] + params + [limit],
+    ).fetchall()
+    return [row["ryusim_version"] for row in reversed(rows)]
+
+
+def benchmark_measures(db, configuration=None, host=None):
+    """Return {measure: {design: {version: [values]}}} for passed run_benchmarks results.
+
+    Besides the stored measures this adds "verilator_ratio" (step.make /
+    step.verilator of the same result).
+    """
+    where, params = _where(configuration, host)
+    rows = db.execute(
+        "SELECT results.id, results.name, runs.ryusim_version, measures.name AS measure, measures.value"
+        " FROM results JOIN runs ON runs.id = results.run_id"
+        " JOIN measures ON measures.result_id = results.id"
+        " WHERE runs.runner = 'run_benchmarks' AND results.status = 'passed'"
+        " AND (measures.name IN ('compile', 'execute', 'peak_rss_kb', 'step.make', 'step.verilator')"
+        f" OR measures.name LIKE 'metric.%') AND {where}",
+        params,
+    )
+    data = {}
+    pairs = {}
+    for row in rows:
+        design, version, measure = row["name"], row["ryusim_version"], row["measure"]
+        if measure.startswith("metric.") and not measure.endswith(RATE_SUFFIX):
+            continue
+        if measure.startswith("step."):
+            pairs.setdefault(row["id"], [design, version, {}])[2][measure] = row["value"]
+            continue
+        data.setdefault(measure, {}).setdefault(design, {}).setdefault(version, []).append(row["value"])
+    for design, version, steps in pairs.values():
+        if steps.get("step.make") and steps.get("step.verilator"):
+            ratio = steps["step.make"] / steps["step.verilator"]
+            data.setdefault("verilator_ratio", {}).setdefault(design, {}).setdefault(version, []).append(ratio)
+    return data
+
+
+def category_pass_rates(db, configuration=None, host=None):
+    """Return {category: {version: [passing, total]}} over all run_tests results."""
+    where, params = _where(configuration, host)
+    rows = db.execute(
+        "SELECT results.name, results.status, runs.ryusim_version FROM results"
+        f" JOIN runs ON runs.id = results.run_id WHERE runs.runner = 'run_tests' AND {where}",
+        params,
+    )
+    rates = {}
+    for row in rows:
+        category = (row["name"] or "").split("/", 1)[0]
+        counts = rates.setdefault(category, {}).setdefault(row["ryusim_version"], [0, 0])
+        counts[0] += row["status"] in PASS_STATUSES
+        counts[1] += 1
+    return rates
+
+
+def _sparkline(values, width=120, height=24):
+    points = [(i, v) for i, v in enumerate(values) if v is not None]
+    if len(points) < 2:
+        return ""
+    low = min(v for _, v in points)
+    high = max(v for _, v in points)
+    span = (high - low) or 1
+    step = width / (len(values) - 1)
+    coords = " ".join(f"{i * step:.1f},{height - 2 - (v - low) / span * (height - 4):.1f}" for i, v in points)
+    return (
+        f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<polyline fill="none" stroke="#2a6" stroke-width="1.5" points="{coords}"/></svg>'
+    )
+
+
+def _change(values, higher_is_better=False):
+    present = [v for v in values if v is not None]
+    if len(present) < 2 or not present[-2]:
+        return ""
+    change = present[-1] / present[-2] - 1
+    worse = change < 0 if higher_is_better else change > 0
+    colour = "#c33" if worse and abs(change) >= 0.05 else "#333"
+    return f'<span style="color:{colour}">{change:+.1%}</span>'
+
+
+def _format(value, unit):
+    if value is None:
+        return ""
+    if unit == "%":
+        return f"{value:.0%}"
+    if abs(value) >= 1e4:
+        return f"{value:.3g}"
+    return f"{value:.2f}"
+
+
+def render_table(title, rows, version_list, unit, higher_is_better=False):
+    """Return one dashboard section: rows of (label, [value per version])."""
+    if not rows:
+        return f"<h2>{html.escape(title)}</h2><p>No data.</p>"
+    header = "".join(f"<th>{html.escape(v)}</th>" for v in version_list)
+    body = []
+    for label, values in rows:
+        cells = "".join(f"<td>{_format(v, unit)}</td>" for v in values)
+        body.append(
+            f"<tr><th>{html.escape(label)}</th>{cells}"
+            f"<td>{_sparkline(values)}</td><td>{_change(values, higher_is_better)}</td></tr>"
+        )
+    return (
+        f"<h2>{html.escape(title)} ({html.escape(unit)})</h2>"
+        f"<table><tr><th></th>{header}<th>trend</th><th>last change</th></tr>{''.join(body)}</table>"
+    )
+
+
+def _median_rows(series, version_list, scale=1):
+    rows = []
+    for label in sorted(series):
+        by_version = series[label]
+        rows.append((label, [
+            statistics.median(by_version[v]) * scale if by_version.get(v) else None for v in version_list
+        ]))
+    return rows
+
+
+def render_dashboard(db, version_limit=DEFAULT_VERSIONS, configurations=None, host=None):
+    """Return the dashboard page for the runs in `db`.
+
+    `configurations` maps a runner to the configuration label shown for it
+    (default: BASELINE_CONFIGURATIONS); a runner missing from it is not
+    filtered by configuration.
+    """
+    if configurations is None:
+        configurations = BASELINE_CONFIGURATIONS
+    configuration = configurations.get("run_benchmarks")
+    sections = []
+    bench_versions = versions(db, "run_benchmarks", version_limit, configuration, host)
+    measures = benchmark_measures(db, configuration, host)
+    for title, measure, unit, scale in TIME_SECTIONS:
+        sections.append(render_table(
+            title, _median_rows(measures.get(measure, {}), bench_versions, scale), bench_versions, unit,
+        ))
+
+    rates = {}
+    for measure, designs in measures.items():
+        if measure.startswith("metric."):
+            name = measure[len("metric."):]
+            for design, by_version in designs.items():
+                rates[f"{design} {name}"] = by_version
+    sections.append(render_table(
+        "Simulated rate", _median_rows(rates, bench_versions), bench_versions, "per second", higher_is_better=True,
+    ))
+    sections.append(render_table(
+        "RyuSim / Verilator time", _median_rows(measures.get("verilator_ratio", {}), bench_versions),
+        bench_versions, "ratio",
+    ))
+
+    configuration = configurations.get("run_tests")
+    test_versions = versions(db, "run_tests", version_limit, configuration, host)
+    pass_rows = []
+    for category, by_version in sorted(category_pass_rates(db, configuration, host).items()):
+        pass_rows.append((category, [
+            by_version[v][0] / by_version[v][1] if v in by_version else None for v in test_versions
+        ]))
+    sections.append(render_table("uhdm_tests pass rate", pass_rows, test_versions, "%", higher_is_better=True))
+
+    labels = sorted({label for label in configurations.values() if label})
+    filters = ", ".join(f"{k} {v}" for k, v in (("configuration", " / ".join(labels)), ("host", host)) if v)
+    generated = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>RyuSim performance</title><style>"
+        "body{font-family:sans-serif;margin:1.5em}table{border-collapse:collapse;margin-bottom:1.5em}"
+        "td,th{border:1px solid #ccc;padding:2px 8px;text-align:right}th{background:#f4f4f4}"
+        "</style></head><body><h1>RyuSim performance</h1>"
+        f"<p>Generated {generated}{' — ' + html.escape(filters) if filters else ''}. "
+        "Medians of passed results per RyuSim version; last change is against the previous version.</p>"
+        + "".join(sections)
+        + "</body></html>\n"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a static HTML performance dashboard from results history")
+    parser.add_argument("history", nargs="*",
+                        help=f"Runner JSON files, directories or globs to sync first (default: {DEFAULT_HISTORY}/)")
+    parser.add_argument("--db", type=str, default=str(DEFAULT_DB), help=f"Results database (default: {DEFAULT_DB})")
+    parser.add_argument("--output", type=str, default=str(DEFAULT_OUTPUT),
+                        help=f"HTML file to write (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--versions", type=int, default=DEFAULT_VERSIONS,
+                        help=f"Number of most recent RyuSim versions shown (default: {DEFAULT_VERSIONS})")
+    parser.add_argument("--configuration", type=str,
+                        help="Only runs with this configuration label (default: each runner's baseline, "
+                             + ", ".join(f"{label} for {runner}" for runner, label in BASELINE_CONFIGURATIONS.items())
+                             + ")")
+    parser.add_argument("--all-configurations", action="store_true",
+                        help="Mix the runs of every configuration label")
+    parser.add_argument("--host", type=str, help="Only runs on this host")
+    args = parser.parse_args()
+
+    db = connect(args.db)
+    parsed, added = sync(db, args.history or [DEFAULT_HISTORY])
+    print(f"Parsed {parsed} new or changed files, added {added} runs", file=sys.stderr)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if args.all_configurations:
+        configurations = {}
+    elif args.configuration:
+        configurations = {runner: args.configuration for runner in BASELINE_CONFIGURATIONS}
+    else:
+        configurations = BASELINE_CONFIGURATIONS
+    output.write_text(render_dashboard(db, args.versions, configurations, args.host))
+    print(f"Dashboard written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,26 @@
 """generate_golden_vcds.py -- Generate golden VCD files using Verilator."""
 
 import argparse
+import json
 import subprocess
 import sys
 import shutil
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 
+from harness.resultsdb import DEFAULT_CONFIGURATION, add_db_arguments, record_run
+from harness.sharding import add_shard_arguments, merge_results, select_shard
+
 TESTS_DIR = Path("uhdm_tests")
 GOLDEN_DIR = Path("golden")
 
 
 def generate_golden(test_path, force=False):
-    """Run a test with Verilator and copy the VCD to golden/."""
+    """Run a test with Verilator and copy the VCD to golden/.
+
+    Returns "generated", "skipped" or "failed".
+    """
     rel_path = test_path.relative_to(TESTS_DIR)
     golden_path = GOLDEN_DIR / rel_path
 
@@ -20,18 +29,18 @@ def generate_golden(test_path, force=False):
     vcd_files = list(golden_path.glob("*.vcd"))
     if vcd_files and not force:
         print(f"  SKIP {rel_path} (golden exists, use --force to regenerate)")
-        return True
+        return "skipped"
 
     # Check Verilator is available
     if not shutil.which("verilator"):
         print("Error: verilator not found on PATH", file=sys.stderr)
-        return False
+        return "failed"
 
     # Check test has a Makefile
     makefile = test_path / "Makefile"
     if not makefile.exists():
         print(f"  SKIP {rel_path} (no Makefile)")
-        return True
+        return "skipped"
 
     print(f"  GENERATING {rel_path}...")
 
@@ -46,7 +55,7 @@ def generate_golden(test_path, force=False):
 
     if result.returncode != 0:
         print(f"  FAIL {rel_path}: {result.stderr[:200]}")
-        return False
+        return "failed"
 
     # Find VCD output
     sim_build = test_path / "sim_build"
@@ -54,7 +63,7 @@ def generate_golden(test_path, force=False):
 
     if not vcd_candidates:
         print(f"  FAIL {rel_path}: no VCD file generated")
-        return False
+        return "failed"
 
     # Copy to golden directory
     golden_path.mkdir(parents=True, exist_ok=True)
@@ -66,7 +75,45 @@ def generate_golden(test_path, force=False):
     # Clean up sim_build
     subprocess.run(["make", "clean"], cwd=str(test_path), capture_output=True)
 
-    return True
+    return "generated"
+
+
+def build_summary(results, timestamp, shard=None):
+    """Build the summary dict written to --output."""
+    summary = {
+        "runner": "generate_golden_vcds",
+        "total": len(results),
+        "generated": sum(1 for r in results if r["status"] == "generated"),
+        "skipped": sum(1 for r in results if r["status"] == "skipped"),
+        "failed": sum(1 for r in results if r["status"] == "failed"),
+        "timestamp": timestamp,
+        "results": results,
+    }
+    if shard:
+        summary["shard"] = shard
+    return summary
+
+
+def write_summary(summary, output):
+    """Write the summary JSON to a file."""
+    output_path = Path(output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(summary, indent=2) + "\n")
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+def merge_main(args):
+    """Combine per-shard JSON outputs into a single summary."""
+    summaries = [json.loads(Path(p).read_text()) for p in args.inputs]
+    results, _, timestamp = merge_results(summaries)
+    summary = build_summary(results, timestamp)
+    configuration = next((s["configuration"] for s in summaries if s.get("configuration")), DEFAULT_CONFIGURATION)
+    record_run(summary, args, configuration)
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        write_summary(summary, args.output)
+    if summary["failed"] > 0:
+        sys.exit(1)
 
 
 def main():
@@ -89,8 +136,20 @@ def main():
     parser.add_argument(
         "--force", action="store_true", help="Regenerate even if golden exists"
     )
+    parser.add_argument("--output", type=str, help="Output JSON file path")
+    add_shard_arguments(parser)
+    add_db_arguments(parser)
+
+    subparsers = parser.add_subparsers(dest="command")
+    merge_parser = subparsers.add_parser("merge", help="Combine per-shard JSON outputs into one summary")
+    merge_parser.add_argument("inputs", nargs="+", help="Per-shard JSON files")
+    merge_parser.add_argument("--output", type=str, help="Output JSON file path")
     args = parser.parse_args()
 
+    if args.command == "merge":
+        merge_main(args)
+        return
+
     if not args.all and not args.category and not args.test:
         parser.print_help()
         sys.exit(0)
@@ -110,17 +169,34 @@ def main():
     else:
         tests = sorted(p.parent for p in TESTS_DIR.rglob("config.yaml"))
 
+    if args.shard:
+        try:
+            tests = select_shard(tests, args.shard, args.history, runner="generate_golden_vcds")
+        except ValueError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            sys.exit(1)
+
     print(f"Generating golden VCDs for {len(tests)} tests...")
+    timestamp = datetime.now(timezone.utc).isoformat()
 
-    passed = 0
-    failed = 0
+    results = []
     for test in tests:
-        if generate_golden(test, force=args.force):
-            passed += 1
-        else:
-            failed += 1
-
+        start_time = time.perf_counter()
+        status = generate_golden(test, force=args.force)
+        results.append({
+            "test": str(test.relative_to(TESTS_DIR)),
+            "path": str(test),
+            "status": status,
+            "duration": time.perf_counter() - start_time,
+        })
+
+    summary = build_summary(results, timestamp, shard=args.shard)
+    passed = summary["generated"] + summary["skipped"]
+    failed = summary["failed"]
     print(f"\nDone: {passed} succeeded, {failed} failed")
+    record_run(summary, args, "force" if args.force else DEFAULT_CONFIGURATION)
+    if args.output:
+        write_summary(summary, args.output)
     if failed > 0:
         sys.exit(1)
 
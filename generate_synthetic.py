@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""generate_synthetic.py — Write a synthetic design of a chosen size (see harness/synthetic.py).
+
+The design directory gets rtl/ (one file per leaf module plus synth_top),
+a cocotb test checking out_data against the generator's Python model, a
+Makefile and a config.yaml recording the parameters, so it builds and runs
+like any other design:
+
+    make -C build/synthetic/<name>
+    python run_scaling.py --design build/synthetic/<name> --tune -v
+
+Usage:
+    python generate_synthetic.py
+    python generate_synthetic.py --modules 16 --instances 256 --lanes 32 --depth 8
+    python generate_synthetic.py --flops 4 --fanout 3 --output-dir build/synthetic/deep
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from harness.synthetic import CHECK_CYCLES, DEFAULT_PARAMS, PARAMS, design_name, generate
+
+DEFAULT_OUTPUT_ROOT = Path("build/synthetic")
+
+PARAM_HELP = {
+    "modules": "Distinct leaf module definitions",
+    "instances": "Leaf instances in synth_top (at least --modules)",
+    "lanes": "Iterations of each leaf's generate loop",
+    "flops": "Pipeline registers per lane",
+    "depth": "Combinational levels before each register",
+    "fanout": "Previous-stage lanes feeding each lane",
+    "width": "Data path width in bits",
+    "seed": "Seed for the constants and the test stimulus",
+}
+
+
+def add_param_arguments(parser):
+    """Add one option per synthetic design parameter."""
+    for name in PARAMS:
+        parser.add_argument(f"--{name}", type=int, default=DEFAULT_PARAMS[name],
+                            help=f"{PARAM_HELP[name]} (default: {DEFAULT_PARAMS[name]})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic design of a chosen size")
+    add_param_arguments(parser)
+    parser.add_argument("--check-cycles", type=int, default=CHECK_CYCLES,
+                        help=f"Cycles the cocotb test checks against the model (default: {CHECK_CYCLES})")
+    parser.add_argument("--output-dir", type=str,
+                        help=f"Design directory (default: {DEFAULT_OUTPUT_ROOT}/<name from the parameters>)")
+    args = parser.parse_args()
+
+    params = {name: getattr(args, name) for name in PARAMS}
+    try:
+        design_dir = Path(args.output_dir) if args.output_dir else DEFAULT_OUTPUT_ROOT / design_name(params)
+        size = generate(params, design_dir, args.check_cycles)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps({"design": str(design_dir), "size": size}, indent=2))
+    print(f"Design written to {design_dir}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
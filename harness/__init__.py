@@ -0,0 +1,5 @@
+"""harness — shared helpers for the RyuSim validation runner scripts.
+
+Used by run_benchmarks.py, run_tests.py and generate_golden_vcds.py. These
+modules run in the runner process, never inside a cocotb simulation.
+"""
@@ -0,0 +1,152 @@
+"""Size of a RyuSim build: generated C++, object files and the simulator binary.
+
+The C++ RyuSim generates drives both compile time and, once linked, the
+instruction-cache footprint of every simulated cycle. inspect_build() walks
+a design's build directories after `make` and records:
+
+    cpp        generated C++ sources/headers: files, lines, bytes
+    objects    object files: count, total bytes and the largest ones
+    binary     the largest ELF executable or shared object, with its
+               Berkeley-style text/data/bss sizes (as `size` prints them)
+
+compare() checks these against the same design in an earlier run (see
+load_baseline()) and lists every metric that grew by more than a threshold.
+"""
+
+import struct
+from pathlib import Path
+
+from harness.history import iter_summaries
+
+CPP_SUFFIXES = {".cpp", ".cc", ".cxx", ".h", ".hpp"}
+BUILD_DIRS = ("sim_build", "obj_dir")  # cocotb's SIM_BUILD and `ryusim compile` output
+TOP_OBJECTS = 10
+DEFAULT_GROWTH_THRESHOLD = 0.05
+
+# Metrics compared against the baseline, as paths into the build dict
+GROWTH_METRICS = (
+    ("cpp", "files"),
+    ("cpp", "lines"),
+    ("cpp", "bytes"),
+    ("objects", "bytes"),
+    ("binary", "text"),
+    ("binary", "data"),
+    ("binary", "bss"),
+)
+
+_SHF_WRITE = 0x1
+_SHF_ALLOC = 0x2
+_SHT_NOBITS = 8
+
+
+def elf_sizes(path):
+    """Return {"text", "data", "bss"} of an ELF file, or None if it is not ELF.
+
+    Allocated sections are classified as `size` (Berkeley format) does:
+    NOBITS is bss, writable is data, everything else (code and read-only
+    data) is text.
+    """
+    with open(path, "rb") as f:
+        ident = f.read(16)
+        if len(ident) < 16 or ident[:4] != b"\x7fELF":
+            return None
+        is64 = ident[4] == 2
+        endian = "<" if ident[5] == 1 else ">"
+        if is64:
+            header = struct.unpack(endian + "HHIQQQIHHHHHH", f.read(48))
+            shoff, shentsize, shnum = header[5], header[10], header[11]
+            section = endian + "IIQQQQIIQQ"
+        else:
+            header = struct.unpack(endian + "HHIIIIIHHHHHH", f.read(36))
+            shoff, shentsize, shnum = header[5], header[10], header[11]
+            section = endian + "IIIIIIIIII"
+        sizes = {"text": 0, "data": 0, "bss": 0}
+        for index in range(shnum):
+            f.seek(shoff + index * shentsize)
+            fields = struct.unpack(section, f.read(struct.calcsize(section)))
+            sh_type, sh_flags, sh_size = fields[1], fields[2], fields[5]
+            if not sh_flags & _SHF_ALLOC:
+                continue
+            if sh_type == _SHT_NOBITS:
+                sizes["bss"] += sh_size
+            elif sh_flags & _SHF_WRITE:
+                sizes["data"] += sh_size
+            else:
+                sizes["text"] += sh_size
+        return sizes
+
+
+def _count_lines(path):
+    with open(path, "rb") as f:
+        return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+
+
+def inspect_build(design_path, top=TOP_OBJECTS):
+    """Return the build dict for the BUILD_DIRS under `design_path`, or None if none exist."""
+    roots = [Path(design_path) / name for name in BUILD_DIRS if (Path(design_path) / name).is_dir()]
+    if not roots:
+        return None
+    cpp = {"files": 0, "lines": 0, "bytes": 0}
+    objects = []
+    binaries = []
+    for root in roots:
+        for path in root.rglob("*"):
+            if not path.is_file() or path.is_symlink():
+                continue
+            size = path.stat().st_size
+            if path.suffix in CPP_SUFFIXES:
+                cpp["files"] += 1
+                cpp["bytes"] += size
+                cpp["lines"] += _count_lines(path)
+            elif path.suffix == ".o":
+                objects.append((size, path))
+            elif path.suffix in ("", ".so", ".exe", ".vpi"):
+                binaries.append((size, path))
+
+    objects.sort(reverse=True)
+    binary = None
+    for size, path in sorted(binaries, reverse=True):
+        sections = elf_sizes(path)
+        if sections is not None:
+            binary = {"file": str(path.relative_to(design_path)), "bytes": size, **sections}
+            break
+    return {
+        "cpp": cpp,
+        "objects": {
+            "count": len(objects),
+            "bytes": sum(size for size, _ in objects),
+            "largest": [
+                {"file": str(path.relative_to(design_path)), "bytes": size}
+                for size, path in objects[:top]
+            ],
+        },
+        "binary": binary,
+    }
+
+
+def load_baseline(sources):
+    """Return {design path: build dict} from the newest run_benchmarks summaries in `sources`."""
+    runs = sorted(
+        (summary.get("timestamp") or "", summary["results"])
+        for _, summary in iter_summaries(sources, runner="run_benchmarks")
+    )
+    baseline = {}
+    for _, results in runs:
+        for result in results:
+            if result.get("build") and result.get("path"):
+                baseline[result["path"]] = result["build"]
+    return baseline
+
+
+def compare(build, baseline, threshold=DEFAULT_GROWTH_THRESHOLD):
+    """Return [{"metric", "baseline", "current", "growth"}] for metrics that grew past `threshold`."""
+    flagged = []
+    for group, key in GROWTH_METRICS:
+        old = (baseline.get(group) or {}).get(key)
+        new = (build.get(group) or {}).get(key)
+        if not old or new is None:
+            continue
+        growth = new / old - 1
+        if growth > threshold:
+            flagged.append({"metric": f"{group}.{key}", "baseline": old, "current": new, "growth": growth})
+    return flagged
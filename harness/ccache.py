@@ -0,0 +1,138 @@
+"""Route RyuSim's generated-C++ compile through ccache (--ccache).
+
+RyuSim invokes the system C++ compiler on the code it generates; for an
+unchanged design that code is the same run after run. With --ccache the
+runners put a masquerade directory first on PATH in which `c++`, `g++`,
+`gcc`, `cc`, `clang` and `clang++` are symlinks to ccache, so every
+compiler the build looks up by name goes through one local cache directory
+with a size cap (CCACHE_DIR / CCACHE_MAXSIZE). ccache itself finds the real
+compiler further down PATH. A compiler invoked by absolute path bypasses
+the cache.
+
+Statistics are taken from `ccache --print-stats` before and after each run,
+so the per-run numbers stay correct without zeroing the shared counters.
+The time saved is estimated against the item's last run without any hits
+(its "cold" time), which CompilerCache remembers in <cache dir>/timings.json.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+DEFAULT_CCACHE_DIR = Path(".ccache")
+DEFAULT_MAX_SIZE = "5G"
+COMPILERS = ("c++", "g++", "gcc", "cc", "clang", "clang++")
+
+# --print-stats keys: ccache 4.x first, then 3.7
+_HITS_DIRECT = ("direct_cache_hit", "cache_hit_direct")
+_HITS_PREPROCESSED = ("preprocessed_cache_hit", "cache_hit_preprocessed")
+_MISSES = ("cache_miss",)
+
+
+def add_ccache_arguments(parser):
+    """Add --ccache options to a runner's argument parser."""
+    parser.add_argument(
+        "--ccache",
+        action="store_true",
+        help="Compile the generated C++ through ccache and report hit rates",
+    )
+    parser.add_argument(
+        "--ccache-dir",
+        type=str,
+        default=str(DEFAULT_CCACHE_DIR),
+        help=f"ccache directory (default: {DEFAULT_CCACHE_DIR})",
+    )
+    parser.add_argument(
+        "--ccache-max-size",
+        type=str,
+        default=DEFAULT_MAX_SIZE,
+        help=f"Cache size cap in ccache syntax (default: {DEFAULT_MAX_SIZE})",
+    )
+
+
+def _first(stats, keys):
+    return next((stats[key] for key in keys if key in stats), 0)
+
+
+class CompilerCache:
+    """A ccache directory shared by the runs of one runner invocation.
+
+    Raises FileNotFoundError if ccache is not on PATH.
+    """
+
+    def __init__(self, directory=DEFAULT_CCACHE_DIR, max_size=DEFAULT_MAX_SIZE):
+        self.executable = shutil.which("ccache")
+        if not self.executable:
+            raise FileNotFoundError("ccache not found on PATH")
+        self.directory = Path(directory).resolve()
+        self.max_size = max_size
+        self.bin = self.directory / "bin"
+        self.bin.mkdir(parents=True, exist_ok=True)
+        for name in COMPILERS:
+            link = self.bin / name
+            if not link.is_symlink():
+                link.symlink_to(self.executable)
+        self._timings_file = self.directory / "timings.json"
+        try:
+            self._timings = json.loads(self._timings_file.read_text())
+        except (OSError, ValueError):
+            self._timings = {}
+
+    def env(self, env):
+        """Return `env` with the masquerade directory first on PATH and the cache settings."""
+        return {
+            **env,
+            "PATH": f"{self.bin}{os.pathsep}{env.get('PATH', os.defpath)}",
+            "CCACHE_DIR": str(self.directory),
+            "CCACHE_MAXSIZE": self.max_size,
+            # Generated sources embed their build directory; hash relative paths
+            "CCACHE_BASEDIR": str(Path.cwd().resolve()),
+        }
+
+    def stats(self):
+        """Return ccache's cumulative counters as {name: int} ({} if unavailable)."""
+        try:
+            result = subprocess.run(
+                [self.executable, "--print-stats"],
+                capture_output=True, text=True, timeout=30,
+                env={**os.environ, "CCACHE_DIR": str(self.directory)},
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return {}
+        stats = {}
+        for line in result.stdout.splitlines():
+            name, _, value = line.partition("\t")
+            if value.strip().isdigit():
+                stats[name] = int(value)
+        return stats
+
+    def report(self, before, key, seconds):
+        """Return the per-run statistics for the item `key` since `before` (a stats() result).
+
+        `seconds` is the item's compile (or whole make) time this run; a run
+        without hits is remembered as the item's cold time.
+        """
+        after = self.stats()
+        direct = _first(after, _HITS_DIRECT) - _first(before, _HITS_DIRECT)
+        preprocessed = _first(after, _HITS_PREPROCESSED) - _first(before, _HITS_PREPROCESSED)
+        misses = _first(after, _MISSES) - _first(before, _MISSES)
+        hits = direct + preprocessed
+        calls = hits + misses
+
+        if calls and not hits:
+            self._timings[key] = seconds
+            self._timings_file.write_text(json.dumps(self._timings, indent=2))
+        cold = self._timings.get(key)
+        return {
+            "hits": hits,
+            "direct_hits": direct,
+            "preprocessed_hits": preprocessed,
+            "misses": misses,
+            "hit_rate": hits / calls if calls else None,
+            "seconds": seconds,
+            "cold_seconds": cold,
+            "saved_seconds": max(cold - seconds, 0.0) if cold is not None and hits else 0.0,
+            "cache_size_kb": after.get("cache_size_kibibyte"),
+        }
@@ -0,0 +1,94 @@
+"""Duration history recorded in previous runner JSON outputs.
+
+Every runner writes a summary with a "results" list in which each entry has a
+"path" (the design or test directory) and a "duration" in seconds. This module
+reads those files back so later runs can plan around how long each item took.
+"""
+
+import glob
+import json
+import statistics
+from pathlib import Path
+
+DEFAULT_HISTORY = "results"
+
+RUNNERS = ("run_benchmarks", "run_tests", "generate_golden_vcds")
+
+
+def summary_runner(summary):
+    """Return which runner produced a summary, or None if it is not recognised.
+
+    Older summaries have no "runner" field; run_tests summaries are recognised
+    by their per-category breakdown and run_benchmarks ones by the "ryusim"
+    phase timings of their results.
+    """
+    if "runner" in summary:
+        return summary["runner"]
+    if "categories" in summary:
+        return "run_tests"
+    if any(isinstance(result, dict) and "ryusim" in result for result in summary.get("results") or []):
+        return "run_benchmarks"
+    return None
+
+
+def history_files(sources=None):
+    """Expand files, directories and glob patterns into JSON file paths."""
+    files = []
+    for source in sources or [DEFAULT_HISTORY]:
+        path = Path(source)
+        if path.is_dir():
+            files.extend(sorted(path.rglob("*.json")))
+        elif path.is_file():
+            files.append(path)
+        else:
+            files.extend(Path(p) for p in sorted(glob.glob(source)))
+    return files
+
+
+def iter_summaries(sources=None, runner=None):
+    """Yield (file, summary) for each readable summary of a recognised runner."""
+    for path in history_files(sources):
+        try:
+            summary = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        if not isinstance(summary, dict) or not isinstance(summary.get("results"), list):
+            continue
+        produced_by = summary_runner(summary)
+        if produced_by is None or (runner and produced_by != runner):
+            continue
+        yield path, summary
+
+
+def load_durations(sources=None, runner=None, step=None):
+    """Return {path: [duration, ...]} ordered oldest run first.
+
+    With `step`, durations come from the result's "steps" breakdown (e.g.
+    "make", "vcddiff") instead of the overall duration.
+
+    Entries without a positive duration (e.g. missing config.yaml) and
+    skipped entries carry no timing information and are ignored.
+    """
+    runs = []
+    for _, summary in iter_summaries(sources, runner):
+        runs.append((summary.get("timestamp") or "", summary["results"]))
+    runs.sort(key=lambda run: run[0])
+
+    durations = {}
+    for _, results in runs:
+        for result in results:
+            path = result.get("path")
+            if step:
+                duration = (result.get("steps") or {}).get(step)
+            else:
+                duration = result.get("duration")
+            if result.get("status") == "skipped":
+                continue
+            if path and isinstance(duration, (int, float)) and duration > 0:
+                durations.setdefault(path, []).append(float(duration))
+    return durations
+
+
+def expected_durations(durations):
+    """Collapse {path: [durations]} into {path: median duration}."""
+    return {path: statistics.median(values) for path, values in durations.items() if values}
@@ -0,0 +1,173 @@
+"""Benchmark noise control (--isolate): CPU pinning, ASLR and frequency checks.
+
+Timings move with whatever else the machine is doing. Isolation reduces
+and records that:
+
+    pinning    every benchmark process is started with
+               os.sched_setaffinity() to a dedicated CPU set; make, the C++
+               compiler and the simulator inherit it. By default the lowest
+               allowed CPU is left to the harness and the rest of the system.
+    ASLR       --no-aslr runs the command under `setarch <arch> -R`, so
+               address layout does not vary from run to run
+    governor   a warning when a CPU of the set is not on the `performance`
+               cpufreq governor, or when turbo/boost is enabled (both make
+               the clock depend on load and temperature)
+    load       the 1/5/15-minute load average before and after each run
+
+conditions() goes into the summary and run_conditions() into each result,
+so noisy runs can be told apart (and filtered out) later. Machines without
+cpufreq in sysfs (most VMs and containers) report the governor and turbo as
+unknown.
+"""
+
+import os
+import platform
+import shutil
+from pathlib import Path
+
+CPU_SYSFS = Path("/sys/devices/system/cpu")
+RESERVED_CPUS = 1  # lowest allowed CPUs left to the harness by default
+
+
+def parse_cpus(text):
+    """Return the set of CPUs in a list like "2-5,8"."""
+    cpus = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        low, sep, high = part.partition("-")
+        try:
+            cpus.update(range(int(low), int(high) + 1) if sep else [int(low)])
+        except ValueError:
+            raise ValueError(f"invalid CPU list {text!r}") from None
+    if not cpus:
+        raise ValueError(f"empty CPU list {text!r}")
+    return cpus
+
+
+def format_cpus(cpus):
+    """Return `cpus` in the "2-5,8" form."""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(low) if low == high else f"{low}-{high}" for low, high in ranges)
+
+
+def add_isolation_arguments(parser):
+    """Add --isolate options to a runner's argument parser."""
+    parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Pin each benchmark to a dedicated CPU set and record noise conditions",
+    )
+    parser.add_argument(
+        "--isolate-cpus",
+        type=str,
+        metavar="LIST",
+        help="CPUs for --isolate, e.g. 2-7 (default: all allowed CPUs but the lowest)",
+    )
+    parser.add_argument(
+        "--no-aslr",
+        action="store_true",
+        help="With --isolate, disable address space randomization (setarch -R)",
+    )
+
+
+def _read(path):
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def governors(cpus):
+    """Return {governor: [cpu, ...]} for `cpus` ({} without cpufreq)."""
+    result = {}
+    for cpu in sorted(cpus):
+        governor = _read(CPU_SYSFS / f"cpu{cpu}" / "cpufreq" / "scaling_governor")
+        if governor:
+            result.setdefault(governor, []).append(cpu)
+    return result
+
+
+def turbo_enabled():
+    """Return True/False for turbo (intel_pstate) or boost (acpi-cpufreq), None if unknown."""
+    no_turbo = _read(CPU_SYSFS / "intel_pstate" / "no_turbo")
+    if no_turbo is not None:
+        return no_turbo == "0"
+    boost = _read(CPU_SYSFS / "cpufreq" / "boost")
+    if boost is not None:
+        return boost == "1"
+    return None
+
+
+def load_average():
+    """Return the 1/5/15-minute load average, or None where unsupported."""
+    try:
+        return [round(value, 2) for value in os.getloadavg()]
+    except OSError:
+        return None
+
+
+class Isolation:
+    """The CPU set and ASLR setting benchmark commands run with.
+
+    Raises ValueError for CPUs outside this process's affinity and
+    FileNotFoundError when ASLR is to be disabled without `setarch`.
+    """
+
+    def __init__(self, cpus=None, aslr=True):
+        allowed = os.sched_getaffinity(0)
+        if cpus is None:
+            ordered = sorted(allowed)
+            cpus = set(ordered[RESERVED_CPUS:]) if len(ordered) > RESERVED_CPUS else allowed
+        unavailable = set(cpus) - allowed
+        if unavailable:
+            raise ValueError(f"CPU(s) {format_cpus(unavailable)} not available (allowed: {format_cpus(allowed)})")
+        self.cpus = set(cpus)
+        self.aslr = aslr
+        if not aslr and not shutil.which("setarch"):
+            raise FileNotFoundError("setarch not found on PATH (needed to disable ASLR)")
+
+    def command(self, cmd):
+        """Return `cmd`, wrapped in setarch -R when ASLR is disabled."""
+        if self.aslr:
+            return cmd
+        return ["setarch", platform.machine(), "-R", *cmd]
+
+    def preexec(self):
+        """Pin the calling (child) process; pass as Popen's preexec_fn."""
+        os.sched_setaffinity(0, self.cpus)
+
+    def conditions(self):
+        """Return the machine-level conditions and their warnings, for the summary."""
+        found = governors(self.cpus)
+        turbo = turbo_enabled()
+        warnings = []
+        slow = sorted(cpu for governor, cpus in found.items() if governor != "performance" for cpu in cpus)
+        if slow:
+            names = ", ".join(sorted(g for g in found if g != "performance"))
+            warnings.append(f"CPUs {format_cpus(slow)} use the {names} governor, not performance")
+        if turbo:
+            warnings.append("turbo/boost is enabled")
+        return {
+            "cpus": format_cpus(self.cpus),
+            "aslr": self.aslr,
+            "governors": found or None,
+            "turbo": turbo,
+            "cpu_count": os.cpu_count(),
+            "warnings": warnings,
+        }
+
+    def run_conditions(self, load_before):
+        """Return one run's conditions; `load_before` is load_average() taken before it."""
+        return {
+            "cpus": format_cpus(self.cpus),
+            "aslr": self.aslr,
+            "load_before": load_before,
+            "load_after": load_average(),
+        }
@@ -0,0 +1,143 @@
+"""RyuSim compile-phase breakdown of a cocotb `make` run.
+
+`make` output is the only view into a RyuSim build: the front end logs its
+stages, the generated C++ is built by the system compiler and cocotb starts
+the simulation afterwards. RYUSIM_PHASES gives harness.proc.run_measured()
+one marker per stage, so each phase runs from its marker's first line to
+the next phase's:
+
+    make         make and cocotb-config, until RyuSim logs anything
+    preprocess   `include/`define expansion
+    parse        SystemVerilog parsing
+    elaborate    hierarchy and parameter elaboration
+    codegen      C++ generation
+    cxx_compile  compiling the generated C++
+    link         linking the simulation binary
+    execute      cocotb simulation
+
+When RyuSim reports its own durations (lines such as "elaboration took
+1.52s" or "codegen: 340 ms", e.g. from a timing flag passed through
+EXTRA_ARGS), phase_table() prefers them over the timestamp differences.
+Only lines logged before the execute phase count, so the simulation's own
+output (e.g. "parsed in 12 ms" from a test) cannot pose as a RyuSim stage.
+"""
+
+import re
+
+from harness.proc import COCOTB_START
+
+# A C++ compiler invocation echoed by make or RyuSim
+_CXX = r"(?<![\w+-])(g\+\+|c\+\+|clang\+\+)(-[\d.]+)?(?=\s)"
+
+RYUSIM_PHASES = (
+    ("make", None),
+    ("preprocess", re.compile(r"(?i)\bpreprocess")),
+    ("parse", re.compile(r"(?i)\bpars(e|ing)\b")),
+    ("elaborate", re.compile(r"(?i)\belaborat")),
+    ("codegen", re.compile(r"(?i)\bgenerat\w* (c\+\+|code)|\bcodegen\b|\bemitting\b")),
+    ("cxx_compile", re.compile(r"(?i)\bcompiling\b|" + _CXX + r".*\s-c\s")),
+    ("link", re.compile(r"(?i)\blinking\b|" + _CXX + r"(?!.*\s-c\s).*\s-o\s")),
+    ("execute", COCOTB_START),
+)
+
+PHASE_NAMES = tuple(name for name, _ in RYUSIM_PHASES)
+COMPILE_PHASES = PHASE_NAMES[:-1]
+FRONT_END = ("preprocess", "parse", "elaborate", "codegen")
+BACK_END = ("cxx_compile", "link")
+
+# Self-reported durations; the first word picks the phase
+_REPORTED = re.compile(
+    r"(?i)\b(preprocess\w*|pars\w*|elaborat\w*|codegen|c\+\+ generation|generat\w*"
+    r"|c\+\+ compil\w*|compil\w*|link\w*)\b[^\d\n]{0,20}?(?:took|:|=|in)\s*"
+    r"([\d.]+)\s*(ms|s|sec|seconds)\b"
+)
+_REPORTED_PHASE = (
+    ("preprocess", "preprocess"),
+    ("pars", "parse"),
+    ("elaborat", "elaborate"),
+    ("codegen", "codegen"),
+    ("c++ generation", "codegen"),
+    ("generat", "codegen"),
+    ("c++ compil", "cxx_compile"),
+    ("compil", "cxx_compile"),
+    ("link", "link"),
+)
+
+
+def reported_durations(stdout):
+    """Return {phase: seconds} from durations RyuSim printed itself."""
+    durations = {}
+    for match in _REPORTED.finditer(stdout):
+        word = match.group(1).lower()
+        phase = next(p for prefix, p in _REPORTED_PHASE if word.startswith(prefix))
+        seconds = float(match.group(2)) / (1000 if match.group(3).lower() == "ms" else 1)
+        durations[phase] = durations.get(phase, 0.0) + seconds
+    return durations
+
+
+def phase_table(run):
+    """Return the per-phase table of a run_measured() result.
+
+    {"phases": {name: {"start", "elapsed", "peak_rss_kb", "source"}},
+     "front_end", "back_end", "compile"} -- the last three in seconds.
+    `source` is "reported" when RyuSim printed the duration, "log" when it
+    comes from line timestamps and "missing" when the phase left no trace.
+    """
+    execute_start = run["phases"]["execute"]["start"]
+    reported = reported_durations("".join(
+        line + "\n" for t, line in run["lines"] if execute_start is None or t < execute_start
+    ))
+    phases = {}
+    for name in PHASE_NAMES:
+        stats = dict(run["phases"][name])
+        if name in reported:
+            stats["elapsed"] = reported[name]
+            stats["source"] = "reported"
+        else:
+            stats["source"] = "log" if stats["start"] is not None else "missing"
+        phases[name] = stats
+    return {
+        "phases": phases,
+        "front_end": sum(phases[name]["elapsed"] for name in FRONT_END),
+        "back_end": sum(phases[name]["elapsed"] for name in BACK_END),
+        "compile": sum(phases[name]["elapsed"] for name in COMPILE_PHASES),
+    }
+
+
+def stacked_summary(results):
+    """Return per-design phase seconds and their totals across `results`.
+
+    Results without a "compile_phases" table (errors, older runs) are left
+    out. `share` is each phase's fraction of the design's compile time, so
+    e.g. a slower C910 build shows whether preprocess..codegen or
+    cxx_compile grew.
+    """
+    designs = {}
+    totals = dict.fromkeys(PHASE_NAMES, 0.0)
+    for result in results:
+        table = result.get("compile_phases")
+        if not table:
+            continue
+        seconds = {name: table["phases"][name]["elapsed"] for name in PHASE_NAMES}
+        for name, value in seconds.items():
+            totals[name] += value
+        compile_seconds = table["compile"]
+        designs[result["design"]] = {
+            "seconds": seconds,
+            "front_end": table["front_end"],
+            "back_end": table["back_end"],
+            "share": {
+                name: seconds[name] / compile_seconds if compile_seconds else 0.0
+                for name in COMPILE_PHASES
+            },
+        }
+    return {"phases": list(PHASE_NAMES), "designs": designs, "totals": totals}
+
+
+def format_phases(table):
+    """Return a one-line "parse 1.2s, elaborate 3.4s, ..." rendering."""
+    return ", ".join(
+        f"{name} {stats['elapsed']:.1f}s"
+        for name, stats in table["phases"].items()
+        if stats["source"] != "missing"
+    )
@@ -0,0 +1,135 @@
+"""Run a command while timing its phases and tracking peak memory.
+
+A cocotb `make` run first compiles the design and then executes the
+simulation; only the output tells the two apart. run_measured() streams the
+combined stdout/stderr, timestamps every line and switches phase when a
+line matches the next phase's marker (COCOTB_START marks the start of
+execution). While the command runs, the resident set size of its whole
+process tree is sampled from /proc and the peak is kept per phase, so the
+C++ compiler's memory is attributed to "compile" even though it is a
+grandchild of make. The kernel's own peak for the tree, from wait4(), is
+reported as well; it also covers processes too short-lived to be sampled.
+Passing a harness.sysmon.Timeline additionally keeps the whole series
+(CPU, RSS, threads, I/O) at the timeline's interval.
+"""
+
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+
+from harness.sysmon import tree_pids
+
+COCOTB_START = re.compile(r"Running on |Initialized cocotb")
+COMPILE_EXECUTE = (("compile", None), ("execute", COCOTB_START))
+
+POLL_INTERVAL = 0.2
+
+
+def _rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def tree_rss_kb(pid):
+    """Return the summed RSS in KiB of `pid` and all its descendants (0 without /proc)."""
+    if not os.path.isdir("/proc"):
+        return 0
+    return sum(_rss_kb(member) for member in tree_pids(pid))
+
+
+def run_measured(cmd, cwd=None, env=None, timeout=None, phases=COMPILE_EXECUTE, timeline=None,
+                 preexec_fn=None):
+    """Run `cmd` and return its output with per-phase timings and memory.
+
+    `phases` is a sequence of (name, marker regex); the first phase starts
+    immediately (its marker is ignored) and each later one starts at the
+    first output line matching its marker. Phases only move forward: a line
+    matching a later marker skips the phases in between, which are then
+    reported with zero elapsed time, as are phases whose marker never
+    appears.
+
+    Returns a dict with "returncode" (None on timeout), "timed_out",
+    "elapsed", "stdout", "lines" ([seconds since start, line]),
+    "peak_rss_kb" (from wait4) and "phases" ({name: {"start", "elapsed",
+    "peak_rss_kb"}}). With a `timeline` (harness.sysmon.Timeline) the tree
+    is polled at its interval and "timeline" holds its to_dict().
+    `preexec_fn` runs in the child before `cmd` (e.g. to pin its CPUs).
+    """
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        cmd, cwd=cwd, env=env, text=True, bufsize=1,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=True,
+        preexec_fn=preexec_fn,
+    )
+
+    names = [name for name, _ in phases]
+    stats = {name: {"start": None, "elapsed": 0.0, "peak_rss_kb": 0} for name in names}
+    stats[names[0]]["start"] = 0.0
+    current = [0]
+    lines = []
+
+    def read_output():
+        for line in proc.stdout:
+            now = time.perf_counter() - start
+            lines.append([round(now, 3), line.rstrip("\n")])
+            for index in range(current[0] + 1, len(phases)):
+                if phases[index][1].search(line):
+                    current[0] = index
+                    stats[names[index]]["start"] = now
+                    break
+
+    reader = threading.Thread(target=read_output, daemon=True)
+    reader.start()
+
+    returncode = None
+    timed_out = False
+    peak_rss = 0
+    while True:
+        pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+        if pid:
+            returncode = os.waitstatus_to_exitcode(status)
+            peak_rss = usage.ru_maxrss
+            break
+        phase = stats[names[current[0]]]
+        if timeline is not None:
+            rss = timeline.sample(proc.pid, time.perf_counter() - start, names[current[0]])
+        else:
+            rss = tree_rss_kb(proc.pid)
+        phase["peak_rss_kb"] = max(phase["peak_rss_kb"], rss)
+        if timeout is not None and time.perf_counter() - start > timeout:
+            timed_out = True
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            _, status, usage = os.wait4(proc.pid, 0)
+            peak_rss = usage.ru_maxrss
+            break
+        time.sleep(timeline.interval if timeline is not None else POLL_INTERVAL)
+    proc.returncode = returncode
+    reader.join(timeout=5)
+    elapsed = time.perf_counter() - start
+
+    # Each phase runs until the next one that started, or the end
+    started = [name for name in names if stats[name]["start"] is not None]
+    for name, following in zip(started, started[1:] + [None]):
+        end = stats[following]["start"] if following else elapsed
+        stats[name]["elapsed"] = end - stats[name]["start"]
+
+    return {
+        "returncode": None if timed_out else returncode,
+        "timed_out": timed_out,
+        "elapsed": elapsed,
+        "stdout": "".join(line + "\n" for _, line in lines),
+        "lines": lines,
+        "peak_rss_kb": peak_rss,
+        "phases": stats,
+        "timeline": timeline.to_dict() if timeline is not None else None,
+    }
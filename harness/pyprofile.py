@@ -0,0 +1,208 @@
+"""Profile the Python side of a cocotb run (--profile-python).
+
+A slow testbench spends its time either in RyuSim evaluating the design or
+in Python: coroutines, triggers and VPI accesses. Two profilers can show
+the Python share without touching the testbenches:
+
+  - py-spy, when it is on PATH: `make` runs under `py-spy record
+    --subprocesses`, which samples the cocotb process and writes collapsed
+    stacks (<name>.folded, one "frame;frame;... count" line per stack)
+  - otherwise cocotb's own cProfile hook: COCOTB_ENABLE_PROFILING makes the
+    scheduler profile every callback into Python and dump
+    test_profile.pstat into the simulator's working directory, which is
+    moved to <name>.pstat
+
+Either way collect() saves the file under the profile directory and returns
+a summary for the result JSON: the profiled Python seconds and the top-N
+testbench functions (those defined under the design directory or in
+tb_common/) by self time.
+"""
+
+import os
+import pstats
+import re
+import shutil
+from pathlib import Path
+
+DEFAULT_PROFILE_DIR = Path("results/profiles")
+DEFAULT_TOP = 20
+SAMPLE_RATE = 100  # py-spy samples per second
+PSTAT_FILE = "test_profile.pstat"  # written by cocotb's scheduler
+
+TB_COMMON = Path(__file__).resolve().parent.parent / "tb_common"
+
+# "function (path/to/file.py:123)" frames of py-spy's raw output
+_FRAME = re.compile(r"^(?P<func>.*) \((?P<file>[^():]+)(:\d+)?\)$")
+
+
+def add_profile_arguments(parser):
+    """Add --profile-python options to a runner's argument parser."""
+    parser.add_argument(
+        "--profile-python",
+        action="store_true",
+        help="Profile the testbench Python (py-spy if installed, else cProfile) and save it per design",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default=str(DEFAULT_PROFILE_DIR),
+        help=f"Directory for .pstat/.folded profiles (default: {DEFAULT_PROFILE_DIR})",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_TOP,
+        help=f"Number of hottest testbench functions in the JSON (default: {DEFAULT_TOP})",
+    )
+
+
+def profile_name(name):
+    """Return a file stem for a design or test name ("a/b/c" -> "a__b__c")."""
+    return name.replace("/", "__")
+
+
+def sampler():
+    """Return the py-spy executable, or None to fall back to cProfile."""
+    return shutil.which("py-spy")
+
+
+class PythonProfile:
+    """Profiling set-up and collection for one `make` run in `run_dir`."""
+
+    def __init__(self, run_dir, name, profile_dir=DEFAULT_PROFILE_DIR, top=DEFAULT_TOP):
+        self.run_dir = Path(run_dir)
+        self.profile_dir = Path(profile_dir)
+        self.stem = profile_name(name)
+        self.top = top
+        self.py_spy = sampler()
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        if self.py_spy:
+            self.output = self.profile_dir / f"{self.stem}.folded"
+        else:
+            self.output = self.profile_dir / f"{self.stem}.pstat"
+        self.output.unlink(missing_ok=True)
+        for stale in self._pstat_candidates():
+            stale.unlink(missing_ok=True)
+
+    def _pstat_candidates(self):
+        # cocotb dumps into the simulator's cwd: the test directory or sim_build/
+        return [self.run_dir / PSTAT_FILE, self.run_dir / "sim_build" / PSTAT_FILE]
+
+    def command(self, cmd):
+        """Return `cmd`, wrapped in py-spy when sampling."""
+        if not self.py_spy:
+            return cmd
+        return [
+            self.py_spy, "record", "--subprocesses", "--format", "raw",
+            "--rate", str(SAMPLE_RATE), "--output", str(self.output.resolve()), "--",
+            *cmd,
+        ]
+
+    def env(self, env):
+        """Return `env` with cocotb's cProfile hook enabled when not sampling."""
+        if self.py_spy:
+            return env
+        return {**env, "COCOTB_ENABLE_PROFILING": "1"}
+
+    def collect(self):
+        """Move the profile into place and return its summary for the JSON."""
+        if not self.py_spy:
+            for candidate in self._pstat_candidates():
+                if candidate.exists():
+                    shutil.move(str(candidate), self.output)
+                    break
+        if not self.output.exists():
+            return {"profiler": self.profiler, "file": None, "error": "no profile written"}
+        if self.py_spy:
+            summary = summarize_folded(self.output, self.run_dir, self.top)
+        else:
+            summary = summarize_pstats(self.output, self.run_dir, self.top)
+        return {"profiler": self.profiler, "file": str(self.output), **summary}
+
+    @property
+    def profiler(self):
+        return "py-spy" if self.py_spy else "cProfile"
+
+
+def is_testbench(filename, run_dir):
+    """True if `filename` is testbench code: under `run_dir` or in tb_common/."""
+    if not filename.endswith(".py"):
+        return False  # builtins ("~") and generated code ("<string>")
+    path = Path(filename)
+    if not path.is_absolute():
+        path = Path(run_dir) / path
+    path = Path(os.path.normpath(path.resolve() if path.exists() else path))
+    for root in (Path(run_dir).resolve(), TB_COMMON):
+        if path.is_relative_to(root):
+            return True
+    return False
+
+
+def summarize_pstats(path, run_dir, top=DEFAULT_TOP):
+    """Return python_seconds, testbench_seconds and the `top` testbench functions."""
+    stats = pstats.Stats(str(path)).stats
+    functions = []
+    for (filename, line, func), (_, calls, tottime, cumtime, _) in stats.items():
+        if is_testbench(filename, run_dir):
+            functions.append({
+                "function": func,
+                "file": filename,
+                "line": line,
+                "calls": calls,
+                "self_seconds": tottime,
+                "cumulative_seconds": cumtime,
+            })
+    functions.sort(key=lambda f: f["self_seconds"], reverse=True)
+    return {
+        "python_seconds": sum(entry[2] for entry in stats.values()),
+        "testbench_seconds": sum(f["self_seconds"] for f in functions),
+        "top": functions[:top],
+    }
+
+
+def summarize_folded(path, run_dir, top=DEFAULT_TOP):
+    """Return the same summary as summarize_pstats() from collapsed stacks.
+
+    Self time is the samples with the function as the innermost frame,
+    cumulative time the samples with it anywhere on the stack. Samples
+    carry line numbers, so frames are merged per function.
+    """
+    own = {}
+    anywhere = {}
+    total = 0
+    testbench = 0
+    with open(path) as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if not stack or not count.isdigit():
+                continue
+            count = int(count)
+            total += count
+            frames = []
+            for frame in stack.split(";"):
+                match = _FRAME.match(frame)
+                if match and is_testbench(match["file"], run_dir):
+                    frames.append((match["func"], match["file"]))
+                else:
+                    frames.append(None)
+            if frames[-1] is not None:
+                own[frames[-1]] = own.get(frames[-1], 0) + count
+                testbench += count
+            for key in set(frame for frame in frames if frame is not None):
+                anywhere[key] = anywhere.get(key, 0) + count
+    functions = [
+        {
+            "function": func,
+            "file": filename,
+            "samples": own.get((func, filename), 0),
+            "self_seconds": own.get((func, filename), 0) / SAMPLE_RATE,
+            "cumulative_seconds": samples / SAMPLE_RATE,
+        }
+        for (func, filename), samples in anywhere.items()
+    ]
+    functions.sort(key=lambda f: (f["self_seconds"], f["cumulative_seconds"]), reverse=True)
+    return {
+        "python_seconds": total / SAMPLE_RATE,
+        "testbench_seconds": testbench / SAMPLE_RATE,
+        "top": functions[:top],
+    }
@@ -0,0 +1,369 @@
+"""Local SQLite store of runner summaries (results/results.db).
+
+The JSON summaries answer "what happened in this run"; comparing hundreds
+of them means re-reading every file. ingest() copies each summary into
+three tables:
+
+    runs       one row per summary: runner, ryusim_version, host,
+               configuration, timestamp, source file and the pass/fail counts
+    results    one row per design or test: path, name, status, duration
+    measures   numeric breakdowns of a result, by name: "compile",
+               "execute", "peak_rss_kb" (highest compile-phase RSS) and,
+               with --isolate, the 1-minute "load_before"/"load_after"
+               (run_benchmarks), "step.<name>" (the "steps" timings) and
+               "metric.<test>.<name>" (tb_common.metrics values)
+
+sync() brings the database up to date with a results directory: the
+`files` table remembers each JSON file's mtime and size, so only new or
+changed files are parsed again.
+
+A run is identified by (runner, ryusim_version, host, configuration,
+timestamp), so ingesting the same summary twice is a no-op. Every runner
+records its summary here unless --no-db is given; query_results.py reads it
+back (trends, percentiles, slowest tests) and ingests older JSON files.
+
+"configuration" labels runs whose timings are not comparable with each
+other: run_tests uses the validation level, run_benchmarks the options that
+change what is measured (--ryusim-args, --ccache, instrumentation), and
+--db-label overrides both.
+
+Queries go through the (path, run_id), (name, run_id) and (runner,
+timestamp) indexes, so a design's history or a time window stays fast at
+thousands of runs; percentiles are computed in Python from the selected
+values.
+"""
+
+import json
+import socket
+import sqlite3
+import sys
+from pathlib import Path
+
+from harness.history import history_files, summary_runner
+from harness.phases import COMPILE_PHASES
+
+DEFAULT_DB = Path("results/results.db")
+DEFAULT_CONFIGURATION = "default"
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    runner TEXT NOT NULL,
+    ryusim_version TEXT NOT NULL,
+    host TEXT NOT NULL,
+    configuration TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    source TEXT,
+    shard TEXT,
+    total INTEGER,
+    passed INTEGER,
+    failed INTEGER,
+    error INTEGER,
+    UNIQUE (runner, ryusim_version, host, configuration, timestamp)
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    name TEXT,
+    status TEXT,
+    duration REAL
+);
+CREATE TABLE IF NOT EXISTS measures (
+    result_id INTEGER NOT NULL REFERENCES results(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (result_id, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    run_id INTEGER REFERENCES runs(id) ON DELETE SET NULL
+);
+CREATE INDEX IF NOT EXISTS results_path ON results(path, run_id);
+CREATE INDEX IF NOT EXISTS results_name ON results(name, run_id);
+CREATE INDEX IF NOT EXISTS results_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS runs_runner_time ON runs(runner, timestamp);
+"""
+
+
+def connect(path=DEFAULT_DB):
+    """Open (creating if needed) the results database at `path`."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(path))
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA foreign_keys = ON")
+    db.execute("PRAGMA journal_mode = WAL")  # readers don't block a runner's insert
+    db.executescript(_SCHEMA)
+    db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return db
+
+
+def _number(value):
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _measures(result):
+    """Yield (name, value) for the numeric breakdowns of one result."""
+    ryusim = result.get("ryusim") or {}
+    for phase in ("compile", "execute"):
+        value = _number((ryusim.get(phase) or {}).get("elapsed"))
+        if value is not None:
+            yield phase, value
+    phases = (result.get("compile_phases") or {}).get("phases") or {}
+    peaks = [phases[name].get("peak_rss_kb") for name in COMPILE_PHASES
+             if _number((phases.get(name) or {}).get("peak_rss_kb"))]
+    if peaks:
+        yield "peak_rss_kb", float(max(peaks))
+    for when in ("before", "after"):
+        load = (result.get("isolation") or {}).get(f"load_{when}")
+        if load:
+            yield f"load_{when}", float(load[0])
+    for name, value in (result.get("steps") or {}).items():
+        value = _number(value)
+        if value is not None:
+            yield "step." + name, value
+    for test, values in (result.get("metrics") or {}).items():
+        for name, value in (values if isinstance(values, dict) else {}).items():
+            value = _number(value)
+            if value is not None:
+                yield f"metric.{test}.{name}", value
+
+
+def ingest(db, summary, source=None):
+    """Store one runner summary; returns the new run id, or None if already stored."""
+    cursor = db.execute(
+        "INSERT OR IGNORE INTO runs (runner, ryusim_version, host, configuration, timestamp,"
+        " source, shard, total, passed, failed, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            summary_runner(summary),
+            summary.get("ryusim_version") or "unknown",
+            summary.get("host") or socket.gethostname(),
+            summary.get("configuration") or DEFAULT_CONFIGURATION,
+            summary.get("timestamp") or "",
+            str(source) if source else None,
+            summary.get("shard"),
+            summary.get("total"),
+            summary.get("passed", summary.get("generated")),
+            summary.get("failed"),
+            summary.get("error"),
+        ),
+    )
+    if not cursor.rowcount:
+        return None
+    run_id = cursor.lastrowid
+    for result in summary.get("results", []):
+        row = db.execute(
+            "INSERT INTO results (run_id, path, name, status, duration) VALUES (?, ?, ?, ?, ?)",
+            (
+                run_id,
+                result.get("path") or result.get("test") or result.get("design") or "",
+                result.get("design") or result.get("test"),
+                result.get("status"),
+                _number(result.get("duration")),
+            ),
+        )
+        db.executemany(
+            "INSERT OR REPLACE INTO measures (result_id, name, value) VALUES (?, ?, ?)",
+            ((row.lastrowid, name, value) for name, value in _measures(result)),
+        )
+    return run_id
+
+
+def sync(db, sources=None):
+    """Ingest the summaries among `sources` (see harness.history) that are new or changed.
+
+    Returns (files parsed, runs added). Files that are not runner summaries
+    are remembered too, so they are not read again until they change. A
+    changed file whose run is already stored does not replace that run.
+    """
+    parsed = added = 0
+    for path in history_files(sources):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        key = str(path.resolve())
+        row = db.execute("SELECT mtime_ns, size FROM files WHERE path = ?", (key,)).fetchone()
+        if row and (row["mtime_ns"], row["size"]) == (stat.st_mtime_ns, stat.st_size):
+            continue
+        parsed += 1
+        try:
+            summary = json.loads(path.read_text())
+        except (OSError, ValueError):
+            summary = None
+        with db:
+            run_id = None
+            if (isinstance(summary, dict) and isinstance(summary.get("results"), list)
+                    and summary_runner(summary) is not None):
+                run_id = ingest(db, summary, source=path)
+                added += run_id is not None
+            db.execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, run_id) VALUES (?, ?, ?, ?)",
+                (key, stat.st_mtime_ns, stat.st_size, run_id),
+            )
+    return parsed, added
+
+
+def add_db_arguments(parser):
+    """Add the results database options to a runner's argument parser."""
+    parser.add_argument(
+        "--db",
+        type=str,
+        default=str(DEFAULT_DB),
+        help=f"SQLite results database this run is recorded in (default: {DEFAULT_DB})",
+    )
+    parser.add_argument("--no-db", action="store_true", help="Do not record this run in the results database")
+    parser.add_argument(
+        "--db-label",
+        type=str,
+        help="Configuration label stored with the run (default: derived from the runner's options)",
+    )
+
+
+def record_run(summary, args, configuration=DEFAULT_CONFIGURATION):
+    """Label `summary` with this host and configuration and store it in args.db.
+
+    Sets summary["host"] and summary["configuration"] (so the JSON written
+    afterwards can be re-ingested as the same run). A database error is
+    reported on stderr and never fails the run. Shard summaries are not
+    stored: their merged summary is (see the runners' `merge` command).
+    """
+    summary["host"] = socket.gethostname()
+    summary["configuration"] = args.db_label or configuration
+    if args.no_db or summary.get("shard"):
+        return
+    try:
+        db = connect(args.db)
+        with db:
+            ingest(db, summary, source=getattr(args, "output", None))
+        db.close()
+    except sqlite3.Error as exc:
+        print(f"Warning: could not record run in {args.db}: {exc}", file=sys.stderr)
+
+
+def percentile(values, percent):
+    """Linear-interpolated percentile (0-100) of a sorted list."""
+    if not values:
+        return None
+    position = (len(values) - 1) * percent / 100
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def _filters(runner=None, version=None, host=None, configuration=None, since=None, until=None):
+    clauses = []
+    params = []
+    for column, value in (
+        ("runs.runner", runner),
+        ("runs.ryusim_version", version),
+        ("runs.host", host),
+        ("runs.configuration", configuration),
+    ):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if since:
+        clauses.append("runs.timestamp >= ?")
+        params.append(since)
+    if until:
+        clauses.append("runs.timestamp < ?")
+        params.append(until)
+    return (" AND ".join(clauses) or "1"), params
+
+
+def _value_column(measure):
+    """Return (join clause, value expression, params) selecting `measure` for each result."""
+    if measure == "duration":
+        return "", "results.duration", []
+    return (
+        "JOIN measures ON measures.result_id = results.id AND measures.name = ?",
+        "measures.value",
+        [measure],
+    )
+
+
+def list_runs(db, limit=20, **filters):
+    """Return the newest `limit` runs matching `filters`, newest first."""
+    where, params = _filters(**filters)
+    rows = db.execute(
+        f"SELECT * FROM runs WHERE {where} ORDER BY timestamp DESC LIMIT ?", params + [limit]
+    )
+    return [dict(row) for row in rows]
+
+
+def trend(db, design, measure="duration", limit=None, **filters):
+    """Return [{timestamp, ryusim_version, host, configuration, status, value}] oldest first.
+
+    `design` matches a result's path or name (the design, or the test
+    relative to uhdm_tests/).
+    """
+    where, params = _filters(**filters)
+    join, value, join_params = _value_column(measure)
+    rows = db.execute(
+        f"SELECT runs.timestamp, runs.ryusim_version, runs.host, runs.configuration,"
+        f" results.path, results.status, {value} AS value"
+        f" FROM results JOIN runs ON runs.id = results.run_id {join}"
+        f" WHERE (results.path = ? OR results.name = ?) AND {where}"
+        f" ORDER BY runs.timestamp DESC" + (" LIMIT ?" if limit else ""),
+        join_params
+        + [design, design]
+        + params
+        + ([limit] if limit else []),
+    )
+    return [dict(row) for row in reversed(rows.fetchall())]
+
+
+def percentiles(db, measure="duration", percents=(50, 90, 99), design=None, **filters):
+    """Return [{path, runs, min, p50, p90, p99, max}] per design/test, by path.
+
+    Only passed (or, for golden VCDs, generated) results are counted: a
+    failure's duration says little about how long the item takes.
+    """
+    where, params = _filters(**filters)
+    join, value, join_params = _value_column(measure)
+    if design:
+        where += " AND (results.path = ? OR results.name = ?)"
+        params += [design, design]
+    rows = db.execute(
+        f"SELECT results.path, {value} AS value FROM results JOIN runs ON runs.id = results.run_id {join}"
+        f" WHERE results.status IN ('passed', 'generated') AND {value} IS NOT NULL AND {where}"
+        f" ORDER BY results.path, value",
+        join_params + params,
+    )
+    values = {}
+    for row in rows:
+        values.setdefault(row["path"], []).append(row["value"])
+    table = []
+    for path, series in values.items():
+        entry = {"path": path, "runs": len(series), "min": series[0]}
+        for percent in percents:
+            entry[f"p{percent}"] = percentile(series, percent)
+        entry["max"] = series[-1]
+        table.append(entry)
+    return table
+
+
+def slowest(db, limit=20, measure="duration", run_id=None, **filters):
+    """Return the `limit` slowest results by `measure`.
+
+    With `run_id` the results of that run; otherwise each design/test's
+    median over the matching runs.
+    """
+    if run_id is not None:
+        join, value, join_params = _value_column(measure)
+        rows = db.execute(
+            f"SELECT results.path, results.name, results.status, {value} AS value"
+            f" FROM results {join} WHERE results.run_id = ? AND {value} IS NOT NULL"
+            f" ORDER BY value DESC LIMIT ?",
+            join_params + [run_id, limit],
+        )
+        return [dict(row) for row in rows]
+    table = percentiles(db, measure=measure, percents=(50,), **filters)
+    table.sort(key=lambda entry: entry["p50"], reverse=True)
+    return table[:limit]
+
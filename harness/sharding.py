@@ -0,0 +1,96 @@
+"""Duration-balanced sharding of designs/tests across CI nodes.
+
+Every node computes the same partition from the same history, so each can
+pick its own shard without coordination. Items are packed greedily, longest
+first, onto the currently least-loaded shard (LPT scheduling).
+"""
+
+import statistics
+
+from harness.history import expected_durations, load_durations
+
+# Estimate used for every item when no history exists at all
+FALLBACK_DURATION = 60.0
+
+
+def parse_shard(spec):
+    """Parse "i/N" (1-based) into (index, count).
+
+    Raises ValueError on malformed input.
+    """
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"invalid shard {spec!r}, expected i/N (e.g. 2/4)") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"invalid shard {spec!r}, need 1 <= i <= N")
+    return index, count
+
+
+def add_shard_arguments(parser):
+    """Add --shard and --history options to a runner's argument parser."""
+    parser.add_argument(
+        "--shard",
+        type=str,
+        help="Run only shard i of N (1-based, e.g. 2/4), balanced by recorded durations",
+    )
+    parser.add_argument(
+        "--history",
+        action="append",
+        help="Result JSON file, directory or glob to read durations from (default: results/; repeatable)",
+    )
+
+
+def partition(items, count, estimates):
+    """Split items into `count` shards with balanced total estimated duration.
+
+    Args:
+        items: Paths (or anything whose str() is the history key)
+        count: Number of shards
+        estimates: {str(item): seconds}; missing items get the median estimate
+
+    Returns a list of `count` lists; each keeps the input order of its items.
+    """
+    known = [estimates[str(item)] for item in items if str(item) in estimates]
+    default = statistics.median(known) if known else FALLBACK_DURATION
+
+    order = {str(item): i for i, item in enumerate(items)}
+    weighted = sorted(items, key=lambda item: (-estimates.get(str(item), default), str(item)))
+
+    loads = [0.0] * count
+    shards = [[] for _ in range(count)]
+    for item in weighted:
+        target = min(range(count), key=lambda s: (loads[s], s))
+        shards[target].append(item)
+        loads[target] += estimates.get(str(item), default)
+
+    return [sorted(shard, key=lambda item: order[str(item)]) for shard in shards]
+
+
+def select_shard(items, spec, history=None, runner=None):
+    """Return the items belonging to shard `spec` ("i/N")."""
+    index, count = parse_shard(spec)
+    estimates = expected_durations(load_durations(history, runner))
+    return partition(items, count, estimates)[index - 1]
+
+
+def merge_results(summaries):
+    """Combine per-shard summaries into (results, ryusim_version, timestamp).
+
+    Results are ordered by path so the merged file does not depend on which
+    shard finished first. The earliest shard timestamp is kept.
+    """
+    results = []
+    versions = []
+    timestamps = []
+    for summary in summaries:
+        results.extend(summary.get("results", []))
+        if summary.get("ryusim_version"):
+            versions.append(summary["ryusim_version"])
+        if summary.get("timestamp"):
+            timestamps.append(summary["timestamp"])
+    results.sort(key=lambda r: (r.get("path") or "", r.get("test") or ""))
+    version = versions[0] if versions else "unknown"
+    if len(set(versions)) > 1:
+        version = ", ".join(sorted(set(versions)))
+    return results, version, min(timestamps) if timestamps else None
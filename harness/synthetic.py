@@ -0,0 +1,393 @@
+"""Synthetic designs of a chosen size, for compile-time scaling curves.
+
+The suite has tiny construct tests and large real cores but nothing in
+between. generate() builds a synthesizable design from a few size knobs:
+
+    modules     distinct leaf module definitions (synth_mod_<m>)
+    instances   leaf instances in synth_top, cycling through the definitions
+                and chained: each takes in_data XOR the previous one's output.
+                Raised to `modules` when smaller, so every definition is used
+    lanes       iterations of the generate loop in each leaf
+    flops       pipeline registers per lane (`width` bits each)
+    depth       combinational levels before each register, each one
+                (x ^ K) + rotl(x, r) with per-module constants
+    fanout      previous-stage lanes summed (with the lane index) into each
+                lane, so every register drives `fanout` lanes of the next stage
+    width       data path width in bits
+    seed        chooses the constants
+
+The same parameters always give the same files. The generator also evaluates
+the design in Python: the cocotb test it writes drives a fixed input sequence
+and checks out_data on every cycle against that model. It then runs a
+workload of SYNTH_CYCLES cycles and reports cycles/s through
+tb_common.metrics as test_scaling_workload, the test run_scaling.py runs.
+"""
+
+import os
+import random
+from pathlib import Path
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PARAMS = ("modules", "instances", "lanes", "flops", "depth", "fanout", "width", "seed")
+DEFAULT_PARAMS = {
+    "modules": 4,
+    "instances": 4,
+    "lanes": 8,
+    "flops": 2,
+    "depth": 4,
+    "fanout": 2,
+    "width": 32,
+    "seed": 0,
+}
+TOP_MODULE = "synth_top"
+TEST_MODULE = "test_synthetic"
+CHECK_CYCLES = 16  # cycles compared against the Python model
+WORKLOAD_CYCLES = 10000  # default SYNTH_CYCLES of test_scaling_workload
+
+
+def normalize(params):
+    """Return `params` completed with the defaults and validated.
+
+    Raises ValueError for unknown names or values out of range.
+    """
+    unknown = set(params) - set(PARAMS)
+    if unknown:
+        raise ValueError(f"unknown synthetic parameter(s) {', '.join(sorted(unknown))}")
+    result = {**DEFAULT_PARAMS, **params}
+    for name in PARAMS:
+        if not isinstance(result[name], int) or result[name] < (0 if name == "seed" else 1):
+            raise ValueError(f"{name} must be a positive integer, got {result[name]!r}")
+    if result["width"] < 2:
+        raise ValueError("width must be at least 2 (the rotations need two bits)")
+    result["instances"] = max(result["instances"], result["modules"])
+    return result
+
+
+def design_name(params):
+    """Return a directory/design name that encodes `params`."""
+    p = normalize(params)
+    return (f"synth_m{p['modules']}_i{p['instances']}_l{p['lanes']}_f{p['flops']}"
+            f"_d{p['depth']}_o{p['fanout']}_w{p['width']}_s{p['seed']}")
+
+
+def design_size(params):
+    """Return the size measures of the design `params` describes."""
+    p = normalize(params)
+    lane_stages = p["instances"] * p["lanes"] * p["flops"]
+    return {
+        "modules": p["modules"],
+        "instances": p["instances"],
+        "flop_bits": lane_stages * p["width"],
+        # adders of the fan-out sums plus one XOR and one adder per level
+        "operators": lane_stages * (p["fanout"] + 2 * p["depth"]),
+    }
+
+
+def constants(params):
+    """Return [module][stage][level] -> (xor constant, rotate amount)."""
+    p = normalize(params)
+    rng = random.Random(p["seed"])
+    return [
+        [
+            [(rng.getrandbits(p["width"]), rng.randrange(1, p["width"])) for _ in range(p["depth"])]
+            for _ in range(p["flops"])
+        ]
+        for _ in range(p["modules"])
+    ]
+
+
+class Model:
+    """Cycle-accurate Python model of a generated design, reset state."""
+
+    def __init__(self, params):
+        self.params = normalize(params)
+        self.constants = constants(self.params)
+        self.mask = (1 << self.params["width"]) - 1
+        p = self.params
+        # state[instance][stage][lane]
+        self.state = [[[0] * p["lanes"] for _ in range(p["flops"])] for _ in range(p["instances"])]
+
+    def _rotl(self, value, amount):
+        width = self.params["width"]
+        return ((value << amount) | (value >> (width - amount))) & self.mask
+
+    def _out(self, instance):
+        value = 0
+        for lane in self.state[instance][-1]:
+            value ^= lane
+        return value
+
+    def output(self):
+        """Return out_data for the current register state."""
+        return self._out(len(self.state) - 1)
+
+    def step(self, in_data):
+        """Advance one clock edge with `in_data` applied."""
+        p = self.params
+        lanes, fanout, mask = p["lanes"], p["fanout"], self.mask
+        outputs = [self._out(i) for i in range(p["instances"])]
+        next_state = []
+        for i, stages in enumerate(self.state):
+            ops = self.constants[i % p["modules"]]
+            value = in_data if i == 0 else in_data ^ outputs[i - 1]
+            source = [(value + g) & mask for g in range(lanes)]
+            registers = []
+            for s in range(p["flops"]):
+                if s:
+                    source = stages[s - 1]
+                lane_values = []
+                for g in range(lanes):
+                    x = (sum(source[(g + f) % lanes] for f in range(fanout)) + g) & mask
+                    for constant, amount in ops[s]:
+                        x = ((x ^ constant) + self._rotl(x, amount)) & mask
+                    lane_values.append(x)
+                registers.append(lane_values)
+            next_state.append(registers)
+        self.state = next_state
+
+
+def stimulus(params, cycles=CHECK_CYCLES):
+    """Return (inputs, expected outputs) for `cycles` cycles after reset.
+
+    expected[k] is out_data before inputs[k] is applied, i.e. after k clock
+    edges.
+    """
+    p = normalize(params)
+    rng = random.Random(p["seed"] + 1)
+    inputs = [rng.getrandbits(p["width"]) for _ in range(cycles)]
+    model = Model(p)
+    expected = []
+    for value in inputs:
+        expected.append(model.output())
+        model.step(value)
+    return inputs, expected
+
+
+def _hex(value, width):
+    return f"{width}'h{value:0{(width + 3) // 4}x}"
+
+
+def leaf_source(params, module):
+    """Return the SystemVerilog of leaf module `module`."""
+    p = normalize(params)
+    w, lanes, flops = p["width"], p["lanes"], p["flops"]
+    ops = constants(p)[module]
+    lines = [
+        "// Generated by generate_synthetic.py; do not edit.",
+        f"module synth_mod_{module} (",
+        "    input  logic clk,",
+        "    input  logic rst,",
+        f"    input  logic [{w - 1}:0] in_data,",
+        f"    output logic [{w - 1}:0] out_data",
+        ");",
+        f"    localparam int W = {w};",
+        f"    localparam int LANES = {lanes};",
+        "",
+        "    logic [LANES*W-1:0] lane_in;",
+    ]
+    lines += [f"    logic [LANES*W-1:0] stage{s};" for s in range(flops)]
+    lines += [
+        "",
+        "    for (genvar g = 0; g < LANES; g++) begin : lane",
+        "        assign lane_in[g*W +: W] = in_data + W'(g);",
+    ]
+    for s in range(flops):
+        source = "lane_in" if s == 0 else f"stage{s - 1}"
+        names = [f"s{s}_x{d}" for d in range(p["depth"] + 1)]
+        terms = " + ".join(f"{source}[((g + {f}) % LANES)*W +: W]" for f in range(p["fanout"]))
+        lines += [
+            "",
+            f"        logic [W-1:0] {', '.join(names)};",
+            f"        logic [W-1:0] q{s};",
+            f"        assign {names[0]} = {terms} + W'(g);",
+        ]
+        for d, (constant, amount) in enumerate(ops[s]):
+            x = names[d]
+            lines.append(
+                f"        assign {names[d + 1]} = ({x} ^ {_hex(constant, w)})"
+                f" + {{{x}[{w - 1 - amount}:0], {x}[{w - 1}:{w - amount}]}};"
+            )
+        lines += [
+            "        always_ff @(posedge clk)",
+            f"            if (rst) q{s} <= '0;",
+            f"            else q{s} <= {names[-1]};",
+            f"        assign stage{s}[g*W +: W] = q{s};",
+        ]
+    lines += [
+        "    end",
+        "",
+        "    always_comb begin",
+        "        out_data = '0;",
+        "        for (int i = 0; i < LANES; i++)",
+        f"            out_data = out_data ^ stage{flops - 1}[i*W +: W];",
+        "    end",
+        "endmodule",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def top_source(params):
+    """Return the SystemVerilog of synth_top."""
+    p = normalize(params)
+    w = p["width"]
+    lines = [
+        "// Generated by generate_synthetic.py; do not edit.",
+        f"module {TOP_MODULE} (",
+        "    input  logic clk,",
+        "    input  logic rst,",
+        f"    input  logic [{w - 1}:0] in_data,",
+        f"    output logic [{w - 1}:0] out_data",
+        ");",
+        f"    logic [{w - 1}:0] link [0:{p['instances'] - 1}];",
+        "",
+    ]
+    for i in range(p["instances"]):
+        source = "in_data" if i == 0 else f"in_data ^ link[{i - 1}]"
+        lines.append(f"    synth_mod_{i % p['modules']} u{i} "
+                     f"(.clk(clk), .rst(rst), .in_data({source}), .out_data(link[{i}]));")
+    lines += [
+        "",
+        f"    assign out_data = link[{p['instances'] - 1}];",
+        "endmodule",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def test_source(params, check_cycles=CHECK_CYCLES):
+    """Return the cocotb test module for the design."""
+    p = normalize(params)
+    inputs, expected = stimulus(p, check_cycles)
+    digits = (p["width"] + 3) // 4
+    return f'''"""Cocotb testbench for the synthetic design {design_name(p)}.
+
+Generated by generate_synthetic.py from the parameters in config.yaml; do
+not edit. EXPECTED comes from the generator's Python model of the design.
+"""
+
+import os
+import time
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles, FallingEdge
+
+from tb_common.metrics import record_metrics
+
+INPUTS = [{", ".join(f"0x{v:0{digits}x}" for v in inputs)}]
+EXPECTED = [{", ".join(f"0x{v:0{digits}x}" for v in expected)}]
+WORKLOAD_CYCLES = int(os.environ.get("SYNTH_CYCLES", "{WORKLOAD_CYCLES}"))
+
+
+async def reset_dut(dut):
+    """Hold rst for two clock edges; returns at a falling edge."""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    dut.rst.value = 1
+    dut.in_data.value = 0
+    await ClockCycles(dut.clk, 2)
+    await FallingEdge(dut.clk)
+    dut.rst.value = 0
+
+
+@cocotb.test()
+async def test_expected_outputs(dut):
+    """out_data should match the model on every cycle after reset."""
+    await reset_dut(dut)
+    for cycle, (value, expected) in enumerate(zip(INPUTS, EXPECTED)):
+        actual = int(dut.out_data.value)
+        assert actual == expected, f"cycle {{cycle}}: expected {{expected:#x}}, got {{actual:#x}}"
+        dut.in_data.value = value
+        await FallingEdge(dut.clk)
+
+
+@cocotb.test()
+async def test_scaling_workload(dut):
+    """Run WORKLOAD_CYCLES cycles and report cycles/s.
+
+    The input stays constant, but the chained instances keep every register
+    toggling.
+    """
+    await reset_dut(dut)
+    dut.in_data.value = INPUTS[0]
+
+    start = time.perf_counter()
+    await ClockCycles(dut.clk, WORKLOAD_CYCLES)
+    wall = time.perf_counter() - start
+
+    rate = WORKLOAD_CYCLES / wall if wall > 0 else 0.0
+    dut._log.info("%d cycles in %.2fs (%.0f cycles/s)", WORKLOAD_CYCLES, wall, rate)
+    record_metrics(
+        "test_scaling_workload",
+        cycles=WORKLOAD_CYCLES,
+        wall_seconds=wall,
+        cycles_per_sec=rate,
+    )
+'''
+
+
+def makefile_source(design_dir, params):
+    """Return the design's Makefile; PYTHONPATH reaches tb_common relative to `design_dir`."""
+    root = os.path.relpath(REPO_ROOT, Path(design_dir).resolve())
+    return f"""# {design_name(params)} — cocotb testbench
+#
+# Synthetic design generated by generate_synthetic.py; parameters in config.yaml.
+
+TOPLEVEL_LANG = verilog
+SIM = ryusim
+
+VERILOG_SOURCES = $(wildcard rtl/*.sv)
+
+# Same overridable RyuSim flags as the rtlmeter Makefiles
+RYUSIM_VPI_DEPTH ?= 1
+EXTRA_ARGS += --vpi-depth $(RYUSIM_VPI_DEPTH)
+
+RYUSIM_JOBS ?= 4
+EXTRA_ARGS += --jobs $(RYUSIM_JOBS)
+
+TOPLEVEL = {TOP_MODULE}
+MODULE = {TEST_MODULE}
+
+export PYTHONPATH := $(CURDIR)/cocotb:$(abspath $(CURDIR)/{root})
+
+include $(shell cocotb-config --makefiles)/Makefile.sim
+"""
+
+
+def generate(params, design_dir, check_cycles=CHECK_CYCLES):
+    """Write the design described by `params` to `design_dir`; returns its size measures.
+
+    Files from an earlier generation with other parameters are removed from
+    rtl/ so the Makefile's wildcard picks up only this design.
+    """
+    p = normalize(params)
+    design_dir = Path(design_dir)
+    rtl = design_dir / "rtl"
+    rtl.mkdir(parents=True, exist_ok=True)
+    (design_dir / "cocotb").mkdir(exist_ok=True)
+    wanted = {f"synth_mod_{m}.sv" for m in range(p["modules"])} | {f"{TOP_MODULE}.sv"}
+    for stale in rtl.glob("*.sv"):
+        if stale.name not in wanted:
+            stale.unlink()
+
+    for module in range(p["modules"]):
+        (rtl / f"synth_mod_{module}.sv").write_text(leaf_source(p, module))
+    (rtl / f"{TOP_MODULE}.sv").write_text(top_source(p))
+    (design_dir / "cocotb" / f"{TEST_MODULE}.py").write_text(test_source(p, check_cycles))
+    (design_dir / "Makefile").write_text(makefile_source(design_dir, p))
+
+    size = design_size(p)
+    size["sv_bytes"] = sum(path.stat().st_size for path in rtl.glob("*.sv"))
+    config = {
+        "name": design_name(p),
+        "source": "synthetic",
+        "description": (f"Synthetic design: {p['instances']} instances of {p['modules']} modules, "
+                        f"{size['flop_bits']} flop bits"),
+        "top_module": TOP_MODULE,
+        "synthetic": p,
+        "size": size,
+    }
+    (design_dir / "config.yaml").write_text(yaml.safe_dump(config, sort_keys=False))
+    return size
@@ -0,0 +1,266 @@
+"""System metrics timeline of a process tree, sampled from /proc.
+
+Peak RSS and total time hide the shape of a run: a C++ compile stage that
+spikes memory while `--jobs 4` keeps only two cores busy looks the same as
+a flat one. Timeline.sample() is called from harness.proc.run_measured()'s
+poll loop and records, for the command's whole process tree:
+
+    t             seconds since start
+    cpu_pct       CPU use since the previous sample (100 = one core)
+    rss_kb        summed resident set size
+    threads       summed thread count
+    procs         processes in the tree
+    read_bps      storage bytes read per second
+    write_bps     storage bytes written per second
+    phase         the run_measured() phase the sample falls in
+
+CPU time and I/O of exited children are counted through their parent's
+cumulative counters (cutime/cstime, /proc/<pid>/io), so short-lived
+compiler processes still show up as long as make reaps them. Rates are
+clamped at 0 when a reaper outside the tree takes counters away.
+
+render_ascii() draws one sparkline per column for a terminal and
+render_html() a self-contained page with one SVG chart per column.
+"""
+
+import argparse
+import html
+import os
+from pathlib import Path
+
+COLUMNS = ("t", "cpu_pct", "rss_kb", "threads", "procs", "read_bps", "write_bps", "phase")
+CHARTS = ("cpu_pct", "rss_kb", "threads", "read_bps", "write_bps")
+DEFAULT_INTERVAL = 0.25  # seconds; run_measured polls at this rate with a timeline
+DEFAULT_TIMELINE_DIR = Path("results/timelines")
+
+_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_KB = os.sysconf("SC_PAGE_SIZE") // 1024 if hasattr(os, "sysconf") else 4
+_SPARKS = " ▁▂▃▄▅▆▇█"
+
+
+def children():
+    """Return {ppid: [pid, ...]} for every process visible in /proc."""
+    result = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces; fields resume after the last ")"
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        result.setdefault(ppid, []).append(int(entry.name))
+    return result
+
+
+def tree_pids(pid):
+    """Return `pid` and all its descendants (just [pid] without /proc)."""
+    if not os.path.isdir("/proc"):
+        return [pid]
+    tree = children()
+    pids = []
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        pids.append(current)
+        stack.extend(tree.get(current, ()))
+    return pids
+
+
+def process_counters(pid):
+    """Return (cpu ticks incl. reaped children, rss kB, threads, read bytes, write bytes).
+
+    Missing or vanished processes count as zeros; /proc/<pid>/io may be
+    unreadable without privileges, in which case I/O is zero.
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except (OSError, IndexError):
+        return 0, 0, 0, 0, 0
+    # Fields after ")" start at field 3 (state): utime=14, stime=15,
+    # cutime=16, cstime=17, num_threads=20, rss=24
+    ticks = sum(int(fields[i]) for i in (11, 12, 13, 14))
+    threads = int(fields[17])
+    rss_kb = int(fields[21]) * _PAGE_KB
+    read_bytes = write_bytes = 0
+    try:
+        with open(f"/proc/{pid}/io") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key == "read_bytes":
+                    read_bytes = int(value)
+                elif key == "write_bytes":
+                    write_bytes = int(value)
+    except OSError:
+        pass
+    return ticks, rss_kb, threads, read_bytes, write_bytes
+
+
+class Timeline:
+    """Samples of one process tree; call sample() at a steady interval."""
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.samples = []
+        self._previous = None
+
+    def sample(self, pid, t, phase):
+        """Record one sample of `pid`'s tree at `t` seconds; returns its RSS in kB."""
+        pids = tree_pids(pid)
+        ticks = rss_kb = threads = read_bytes = write_bytes = 0
+        for member in pids:
+            c_ticks, c_rss, c_threads, c_read, c_write = process_counters(member)
+            ticks += c_ticks
+            rss_kb += c_rss
+            threads += c_threads
+            read_bytes += c_read
+            write_bytes += c_write
+
+        cpu_pct = read_bps = write_bps = 0.0
+        if self._previous is not None:
+            p_t, p_ticks, p_read, p_write = self._previous
+            dt = t - p_t
+            if dt > 0:
+                cpu_pct = max(ticks - p_ticks, 0) / _TICKS / dt * 100
+                read_bps = max(read_bytes - p_read, 0) / dt
+                write_bps = max(write_bytes - p_write, 0) / dt
+        self._previous = (t, ticks, read_bytes, write_bytes)
+        self.samples.append([
+            round(t, 3), round(cpu_pct, 1), rss_kb, threads, len(pids),
+            round(read_bps), round(write_bps), phase,
+        ])
+        return rss_kb
+
+    def to_dict(self):
+        """Return the JSON form stored in results: columns plus sample rows."""
+        return {
+            "interval": self.interval,
+            "cpus": os.cpu_count(),
+            "columns": list(COLUMNS),
+            "samples": self.samples,
+        }
+
+
+def _column(timeline, name):
+    index = timeline["columns"].index(name)
+    return [row[index] for row in timeline["samples"]]
+
+
+def _resample(values, width):
+    """Shrink `values` to at most `width` points, keeping each bucket's maximum."""
+    if len(values) <= width:
+        return values
+    step = len(values) / width
+    return [max(values[int(i * step):max(int((i + 1) * step), int(i * step) + 1)]) for i in range(width)]
+
+
+def _scale(name, value):
+    if name == "rss_kb":
+        return f"{value / 1024:.0f} MiB"
+    if name.endswith("_bps"):
+        return f"{value / 1e6:.1f} MB/s"
+    if name == "cpu_pct":
+        return f"{value:.0f}%"
+    return f"{value:g}"
+
+
+def render_ascii(timeline, width=60):
+    """Return one sparkline per chart column, with its peak, and a phase ruler."""
+    if not timeline["samples"]:
+        return "(no samples)"
+    lines = []
+    for name in CHARTS:
+        values = _resample(_column(timeline, name), width)
+        peak = max(values)
+        spark = "".join(
+            _SPARKS[round(v / peak * (len(_SPARKS) - 1))] if peak else _SPARKS[0] for v in values
+        )
+        lines.append(f"{name:>9} {spark} peak {_scale(name, peak)}")
+
+    # First letter of each phase where it begins
+    phases = _column(timeline, "phase")
+    step = max(len(phases) / width, 1)
+    ruler = []
+    last = None
+    for i in range(min(width, len(phases))):
+        phase = phases[int(i * step)]
+        ruler.append(phase[0] if phase != last else " ")
+        last = phase
+    duration = timeline["samples"][-1][0]
+    lines.append(f"{'phase':>9} {''.join(ruler)} {duration:.1f}s, {timeline['cpus']} CPUs")
+    return "\n".join(lines)
+
+
+def _svg(values, times, label, width=720, height=90):
+    peak = max(values) or 1
+    end = times[-1] or 1
+    points = " ".join(
+        f"{t / end * width:.1f},{height - v / peak * (height - 4):.1f}" for t, v in zip(times, values)
+    )
+    return (
+        f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<polyline fill="none" stroke="#2a6" stroke-width="1.5" points="{points}"/>'
+        f'<text x="4" y="12" font-size="11">{html.escape(label)}</text></svg>'
+    )
+
+
+def render_html(timeline, title):
+    """Return a standalone HTML page with one SVG line chart per column."""
+    times = _column(timeline, "t")
+    charts = []
+    for name in CHARTS:
+        values = _column(timeline, name)
+        if values:
+            charts.append(_svg(values, times, f"{name} (peak {_scale(name, max(values))})"))
+    phases = []
+    last = None
+    for t, phase in zip(times, _column(timeline, "phase")):
+        if phase != last:
+            phases.append(f"<li>{t:.1f}s {html.escape(phase)}</li>")
+            last = phase
+    return (
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title></head>"
+        f"<body style='font-family:sans-serif'><h3>{html.escape(title)}</h3>"
+        f"<p>{len(times)} samples every {timeline['interval']}s, {timeline['cpus']} CPUs</p>"
+        + "<br>".join(charts)
+        + f"<ul>{''.join(phases)}</ul></body></html>\n"
+    )
+
+
+def _interval_ms(text):
+    value = int(text)
+    if not 100 <= value <= 500:
+        raise argparse.ArgumentTypeError(f"{value} ms is outside 100-500")
+    return value
+
+
+def add_timeline_arguments(parser):
+    """Add --timeline options to a runner's argument parser."""
+    parser.add_argument(
+        "--timeline",
+        action="store_true",
+        help="Sample CPU, RSS, threads and I/O of each run's process tree into the result",
+    )
+    parser.add_argument(
+        "--timeline-interval",
+        type=_interval_ms,
+        default=int(DEFAULT_INTERVAL * 1000),
+        metavar="MS",
+        help=f"Sampling interval in milliseconds, 100-500 (default: {int(DEFAULT_INTERVAL * 1000)})",
+    )
+    parser.add_argument(
+        "--timeline-dir",
+        type=str,
+        default=str(DEFAULT_TIMELINE_DIR),
+        help=f"Directory for the per-run HTML charts (default: {DEFAULT_TIMELINE_DIR})",
+    )
+
+
+def write_html(timeline, directory, name):
+    """Write render_html() to <directory>/<name>.html and return its path."""
+    path = Path(directory) / f"{name.replace('/', '__')}.html"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(render_html(timeline, name))
+    return str(path)
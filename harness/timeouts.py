@@ -0,0 +1,95 @@
+"""Adaptive subprocess timeouts derived from recorded durations.
+
+A budget is the p99 of a step's recorded durations times a safety factor,
+clamped to a per-step floor and ceiling. Explicit timeouts (CLI --timeout,
+then config.yaml `timeout`) always win; with too little history the
+runner's fixed default is used.
+"""
+
+import math
+import statistics
+
+from harness.history import load_durations
+
+DEFAULT_FACTOR = 3.0
+MIN_SAMPLES = 3
+
+
+def percentile(values, pct):
+    """Return the nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class TimeoutPlanner:
+    """Hand out per-item, per-step timeout budgets for one runner invocation.
+
+    History is read once at construction. The overall "duration" of older
+    results stands in for the primary step when no per-step data exists.
+    """
+
+    def __init__(self, history=None, runner=None, factor=DEFAULT_FACTOR, adaptive=True):
+        self.factor = factor
+        self.adaptive = adaptive
+        self.history = history
+        self.runner = runner
+        self._overall = load_durations(history, runner) if adaptive else {}
+        self._steps = {}
+
+    def _samples(self, path, step, primary):
+        if step not in self._steps:
+            self._steps[step] = load_durations(self.history, self.runner, step=step) if self.adaptive else {}
+        samples = self._steps[step].get(str(path), [])
+        if not samples and primary:
+            samples = self._overall.get(str(path), [])
+        return samples
+
+    def budget(self, path, step, default, floor, ceiling, override=None, override_source="config", primary=False):
+        """Return {"budget", "expected", "source"} for one step of one item.
+
+        Args:
+            path: Design or test directory (the history key)
+            step: Step name recorded in the result's "steps" dict
+            default: Fixed timeout used without enough history
+            floor, ceiling: Clamp for history-derived budgets
+            override: Explicit timeout that takes precedence, if set
+            override_source: Where the override came from ("cli" or "config")
+            primary: Fall back to the overall result duration for history
+        """
+        samples = self._samples(path, step, primary)
+        expected = statistics.median(samples) if samples else None
+
+        if override:
+            return {"budget": override, "expected": expected, "source": override_source}
+        if len(samples) >= MIN_SAMPLES:
+            budget = percentile(samples, 99) * self.factor
+            return {
+                "budget": round(min(max(budget, floor), ceiling), 1),
+                "expected": expected,
+                "source": "history",
+            }
+        return {"budget": default, "expected": expected, "source": "default"}
+
+
+def describe(budget):
+    """Format a budget for a timeout error message."""
+    text = f"{budget['budget']:g}s {budget['source']} budget"
+    if budget["expected"] is not None:
+        text += f", expected ~{budget['expected']:.1f}s"
+    return text
+
+
+def add_timeout_arguments(parser):
+    """Add adaptive-timeout options to a runner's argument parser."""
+    parser.add_argument(
+        "--timeout-factor",
+        type=float,
+        default=DEFAULT_FACTOR,
+        help=f"Multiply the p99 of recorded durations by this for timeouts (default: {DEFAULT_FACTOR})",
+    )
+    parser.add_argument(
+        "--no-adaptive-timeouts",
+        action="store_true",
+        help="Ignore duration history and use the fixed default timeouts",
+    )
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""query_results.py — Query the SQLite results database the runners record into.
+
+run_benchmarks.py, run_tests.py and generate_golden_vcds.py store every run
+in results/results.db (see harness/resultsdb.py). This script reads it back:
+
+    runs         the newest runs with their pass/fail counts
+    trend        one design's or test's value run by run, oldest first
+    percentiles  p50/p90/p99 per design/test over the matching runs
+    slowest      the slowest designs/tests (median, or within one run)
+    ingest       add new or changed JSON summaries (files, directories, globs)
+
+Every query takes --runner, --ryusim-version, --host, --configuration and
+--since/--until (ISO timestamps or dates) filters, and --measure to use a
+breakdown instead of the overall duration: "compile", "execute",
+"step.<name>" or "metric.<test>.<name>".
+
+Usage:
+    python query_results.py ingest results/
+    python query_results.py trend Vortex --measure metric.test_kernel.gpu_cycles_per_sec
+    python query_results.py percentiles --runner run_benchmarks --since 2026-01-01
+    python query_results.py slowest --runner run_tests --configuration level2 --json
+"""
+
+import argparse
+import json
+import sys
+
+from harness.history import DEFAULT_HISTORY, RUNNERS
+from harness.resultsdb import DEFAULT_DB, connect, list_runs, percentiles, slowest, sync, trend
+
+
+def _format(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.3f}" if abs(value) < 1000 else f"{value:.4g}"
+    return str(value)
+
+
+def print_table(rows, columns):
+    """Print `rows` (dicts) as aligned text columns."""
+    if not rows:
+        print("(no matching runs)")
+        return
+    cells = [[_format(row.get(column)) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(line[i]) for line in cells)) for i, column in enumerate(columns)]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for line in cells:
+        print("  ".join(cell.ljust(width) for cell, width in zip(line, widths)))
+
+
+def ingest_main(db, args):
+    parsed, added = sync(db, args.paths or [DEFAULT_HISTORY])
+    print(f"Parsed {parsed} new or changed files, added {added} runs to {args.db}", file=sys.stderr)
+
+
+def main():
+    filters = argparse.ArgumentParser(add_help=False)
+    filters.add_argument("--runner", choices=RUNNERS, help="Only runs of this runner")
+    filters.add_argument("--ryusim-version", dest="version", help="Only runs of this RyuSim version")
+    filters.add_argument("--host", help="Only runs on this host")
+    filters.add_argument("--configuration", help="Only runs with this configuration label")
+    filters.add_argument("--since", help="Only runs at or after this ISO timestamp/date")
+    filters.add_argument("--until", help="Only runs before this ISO timestamp/date")
+    filters.add_argument("--measure", default="duration",
+                         help="duration (default), compile, execute, step.<name> or metric.<test>.<name>")
+    filters.add_argument("--limit", type=int, default=20, help="Maximum rows (default: 20)")
+    filters.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+
+    parser = argparse.ArgumentParser(description="Query the SQLite results database")
+    parser.add_argument("--db", type=str, default=str(DEFAULT_DB), help=f"Results database (default: {DEFAULT_DB})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Add runner JSON summaries to the database")
+    ingest_parser.add_argument("paths", nargs="*",
+                               help=f"JSON files, directories or globs (default: {DEFAULT_HISTORY}/)")
+    subparsers.add_parser("runs", parents=[filters], help="List the newest runs")
+    trend_parser = subparsers.add_parser("trend", parents=[filters], help="One design's or test's value over runs")
+    trend_parser.add_argument("design", help="Design name, test (e.g. sequential/basic_flops/d_ff) or path")
+    percentiles_parser = subparsers.add_parser("percentiles", parents=[filters],
+                                               help="p50/p90/p99 per design/test (passed results)")
+    percentiles_parser.add_argument("--design", help="Only this design/test")
+    slowest_parser = subparsers.add_parser("slowest", parents=[filters], help="Slowest designs/tests")
+    slowest_parser.add_argument("--run", type=int, metavar="RUN_ID",
+                                help="Rank the results of this run (see `runs`) instead of medians")
+    args = parser.parse_args()
+
+    db = connect(args.db)
+    if args.command == "ingest":
+        ingest_main(db, args)
+        return
+
+    selected = {key: getattr(args, key) for key in ("runner", "version", "host", "configuration", "since", "until")}
+    if args.command == "runs":
+        rows = list_runs(db, limit=args.limit, **selected)
+        columns = ["id", "timestamp", "runner", "ryusim_version", "host", "configuration",
+                   "total", "passed", "failed", "error"]
+    elif args.command == "trend":
+        rows = trend(db, args.design, measure=args.measure, limit=args.limit, **selected)
+        columns = ["timestamp", "ryusim_version", "host", "configuration", "status", "value"]
+    elif args.command == "percentiles":
+        rows = percentiles(db, measure=args.measure, design=args.design, **selected)[: args.limit]
+        columns = ["path", "runs", "min", "p50", "p90", "p99", "max"]
+    else:
+        rows = slowest(db, limit=args.limit, measure=args.measure, run_id=args.run, **selected)
+        columns = ["path", "status", "value"] if args.run is not None else ["path", "runs", "p50", "max"]
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows, columns)
+
+
+if __name__ == "__main__":
+    main()
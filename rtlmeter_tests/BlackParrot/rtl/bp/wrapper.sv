@@ -9,13 +9,19 @@
 `include "bp_me_defines.svh"
 `include "bsg_noc_links.svh"
 
+// The configuration is chosen at compile time with +define+BP_CFG_FLOWVAR=<cfg>
+// (e.g. e_bp_multicore_4_cfg), as the upstream testbench does
+`ifndef BP_CFG_FLOWVAR
+`define BP_CFG_FLOWVAR e_bp_default_cfg
+`endif
+
 module wrapper
  import bsg_wormhole_router_pkg::*;
  import bp_common_pkg::*;
  import bp_be_pkg::*;
  import bp_me_pkg::*;
  import bsg_noc_pkg::*;
- #(parameter bp_params_e bp_params_p = e_bp_default_cfg
+ #(parameter bp_params_e bp_params_p = `BP_CFG_FLOWVAR
    `declare_bp_proc_params(bp_params_p)
 
    `declare_bp_bedrock_if_widths(paddr_width_p, lce_id_width_p, cce_id_width_p, did_width_p, lce_assoc_p)
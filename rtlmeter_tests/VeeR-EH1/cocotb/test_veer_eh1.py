@@ -24,15 +24,31 @@ Test strategy:
   - test_reset: Drives clock and reset, verifies the core enters a known state
   - test_smoke_100_cycles: Runs for 100 clock cycles post-reset to verify the
     core does not hang or produce errors
-
-Note: Full program execution requires loading program hex files into AXI slave
-memory and responding to AXI read transactions. The current tests validate
-compilation and basic reset/clock operation.
+  - test_fetch_from_memory: Attaches the tb_common AXI4 memory model to the
+    IFU/LSU/SB ports and checks that the core fetches from the reset vector
+  - test_hello: Loads programs/hello.hex through tb_common.hexload and runs it
+    until it signals completion through the mailbox at 0xd0580000
+
+AXI memory: tb_common.veer.attach_memory() serves the IFU, LSU and SB ports
+from a tb_common.memory.SparseMemory through tb_common.axi.AxiSlave
+(INCR/WRAP/FIXED bursts, multiple outstanding IDs, configurable latency).
+tb_common.veer.run_program() loads a programs/*.hex image into it via
+tb_common.hexload, whose cached binary image makes repeated loads free of
+text parsing. Both are shared with the other VeeR testbenches; only
+RESET_VECTOR differs.
 """
 
+from pathlib import Path
+
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, ClockCycles, Timer
+from cocotb.triggers import ClockCycles, Timer
+
+from tb_common.monitor import SignalSampler
+from tb_common.ports import load_ports
+from tb_common.veer import attach_memory, run_program
+
+PORTS = Path(__file__).resolve().parent.parent / "ports.yaml"
 
 
 async def reset_dut(dut):
@@ -41,121 +57,29 @@ async def reset_dut(dut):
     The upstream tb_top.sv reset sequence:
       rst_l = (cycleCnt > 5), porst_l = (cycleCnt > 2)
 
-    For cocotb, we hold reset low for 5 clock cycles then release.
+    For cocotb, we hold reset low for 5 clock cycles then release. Port
+    defaults are listed in ../ports.yaml; handles are resolved once per
+    simulation by tb_common.ports.
     """
-    # Drive all control inputs to safe defaults before asserting reset
-    dut.rst_l.value = 0
-    dut.dbg_rst_l.value = 0
-    dut.nmi_int.value = 0
-
-    # Reset vector: 0x00000000 (EH1 default config), port is [31:1]
-    dut.rst_vec.value = 0x00000000 >> 1
-
-    # NMI vector: 0xEE000000, port is [31:1]
-    dut.nmi_vec.value = 0xEE000000 >> 1
-
-    # JTAG ID: matches upstream (bit 31:28=1, 11:1=0x45)
-    dut.jtag_id.value = (0x1 << 27) | 0x45
-
-    # Bus clock enables (all enabled = 1:1 clock ratio)
-    dut.lsu_bus_clk_en.value = 1
-    dut.ifu_bus_clk_en.value = 1
-    dut.dbg_bus_clk_en.value = 1
-    dut.dma_bus_clk_en.value = 1
-
-    # CPU halt/run control
-    dut.i_cpu_halt_req.value = 0
-    dut.i_cpu_run_req.value = 0
-    dut.mpc_debug_halt_req.value = 0
-    dut.mpc_debug_run_req.value = 1
-    dut.mpc_reset_run_req.value = 1  # Start running after reset
-
-    # Interrupts -- all deasserted
-    dut.extintsrc_req.value = 0
-    dut.timer_int.value = 0
-
-    # Scan/MBIST modes disabled
-    dut.scan_mode.value = 0
-    dut.mbist_mode.value = 0
-
-    # JTAG signals -- inactive
-    dut.jtag_tck.value = 0
-    dut.jtag_tms.value = 0
-    dut.jtag_tdi.value = 0
-    dut.jtag_trst_n.value = 0
-
-    # AXI slave response signals -- tie off to idle
-    # LSU AXI responses
-    dut.lsu_axi_awready.value = 0
-    dut.lsu_axi_wready.value = 0
-    dut.lsu_axi_bvalid.value = 0
-    dut.lsu_axi_bresp.value = 0
-    dut.lsu_axi_bid.value = 0
-    dut.lsu_axi_arready.value = 0
-    dut.lsu_axi_rvalid.value = 0
-    dut.lsu_axi_rid.value = 0
-    dut.lsu_axi_rdata.value = 0
-    dut.lsu_axi_rresp.value = 0
-    dut.lsu_axi_rlast.value = 0
-
-    # IFU AXI responses
-    dut.ifu_axi_awready.value = 0
-    dut.ifu_axi_wready.value = 0
-    dut.ifu_axi_bvalid.value = 0
-    dut.ifu_axi_bresp.value = 0
-    dut.ifu_axi_bid.value = 0
-    dut.ifu_axi_arready.value = 0
-    dut.ifu_axi_rvalid.value = 0
-    dut.ifu_axi_rid.value = 0
-    dut.ifu_axi_rdata.value = 0
-    dut.ifu_axi_rresp.value = 0
-    dut.ifu_axi_rlast.value = 0
-
-    # SB (debug system bus) AXI responses
-    dut.sb_axi_awready.value = 0
-    dut.sb_axi_wready.value = 0
-    dut.sb_axi_bvalid.value = 0
-    dut.sb_axi_bresp.value = 0
-    dut.sb_axi_bid.value = 0
-    dut.sb_axi_arready.value = 0
-    dut.sb_axi_rvalid.value = 0
-    dut.sb_axi_rid.value = 0
-    dut.sb_axi_rdata.value = 0
-    dut.sb_axi_rresp.value = 0
-    dut.sb_axi_rlast.value = 0
-
-    # DMA AXI master signals (no DMA activity)
-    dut.dma_axi_awvalid.value = 0
-    dut.dma_axi_awid.value = 0
-    dut.dma_axi_awaddr.value = 0
-    dut.dma_axi_awsize.value = 0
-    dut.dma_axi_awprot.value = 0
-    dut.dma_axi_awlen.value = 0
-    dut.dma_axi_awburst.value = 0
-    dut.dma_axi_wvalid.value = 0
-    dut.dma_axi_wdata.value = 0
-    dut.dma_axi_wstrb.value = 0
-    dut.dma_axi_wlast.value = 0
-    dut.dma_axi_bready.value = 0
-    dut.dma_axi_arvalid.value = 0
-    dut.dma_axi_arid.value = 0
-    dut.dma_axi_araddr.value = 0
-    dut.dma_axi_arsize.value = 0
-    dut.dma_axi_arprot.value = 0
-    dut.dma_axi_arlen.value = 0
-    dut.dma_axi_arburst.value = 0
-    dut.dma_axi_rready.value = 0
+    ports = load_ports(dut, PORTS)
+
+    # Drive all control inputs to safe defaults and assert reset
+    ports.apply("reset")
 
     # Hold reset for 5 clock cycles
     await ClockCycles(dut.clk, 5)
 
     # Release resets
-    dut.rst_l.value = 1
-    dut.dbg_rst_l.value = 1
-    dut.jtag_trst_n.value = 1
+    ports.apply("release")
     await ClockCycles(dut.clk, 3)
 
 
+PROGRAMS = Path(__file__).resolve().parent.parent / "programs"
+
+# Where the core starts fetching
+RESET_VECTOR = 0x00000000
+
+
 @cocotb.test()
 async def test_compile(dut):
     """Verify that the VeeR EH1 design compiles and elaborates successfully.
@@ -220,18 +144,47 @@ async def test_smoke_100_cycles(dut):
 
     await reset_dut(dut)
 
-    ifu_arvalid_seen = False
-
-    for cycle in range(100):
-        await RisingEdge(dut.clk)
-
-        # Check if IFU is attempting to fetch instructions via AXI
-        try:
-            if int(dut.ifu_axi_arvalid.value) == 1:
-                ifu_arvalid_seen = True
-        except ValueError:
-            pass  # X/Z values are acceptable during early cycles
+    # Check if IFU is attempting to fetch instructions via AXI; X/Z values
+    # during early cycles are recorded in the trace's mask, not raised
+    sampler = SignalSampler(dut.clk, [dut.ifu_axi_arvalid]).start()
+    await ClockCycles(dut.clk, 100)
+    sampler.stop()
+    ifu_arvalid_seen = sampler["ifu_axi_arvalid"].any()
 
     dut._log.info(f"Completed 100 cycles after reset")
     dut._log.info(f"IFU AXI arvalid seen: {ifu_arvalid_seen}")
     dut._log.info("Smoke test passed -- core did not hang")
+
+
+@cocotb.test()
+async def test_fetch_from_memory(dut):
+    """Verify the IFU fetches from the AXI memory model.
+
+    A self-jump at the reset vector keeps the core fetching the same line;
+    the IFU slave must complete read bursts and the core must not halt.
+    """
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+
+    await reset_dut(dut)
+    _, slaves = attach_memory(dut, RESET_VECTOR)
+
+    await ClockCycles(dut.clk, 200)
+
+    dut._log.info(
+        "AXI beats served: ifu=%d lsu reads=%d lsu writes=%d",
+        slaves["ifu"].read_beats, slaves["lsu"].read_beats, slaves["lsu"].write_beats,
+    )
+    assert slaves["ifu"].read_beats > 0, "IFU never completed an AXI read"
+
+
+@cocotb.test()
+async def test_hello(dut):
+    """Run programs/hello.hex to completion from the AXI memory model."""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+
+    await reset_dut(dut)
+    text, passed = await run_program(dut, PROGRAMS / "hello.hex", max_cycles=50000)
+
+    dut._log.info("Program output:\n%s", text)
+    assert passed, "hello.hex reported failure through the mailbox"
+    assert "Hello World" in text
@@ -24,12 +24,24 @@ Test strategy:
   - test_reset: Drives clock and reset, verifies the SoC enters a known state
   - test_smoke_100_cycles: Runs for 100 clock cycles post-reset to verify the
     SoC does not hang or produce errors
+
+Console output: tb_common.uart.UartMonitor decodes o_pad_uart0_sout. It only
+wakes on the start bit's falling edge and at bit midpoints, so it costs
+nothing while the line is idle. The bit period comes from the `uart`
+section of config.yaml.
 """
 
+from pathlib import Path
+
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, ClockCycles, Timer
 
+from tb_common.uart import UartMonitor, uart_config
+
+CONFIG = Path(__file__).resolve().parent.parent / "config.yaml"
+CLOCK_PERIOD_NS = 10
+
 
 async def reset_dut(dut):
     """Apply reset sequence matching the upstream tb.v pattern.
@@ -56,6 +68,13 @@ async def reset_dut(dut):
     await ClockCycles(dut.i_pad_clk, 3)
 
 
+def start_console(dut):
+    """Attach a UartMonitor to the UART0 TX pad using the config.yaml settings."""
+    settings = uart_config(CONFIG)
+    return UartMonitor(getattr(dut, settings["tx"]), CLOCK_PERIOD_NS,
+                       settings["clocks_per_bit"], log=dut._log).start()
+
+
 @cocotb.test()
 async def test_compile(dut):
     """Verify that the XuanTie C910 SoC design compiles and elaborates successfully.
@@ -73,7 +92,7 @@ async def test_compile(dut):
     Simply reaching this point (cocotb test starting) means compilation
     and elaboration succeeded.
     """
-    cocotb.start_soon(Clock(dut.i_pad_clk, 10, units="ns").start())
+    cocotb.start_soon(Clock(dut.i_pad_clk, CLOCK_PERIOD_NS, units="ns").start())
     await Timer(1, units="ns")
     dut._log.info("XuanTie C910 SoC design compiled and elaborated successfully")
 
@@ -87,7 +106,7 @@ async def test_reset(dut):
     - UART output should be in idle state
     - GPIO should be in default state
     """
-    cocotb.start_soon(Clock(dut.i_pad_clk, 10, units="ns").start())
+    cocotb.start_soon(Clock(dut.i_pad_clk, CLOCK_PERIOD_NS, units="ns").start())
 
     await reset_dut(dut)
 
@@ -107,9 +126,12 @@ async def test_smoke_100_cycles(dut):
     instruction fetch responses, which is expected behavior. The important
     thing is that it does not produce simulation errors.
     """
-    cocotb.start_soon(Clock(dut.i_pad_clk, 10, units="ns").start())
+    cocotb.start_soon(Clock(dut.i_pad_clk, CLOCK_PERIOD_NS, units="ns").start())
 
     await reset_dut(dut)
+    # Logs any console output; 100 cycles are shorter than one UART bit, so
+    # framing errors can only be checked by a test that runs a program
+    start_console(dut)
 
     for cycle in range(100):
         await RisingEdge(dut.i_pad_clk)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""run_ab.py — Interleaved A/B benchmark of two RyuSim installations.
+
+Running the suite once per RyuSim build at different times mixes machine
+noise (other load, thermal state, page cache) into the comparison. This
+runner alternates the two installations run by run on each design, so both
+see the same conditions, and treats each consecutive two runs as a pair.
+The order within a pair alternates too -- A B, B A, A B, ... (ABBA) -- so an
+effect of running first or second (a warm page cache, a leftover process
+from the previous build) falls on both sides alike instead of showing up as
+a speedup; each result records the order of its pairs.
+
+An installation is a `ryusim` executable or an install prefix (a directory
+holding bin/ryusim or ryusim). It is selected by putting its directory first
+on PATH for make; an executable with another name is linked as `ryusim` in
+a private directory. Every run starts from a clean build (sim_build/ and
+obj_dir/ are removed) and runs the full `make` through
+run_benchmarks.run_benchmark().
+
+Per design and measure -- total make time, compile, execute, and any
+*_per_sec testbench metric -- the report gives the median of each side and
+the speedup of B over A: A/B for times, B/A for rates, so > 1 always means B
+is better. The speedup is the geometric mean of the per-pair ratios, with a
+bootstrap confidence interval; `p` is a two-sided sign-flip permutation test
+of the log ratios (exact up to 16 pairs), and `significant` is p < --alpha.
+With n pairs p cannot go below 2/2**n, so 0.05 takes at least 6 runs.
+Designs where any run failed are reported with status "failed" and no
+statistics.
+
+Usage:
+    python run_ab.py --a /opt/ryusim-1.4 --b ~/.ryusim/bin/ryusim --design Vortex --runs 9
+    python run_ab.py --a old/bin/ryusim --b new/bin/ryusim --all --output results/ab.json
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from harness.buildinfo import BUILD_DIRS
+from harness.isolation import Isolation, add_isolation_arguments, parse_cpus
+from run_benchmarks import DEFAULT_TIMEOUT, discover_designs, get_ryusim_version, run_benchmark
+
+DEFAULT_RUNS = 7  # the smallest possible p is 2 / 2**pairs: 6+ pairs to reach 0.05
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_ALPHA = 0.05
+BOOTSTRAP_SAMPLES = 10000
+EXACT_PERMUTATION_PAIRS = 16  # 2**16 sign patterns; beyond that, sample
+PERMUTATION_SAMPLES = 20000
+RATE_SUFFIX = "_per_sec"
+
+
+class Installation:
+    """A RyuSim installation selected through PATH."""
+
+    def __init__(self, label, location):
+        self.label = label
+        path = Path(location).expanduser().resolve()
+        if path.is_dir():
+            binary = next((p for p in (path / "bin" / "ryusim", path / "ryusim") if p.is_file()), None)
+        else:
+            binary = path if path.is_file() else None
+        if binary is None or not os.access(binary, os.X_OK):
+            raise FileNotFoundError(f"no ryusim executable at {location}")
+        self.binary = binary
+        if binary.name == "ryusim":
+            self.bin_dir = binary.parent
+        else:
+            self.bin_dir = Path(tempfile.mkdtemp(prefix=f"ryusim-{label}-"))
+            (self.bin_dir / "ryusim").symlink_to(binary)
+
+    def env(self):
+        """Return os.environ with this installation first on PATH."""
+        return {**os.environ, "PATH": f"{self.bin_dir}{os.pathsep}{os.environ.get('PATH', os.defpath)}"}
+
+    def describe(self):
+        return {"path": str(self.binary), "version": get_ryusim_version(self.env())}
+
+
+def run_measures(result):
+    """Return {measure: value} of one run_benchmark() result."""
+    ryusim = result.get("ryusim") or {}
+    measures = {
+        "total": result.get("duration"),
+        "compile": (ryusim.get("compile") or {}).get("elapsed"),
+        "execute": (ryusim.get("execute") or {}).get("elapsed"),
+    }
+    for test, values in (result.get("metrics") or {}).items():
+        for name, value in (values if isinstance(values, dict) else {}).items():
+            if name.endswith(RATE_SUFFIX):
+                measures[f"{test}.{name}"] = value
+    return {key: value for key, value in measures.items() if isinstance(value, (int, float)) and value > 0}
+
+
+def bootstrap_interval(logs, confidence=DEFAULT_CONFIDENCE, samples=BOOTSTRAP_SAMPLES, rng=None):
+    """Return the (low, high) percentile bootstrap interval of mean(logs), exponentiated."""
+    rng = rng or random.Random(0)
+    n = len(logs)
+    means = sorted(sum(rng.choices(logs, k=n)) / n for _ in range(samples))
+    tail = (1 - confidence) / 2
+    low = means[int(tail * (samples - 1))]
+    high = means[int(math.ceil((1 - tail) * (samples - 1)))]
+    return math.exp(low), math.exp(high)
+
+
+def sign_flip_p(logs, samples=PERMUTATION_SAMPLES, rng=None):
+    """Two-sided p-value of mean(logs) != 0 under random sign flips of the pairs."""
+    observed = abs(sum(logs))
+    if len(logs) <= EXACT_PERMUTATION_PAIRS:
+        patterns = itertools.product((1, -1), repeat=len(logs))
+        total = 2 ** len(logs)
+    else:
+        rng = rng or random.Random(0)
+        patterns = ([rng.choice((1, -1)) for _ in logs] for _ in range(samples))
+        total = samples
+    extreme = sum(
+        1 for signs in patterns
+        if abs(sum(s * x for s, x in zip(signs, logs))) >= observed - 1e-12
+    )
+    return extreme / total
+
+
+def compare(a_runs, b_runs, higher_is_better=False, confidence=DEFAULT_CONFIDENCE, alpha=DEFAULT_ALPHA):
+    """Return the A/B statistics of paired values (a_runs[i], b_runs[i])."""
+    pairs = [(a, b) for a, b in zip(a_runs, b_runs) if a and b]
+    if not pairs:
+        return None
+    logs = [math.log(b / a) if higher_is_better else math.log(a / b) for a, b in pairs]
+    low, high = bootstrap_interval(logs, confidence)
+    p = sign_flip_p(logs)
+    return {
+        "pairs": len(pairs),
+        "a_median": statistics.median(a for a, _ in pairs),
+        "b_median": statistics.median(b for _, b in pairs),
+        "speedup": math.exp(sum(logs) / len(logs)),
+        "ci_low": low,
+        "ci_high": high,
+        "p": p,
+        "significant": p < alpha,
+    }
+
+
+def clean_build(design_path):
+    for name in BUILD_DIRS:
+        shutil.rmtree(design_path / name, ignore_errors=True)
+
+
+def run_design(design_path, installations, runs, warmup=0, test_name=None, timeout=None,
+               confidence=DEFAULT_CONFIDENCE, alpha=DEFAULT_ALPHA, isolation=None, verbose=False):
+    """Alternate the installations on one design; returns its result dict.
+
+    `isolation` (a harness.isolation.Isolation) pins every run to its CPU set.
+    """
+    samples = {inst.label: [] for inst in installations}
+    failures = []
+    order = [installations if index % 2 == 0 else installations[::-1] for index in range(warmup + runs)]
+    schedule = [(index, inst) for index, pair in enumerate(order) for inst in pair]
+    for index, inst in schedule:
+        if failures:
+            break  # a failing design gives no comparable pairs
+        clean_build(design_path)
+        result = run_benchmark(design_path, test_name=test_name, timeout_override=timeout,
+                               base_env=inst.env(), isolation=isolation)
+        if verbose:
+            kind = "warmup" if index < warmup else f"run {index - warmup + 1}/{runs}"
+            print(f"  {design_path.name} {inst.label} {kind}: {result['status']} "
+                  f"({result['duration']:.2f}s)", file=sys.stderr)
+        if result["status"] != "passed":
+            failures.append({"side": inst.label, "run": index, "status": result["status"],
+                             "log": (result.get("stderr") or result.get("stdout") or "")[-2000:]})
+        elif index >= warmup:
+            samples[inst.label].append(run_measures(result))
+    clean_build(design_path)
+
+    entry = {"design": design_path.name, "path": str(design_path),
+             "order": ["".join(inst.label for inst in pair) for pair in order[warmup:]]}
+    if failures:
+        return {**entry, "status": "failed", "failures": failures}
+    a_label, b_label = (inst.label for inst in installations)
+    names = sorted(set.intersection(*(set(m) for m in samples[a_label] + samples[b_label])))
+    measures = {}
+    for name in names:
+        measures[name] = compare(
+            [m[name] for m in samples[a_label]],
+            [m[name] for m in samples[b_label]],
+            higher_is_better=name.endswith(RATE_SUFFIX),
+            confidence=confidence,
+            alpha=alpha,
+        )
+    return {**entry, "status": "passed", "runs": {label: values for label, values in samples.items()},
+            "measures": measures}
+
+
+def overall_speedup(results, measure="total"):
+    """Geometric mean of the per-design speedups of `measure`."""
+    speedups = [r["measures"][measure]["speedup"] for r in results
+                if r["status"] == "passed" and (r["measures"].get(measure) or {}).get("speedup")]
+    if not speedups:
+        return None
+    return math.exp(sum(math.log(s) for s in speedups) / len(speedups))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Interleaved A/B benchmark of two RyuSim installations",
+    )
+    parser.add_argument("--a", required=True, metavar="PATH", help="Baseline ryusim executable or install prefix")
+    parser.add_argument("--b", required=True, metavar="PATH", help="Candidate ryusim executable or install prefix")
+    parser.add_argument("--all", action="store_true", help="Compare on all benchmarks")
+    parser.add_argument("--design", type=str, action="append", help="Design name (repeatable)")
+    parser.add_argument("--source", type=str, choices=["cocotb", "rtlmeter"],
+                        help="Only benchmarks from this source directory")
+    parser.add_argument("--test", type=str, help="Run specific test within each design")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help=f"Measured runs per installation and design (default: {DEFAULT_RUNS})")
+    parser.add_argument("--warmup", type=int, default=0, help="Unmeasured leading runs per installation (default: 0)")
+    parser.add_argument("--timeout", type=int, help=f"Per-run timeout in seconds (default: config.yaml timeout, else {DEFAULT_TIMEOUT})")
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE,
+                        help=f"Confidence level of the speedup intervals (default: {DEFAULT_CONFIDENCE})")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                        help=f"Significance level of the permutation test (default: {DEFAULT_ALPHA})")
+    parser.add_argument("--output", type=str, help="Output JSON file path")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Print per-run progress to stderr")
+    add_isolation_arguments(parser)
+    args = parser.parse_args()
+
+    if not args.all and not args.design:
+        parser.print_help()
+        sys.exit(0)
+    if args.runs < 2:
+        print("Error: --runs must be at least 2", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        installations = [Installation("a", args.a), Installation("b", args.b)]
+    except FileNotFoundError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    isolation = None
+    if args.isolate:
+        try:
+            isolation = Isolation(parse_cpus(args.isolate_cpus) if args.isolate_cpus else None,
+                                  aslr=not args.no_aslr)
+        except (ValueError, FileNotFoundError) as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            sys.exit(1)
+        for warning in isolation.conditions()["warnings"]:
+            print(f"Warning: {warning}; timings will be noisier", file=sys.stderr)
+
+    designs = discover_designs(source=args.source)
+    if args.design:
+        designs = [d for d in designs if d.name in args.design]
+        missing = set(args.design) - {d.name for d in designs}
+        if missing:
+            print(f"Error: design(s) not found: {', '.join(sorted(missing))}", file=sys.stderr)
+            sys.exit(1)
+
+    timestamp = datetime.now(timezone.utc).isoformat()
+    results = []
+    for design in designs:
+        result = run_design(design, installations, args.runs, warmup=args.warmup, test_name=args.test,
+                            timeout=args.timeout, confidence=args.confidence, alpha=args.alpha,
+                            isolation=isolation, verbose=args.verbose)
+        results.append(result)
+        if args.verbose and result["status"] == "passed":
+            for name, stats in result["measures"].items():
+                print(f"    {name}: x{stats['speedup']:.3f} "
+                      f"[{stats['ci_low']:.3f}, {stats['ci_high']:.3f}] p={stats['p']:.3g}"
+                      f"{' *' if stats['significant'] else ''}", file=sys.stderr)
+
+    summary = {
+        "runner": "run_ab",
+        "a": installations[0].describe(),
+        "b": installations[1].describe(),
+        "runs": args.runs,
+        "warmup": args.warmup,
+        "confidence": args.confidence,
+        "alpha": args.alpha,
+        "total": len(results),
+        "passed": sum(1 for r in results if r["status"] == "passed"),
+        "failed": sum(1 for r in results if r["status"] == "failed"),
+        "timestamp": timestamp,
+        "isolation": isolation.conditions() if isolation else None,
+        "speedup": {measure: overall_speedup(results, measure) for measure in ("total", "compile", "execute")},
+        "results": results,
+    }
+
+    print(json.dumps(summary, indent=2))
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(summary, indent=2) + "\n")
+        print(f"Results written to {output_path}", file=sys.stderr)
+
+    if summary["failed"] > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 
 import argparse
 import json
+import os
 import subprocess
 import sys
 import time
@@ -11,21 +12,40 @@ from pathlib import Path
 
 import yaml
 
+from harness.buildinfo import DEFAULT_GROWTH_THRESHOLD, compare, inspect_build, load_baseline
+from harness.ccache import CompilerCache, add_ccache_arguments
+from harness.isolation import Isolation, add_isolation_arguments, load_average, parse_cpus
+from harness.phases import RYUSIM_PHASES, format_phases, phase_table, stacked_summary
+from harness.proc import run_measured
+from harness.pyprofile import PythonProfile, add_profile_arguments
+from harness.resultsdb import DEFAULT_CONFIGURATION, add_db_arguments, record_run
+from harness.sharding import add_shard_arguments, merge_results, select_shard
+from harness.sysmon import Timeline, add_timeline_arguments, render_ascii, write_html
+from harness.timeouts import TimeoutPlanner, add_timeout_arguments, describe
+from tb_common.metrics import ENV_VAR as METRICS_ENV_VAR, read_metrics
+from tb_common.vpistats import ENV_VAR as VPI_STATS_ENV_VAR, read_stats, summarize as summarize_vpi_stats
+
 BENCHMARK_DIRS = {
     "rtlmeter": Path("rtlmeter_tests"),
     "cocotb": Path("cocotb_tests"),
 }
 DEFAULT_TIMEOUT = 900  # 15 minutes — large designs need 5-10min to compile on CI
+TIMEOUT_FLOOR = 120  # history-derived budgets never go below this...
+TIMEOUT_CEILING = 7200  # ...or above this
+METRICS_FILE = "tb_metrics.json"  # written by tb_common.metrics inside the design's sim_build/
+VPI_STATS_FILE = "tb_vpi_stats.json"  # written by tb_common.vpistats with --vpi-stats
+DEFAULT_VPI_TOP = 20
 
 
-def get_ryusim_version():
-    """Get the installed ryusim version string."""
+def get_ryusim_version(env=None):
+    """Get the version string of the ryusim found on PATH (of `env`, if given)."""
     try:
         result = subprocess.run(
             ["ryusim", "--version"],
             capture_output=True,
             text=True,
             timeout=10,
+            env=env,
         )
         return result.stdout.strip() or result.stderr.strip()
     except (FileNotFoundError, subprocess.TimeoutExpired):
@@ -63,13 +83,30 @@ def discover_designs(include_disabled=False, source=None):
     return designs
 
 
-def run_benchmark(design_path, test_name=None, compare_verilator=False, timeout_override=None):
+def run_benchmark(design_path, test_name=None, compare_verilator=False, timeout_override=None, timeouts=None,
+                  ryusim_args=None, profile=None, vpi_top=None, timeline=None, ccache=None, base_env=None,
+                  isolation=None):
     """Run benchmark for a single design.
 
     Runs `make` in the design directory (cocotb with SIM=ryusim), captures
-    timing and exit code. Optionally runs Verilator comparison.
-
-    Timeout precedence: CLI --timeout > config.yaml timeout > DEFAULT_TIMEOUT.
+    timing and exit code. The streamed log is split into RyuSim's compile
+    phases (see harness.phases), stored as the result's "compile_phases".
+    `ryusim_args` is appended to the Makefile's EXTRA_ARGS, e.g. to turn on
+    a timing report. `profile` is an optional {"dir", "top"} dict that turns
+    on harness.pyprofile for the run. With `vpi_top`, tb_common.vpistats
+    counts the testbench's VPI accesses; the result's "vpi_stats" holds the
+    totals and the `vpi_top` busiest signals. `timeline` ({"interval",
+    "dir"}) samples the process tree into the result's "timeline" and an
+    HTML chart. `ccache` (a harness.ccache.CompilerCache) routes the C++
+    compile through ccache and adds its per-run hit statistics. `base_env`
+    replaces os.environ as the environment make starts from (e.g. a PATH
+    selecting another RyuSim installation). `isolation` (a
+    harness.isolation.Isolation) pins make and the Verilator comparison to
+    its CPU set; the result's "isolation" records the run's conditions.
+    Optionally runs Verilator comparison.
+
+    Timeout precedence: CLI --timeout > config.yaml timeout > p99 of recorded
+    durations x factor (via `timeouts`, a TimeoutPlanner) > DEFAULT_TIMEOUT.
 
     Returns a dict with benchmark results.
     """
@@ -93,56 +130,101 @@ def run_benchmark(design_path, test_name=None, compare_verilator=False, timeout_
             "stderr": "config.yaml not found",
         }
 
-    # Determine timeout: CLI override > config.yaml > default
-    design_timeout = timeout_override or config.get("timeout", DEFAULT_TIMEOUT)
+    # Determine timeout: CLI override > config.yaml > history > default
+    if timeouts is None:
+        timeouts = TimeoutPlanner(adaptive=False)
+    override, override_source = timeout_override, "cli"
+    if not override and config.get("timeout"):
+        override, override_source = config["timeout"], "config"
+    budget = timeouts.budget(
+        design_path, "make", DEFAULT_TIMEOUT, TIMEOUT_FLOOR, TIMEOUT_CEILING,
+        override=override, override_source=override_source, primary=True,
+    )
+    design_timeout = budget["budget"]
 
     # Build make command with optional test target
     make_cmd = ["make"]
     if test_name:
         make_cmd.append(test_name)
 
+    # Testbenches report their own metrics (e.g. simulated cycles/s) here
+    metrics_file = (design_path / "sim_build" / METRICS_FILE).resolve()
+    metrics_file.unlink(missing_ok=True)
+    if base_env is None:
+        base_env = os.environ
+    env = {**base_env, METRICS_ENV_VAR: str(metrics_file)}
+    vpi_stats_file = (design_path / "sim_build" / VPI_STATS_FILE).resolve()
+    vpi_stats_file.unlink(missing_ok=True)
+    if vpi_top:
+        env[VPI_STATS_ENV_VAR] = str(vpi_stats_file)
+    if ryusim_args:
+        # The Makefiles append with `EXTRA_ARGS +=`, which keeps an environment value
+        env["EXTRA_ARGS"] = " ".join(filter(None, (base_env.get("EXTRA_ARGS"), ryusim_args)))
+
+    ccache_before = None
+    if ccache:
+        env = ccache.env(env)
+        ccache_before = ccache.stats()
+
+    python_profile = None
+    if profile:
+        python_profile = PythonProfile(design_path, design_path.name, profile["dir"], profile["top"])
+        make_cmd = python_profile.command(make_cmd)
+        env = python_profile.env(env)
+
+    preexec_fn = None
+    if isolation:
+        make_cmd = isolation.command(make_cmd)
+        preexec_fn = isolation.preexec
+    load_before = load_average()
+
     # Run RyuSim benchmark via make
-    compile_start = time.perf_counter()
     try:
-        result = subprocess.run(
+        run = run_measured(
             make_cmd,
-            capture_output=True,
-            text=True,
             cwd=str(design_path),
+            env=env,
             timeout=design_timeout,
+            phases=RYUSIM_PHASES,
+            timeline=Timeline(timeline["interval"]) if timeline else None,
+            preexec_fn=preexec_fn,
         )
-    except subprocess.TimeoutExpired:
-        elapsed = time.perf_counter() - compile_start
+    except FileNotFoundError:
         return {
             "design": design_path.name,
             "path": str(design_path),
             "test": test_name,
             "ryusim": {
-                "compile": {"elapsed": elapsed, "status": "timeout"},
-                "execute": {"elapsed": 0, "status": "skipped"},
+                "compile": {"elapsed": 0, "status": "error"},
+                "execute": {"elapsed": 0, "status": "error"},
             },
             "status": "error",
-            "duration": elapsed,
+            "duration": 0,
             "stdout": "",
-            "stderr": f"Benchmark timed out ({design_timeout}s)",
+            "stderr": "make not found on PATH",
         }
-    except FileNotFoundError:
+
+    phases = phase_table(run)
+    if run["timed_out"]:
         return {
             "design": design_path.name,
             "path": str(design_path),
             "test": test_name,
             "ryusim": {
-                "compile": {"elapsed": 0, "status": "error"},
-                "execute": {"elapsed": 0, "status": "error"},
+                "compile": {"elapsed": phases["compile"], "status": "timeout"},
+                "execute": {"elapsed": 0, "status": "skipped"},
             },
             "status": "error",
-            "duration": 0,
-            "stdout": "",
-            "stderr": "make not found on PATH",
+            "duration": run["elapsed"],
+            "timeout": budget,
+            "compile_phases": phases,
+            "stdout": run["stdout"],
+            "stderr": f"Benchmark timed out ({describe(budget)})",
         }
 
-    total_elapsed = time.perf_counter() - compile_start
-    ryusim_status = "passed" if result.returncode == 0 else "failed"
+    total_elapsed = run["elapsed"]
+    ryusim_status = "passed" if run["returncode"] == 0 else "failed"
+    executed = phases["phases"]["execute"]["start"] is not None
 
     benchmark_result = {
         "design": design_path.name,
@@ -153,27 +235,65 @@ def run_benchmark(design_path, test_name=None, compare_verilator=False, timeout_
         "ryusim": {
             "elapsed": total_elapsed,
             "status": ryusim_status,
-            "compile": None,
-            "execute": None,
+            "compile": {
+                "elapsed": phases["compile"],
+                "status": "passed" if executed else ryusim_status,
+            },
+            "execute": {
+                "elapsed": phases["phases"]["execute"]["elapsed"],
+                "status": ryusim_status if executed else "skipped",
+            },
         },
         "status": ryusim_status,
         "duration": total_elapsed,
-        "stdout": result.stdout,
-        "stderr": result.stderr,
+        "steps": {"make": total_elapsed},
+        "compile_phases": phases,
+        "build": inspect_build(design_path),
+        "metrics": read_metrics(metrics_file),
+        # make's stderr is interleaved into stdout so the phase markers keep their order
+        "stdout": run["stdout"],
+        "stderr": "",
     }
 
+    if isolation:
+        benchmark_result["isolation"] = isolation.run_conditions(load_before)
+
+    if ccache:
+        benchmark_result["ccache"] = ccache.report(ccache_before, str(design_path), phases["compile"])
+
+    if run["timeline"]:
+        benchmark_result["timeline"] = run["timeline"]
+        benchmark_result["timeline_html"] = write_html(run["timeline"], timeline["dir"], design_path.name)
+
+    if vpi_top:
+        benchmark_result["vpi_stats"] = summarize_vpi_stats(read_stats(vpi_stats_file), vpi_top)
+
+    if python_profile:
+        summary = python_profile.collect()
+        execute_seconds = phases["phases"]["execute"]["elapsed"]
+        if summary.get("python_seconds") is not None and execute_seconds:
+            # The rest of the execute phase is RyuSim evaluating the design
+            summary["python_share"] = min(summary["python_seconds"] / execute_seconds, 1.0)
+        benchmark_result["python_profile"] = summary
+
     # Optional Verilator comparison
     if compare_verilator and ryusim_status == "passed":
+        verilator_budget = timeouts.budget(
+            design_path, "verilator", design_timeout, TIMEOUT_FLOOR, TIMEOUT_CEILING,
+            override=override, override_source=override_source,
+        )
         verilator_start = time.perf_counter()
         try:
             verilator_result = subprocess.run(
-                ["make", "SIM=verilator"],
+                isolation.command(["make", "SIM=verilator"]) if isolation else ["make", "SIM=verilator"],
                 capture_output=True,
                 text=True,
                 cwd=str(design_path),
-                timeout=design_timeout,
+                timeout=verilator_budget["budget"],
+                preexec_fn=preexec_fn,
             )
             verilator_elapsed = time.perf_counter() - verilator_start
+            benchmark_result["steps"]["verilator"] = verilator_elapsed
             benchmark_result["verilator"] = {
                 "compile": {
                     "elapsed": verilator_elapsed,
@@ -184,7 +304,14 @@ def run_benchmark(design_path, test_name=None, compare_verilator=False, timeout_
                     "status": "passed" if verilator_result.returncode == 0 else "failed",
                 },
             }
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+        except subprocess.TimeoutExpired:
+            verilator_elapsed = time.perf_counter() - verilator_start
+            benchmark_result["verilator"] = {
+                "compile": {"elapsed": verilator_elapsed, "status": "timeout"},
+                "execute": {"elapsed": 0, "status": "skipped"},
+                "timeout": verilator_budget,
+            }
+        except FileNotFoundError:
             verilator_elapsed = time.perf_counter() - verilator_start
             benchmark_result["verilator"] = {
                 "compile": {"elapsed": verilator_elapsed, "status": "error"},
@@ -194,6 +321,66 @@ def run_benchmark(design_path, test_name=None, compare_verilator=False, timeout_
     return benchmark_result
 
 
+def build_summary(results, ryusim_version, timestamp, shard=None):
+    """Build the summary dict written to stdout and --output."""
+    summary = {
+        "runner": "run_benchmarks",
+        "total": len(results),
+        "passed": sum(1 for r in results if r["status"] == "passed"),
+        "failed": sum(1 for r in results if r["status"] == "failed"),
+        "error": sum(1 for r in results if r["status"] == "error"),
+        "ryusim_version": ryusim_version,
+        "timestamp": timestamp,
+        "compile_phases": stacked_summary(results),
+        "build_growth": [
+            {"design": r["design"], **flag}
+            for r in results
+            for flag in (r.get("build") or {}).get("growth", [])
+        ],
+        "results": results,
+    }
+    if shard:
+        summary["shard"] = shard
+    return summary
+
+
+def write_summary(summary, output=None):
+    """Print the summary, optionally write it to a file, and exit 1 on failures."""
+    print(json.dumps(summary, indent=2))
+
+    if output:
+        output_path = Path(output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(summary, indent=2) + "\n")
+        print(f"Results written to {output}", file=sys.stderr)
+
+    if summary["failed"] > 0 or summary.get("error", 0) > 0:
+        sys.exit(1)
+
+
+def configuration_label(args):
+    """Return the results-database configuration of a run: the options that change what is measured."""
+    options = []
+    if args.ryusim_args:
+        options.append(f"ryusim-args={args.ryusim_args}")
+    for flag in ("ccache", "vpi_stats", "profile_python", "timeline", "isolate"):
+        if getattr(args, flag):
+            options.append(flag.replace("_", "-"))
+    if args.isolate and args.no_aslr:
+        options.append("no-aslr")
+    return ",".join(options) or DEFAULT_CONFIGURATION
+
+
+def merge_main(args):
+    """Combine per-shard JSON outputs into a single summary."""
+    summaries = [json.loads(Path(p).read_text()) for p in args.inputs]
+    results, ryusim_version, timestamp = merge_results(summaries)
+    summary = build_summary(results, ryusim_version, timestamp)
+    configuration = next((s["configuration"] for s in summaries if s.get("configuration")), DEFAULT_CONFIGURATION)
+    record_run(summary, args, configuration)
+    write_summary(summary, args.output)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Discover and run RyuSim benchmarks",
@@ -213,7 +400,7 @@ def main():
         help="Enable Verilator comparison",
     )
     parser.add_argument("--output", type=str, help="Output JSON file path")
-    parser.add_argument("--timeout", type=int, help=f"Override per-design timeout in seconds (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--timeout", type=int, help=f"Override per-design timeout in seconds (default: from history, else {DEFAULT_TIMEOUT})")
     parser.add_argument("--ryusim-version", type=str, help="Expected RyuSim version")
     parser.add_argument("--verbose", "-v", action="store_true", help="Print per-benchmark progress to stderr")
     parser.add_argument(
@@ -221,8 +408,52 @@ def main():
         action="store_true",
         help="Include designs with enabled: false in config.yaml",
     )
+    parser.add_argument(
+        "--ryusim-args",
+        type=str,
+        help="Extra RyuSim arguments appended to each Makefile's EXTRA_ARGS (e.g. a timing report flag)",
+    )
+    parser.add_argument(
+        "--vpi-stats",
+        action="store_true",
+        help="Count VPI lookups/reads/writes/trigger registrations per signal and test (tb_common testbenches)",
+    )
+    parser.add_argument(
+        "--vpi-top",
+        type=int,
+        default=DEFAULT_VPI_TOP,
+        help=f"Number of busiest signals kept with --vpi-stats (default: {DEFAULT_VPI_TOP})",
+    )
+    parser.add_argument(
+        "--size-baseline",
+        action="append",
+        metavar="PATH",
+        help="Earlier run_benchmarks JSON (file, directory or glob; repeatable) to compare build sizes against",
+    )
+    parser.add_argument(
+        "--size-growth-threshold",
+        type=float,
+        default=DEFAULT_GROWTH_THRESHOLD,
+        help=f"Flag build-size metrics that grew by more than this fraction (default: {DEFAULT_GROWTH_THRESHOLD})",
+    )
+    add_shard_arguments(parser)
+    add_timeout_arguments(parser)
+    add_profile_arguments(parser)
+    add_timeline_arguments(parser)
+    add_ccache_arguments(parser)
+    add_isolation_arguments(parser)
+    add_db_arguments(parser)
+
+    subparsers = parser.add_subparsers(dest="command")
+    merge_parser = subparsers.add_parser("merge", help="Combine per-shard JSON outputs into one summary")
+    merge_parser.add_argument("inputs", nargs="+", help="Per-shard JSON files")
+    merge_parser.add_argument("--output", type=str, help="Output JSON file path")
     args = parser.parse_args()
 
+    if args.command == "merge":
+        merge_main(args)
+        return
+
     if not args.all and not args.design:
         parser.print_help()
         sys.exit(0)
@@ -235,11 +466,46 @@ def main():
             print(f"Error: design '{args.design}' not found", file=sys.stderr)
             sys.exit(1)
 
+    if args.shard:
+        try:
+            designs = select_shard(designs, args.shard, args.history, runner="run_benchmarks")
+        except ValueError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            sys.exit(1)
+
     ryusim_version = get_ryusim_version()
     if args.ryusim_version and ryusim_version and args.ryusim_version != ryusim_version:
         print(f"Warning: expected ryusim {args.ryusim_version}, got {ryusim_version}", file=sys.stderr)
     timestamp = datetime.now(timezone.utc).isoformat()
 
+    timeouts = TimeoutPlanner(
+        history=args.history,
+        runner="run_benchmarks",
+        factor=args.timeout_factor,
+        adaptive=not args.no_adaptive_timeouts,
+    )
+
+    ccache = None
+    if args.ccache:
+        try:
+            ccache = CompilerCache(args.ccache_dir, args.ccache_max_size)
+        except FileNotFoundError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            sys.exit(1)
+
+    isolation = None
+    if args.isolate:
+        try:
+            isolation = Isolation(parse_cpus(args.isolate_cpus) if args.isolate_cpus else None,
+                                  aslr=not args.no_aslr)
+        except (ValueError, FileNotFoundError) as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            sys.exit(1)
+        for warning in isolation.conditions()["warnings"]:
+            print(f"Warning: {warning}; timings will be noisier", file=sys.stderr)
+
+    size_baseline = load_baseline(args.size_baseline) if args.size_baseline else {}
+
     results = []
     for design in designs:
         result = run_benchmark(
@@ -247,34 +513,53 @@ def main():
             test_name=args.test,
             compare_verilator=args.compare_verilator,
             timeout_override=args.timeout,
+            timeouts=timeouts,
+            ryusim_args=args.ryusim_args,
+            profile={"dir": args.profile_dir, "top": args.profile_top} if args.profile_python else None,
+            vpi_top=args.vpi_top if args.vpi_stats else None,
+            timeline={"interval": args.timeline_interval / 1000, "dir": args.timeline_dir} if args.timeline else None,
+            ccache=ccache,
+            isolation=isolation,
         )
+        baseline = size_baseline.get(result["path"])
+        if baseline and result.get("build"):
+            result["build"]["growth"] = compare(result["build"], baseline, args.size_growth_threshold)
         results.append(result)
         if args.verbose:
             print(
                 f"  {result['design']}: {result['status']} ({result['duration']:.2f}s)",
                 file=sys.stderr,
             )
-
-    summary = {
-        "total": len(results),
-        "passed": sum(1 for r in results if r["status"] == "passed"),
-        "failed": sum(1 for r in results if r["status"] == "failed"),
-        "error": sum(1 for r in results if r["status"] == "error"),
-        "ryusim_version": ryusim_version,
-        "timestamp": timestamp,
-        "results": results,
-    }
-
-    print(json.dumps(summary, indent=2))
-
-    if args.output:
-        output_path = Path(args.output)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(json.dumps(summary, indent=2) + "\n")
-        print(f"Results written to {args.output}", file=sys.stderr)
-
-    if summary["failed"] > 0 or summary.get("error", 0) > 0:
-        sys.exit(1)
+            if result.get("ccache"):
+                stats = result["ccache"]
+                print(f"    ccache: {stats['hits']} hits, {stats['misses']} misses, "
+                      f"saved {stats['saved_seconds']:.1f}s", file=sys.stderr)
+            build = result.get("build")
+            if build:
+                binary = build["binary"] or {}
+                print(f"    build: {build['cpp']['files']} C++ files, {build['cpp']['lines']} lines, "
+                      f"text {binary.get('text', 0) / 1e6:.1f} MB", file=sys.stderr)
+                for flag in build.get("growth", []):
+                    print(f"    grew: {flag['metric']} {flag['baseline']} -> {flag['current']} "
+                          f"(+{flag['growth']:.1%})", file=sys.stderr)
+            if result.get("compile_phases"):
+                print(f"    {format_phases(result['compile_phases'])}", file=sys.stderr)
+            if result.get("timeline"):
+                print(render_ascii(result["timeline"]), file=sys.stderr)
+            if result.get("vpi_stats", {}).get("totals"):
+                totals = result["vpi_stats"]["totals"]
+                print(f"    vpi: {totals['reads']} reads, {totals['writes']} writes, "
+                      f"{totals['lookups']} lookups, {totals['triggers']} triggers", file=sys.stderr)
+            if result.get("python_profile", {}).get("python_seconds") is not None:
+                profile = result["python_profile"]
+                print(f"    python {profile['python_seconds']:.1f}s ({profile['profiler']}), "
+                      f"testbench {profile['testbench_seconds']:.1f}s -> {profile['file']}", file=sys.stderr)
+
+    summary = build_summary(results, ryusim_version, timestamp, shard=args.shard)
+    if isolation:
+        summary["isolation"] = isolation.conditions()
+    record_run(summary, args, configuration_label(args))
+    write_summary(summary, args.output)
 
 
 if __name__ == "__main__":
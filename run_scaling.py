@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+"""run_scaling.py — Build and run each configuration of a design and report how cost scales.
+
+Every entry of the design's config.yaml `configurations` section is built
+from scratch in its own sim_build_<name>/ directory and runs the same
+workload test. Each define of a configuration is passed to make as a
+variable of the same name, so the design's Makefile decides how to apply
+it. The configuration's `cores` value is the x axis of the scaling curve:
+
+    configurations:
+      2x2:
+        cores: 4
+        defines:
+          BP_CFG_FLOWVAR: e_bp_multicore_4_cfg
+
+For each configuration the result records compile time, peak compile RSS
+(process tree, sampled), binary size, execution time and the simulated
+cycles/s the testbench reports through tb_common.metrics. The "scaling"
+section fits a local exponent between successive points: cost ~ cores^k,
+so k > 1 flags superlinear growth, e.g. in code generated for replicated
+tiles.
+
+Sweep mode (--sweep) instead builds every combination of the `sweep` grid,
+with make variables as axes:
+
+    sweep:
+      testcase: test_kernel
+      rate_metric: gpu_cycles_per_sec
+      grid:
+        NUM_CORES: [1, 2, 4]
+        NUM_WARPS: [4, 8]
+
+Each result also records the size of the generated C++ in its build
+directory. The exponents are fitted per axis, between points that differ
+only in that axis, so they show which parameter stops scaling.
+
+Tune mode (--tune) sweeps the RyuSim flags the rtlmeter Makefiles pin for
+CI, RYUSIM_VPI_DEPTH (--vpi-depth: 1, 2, 4) x RYUSIM_JOBS (--jobs: 4 and
+powers of two up to this host's CPU count), unless --grid gives other axes.
+The "tuning" section lists the Pareto front of compile time, peak compile
+memory and simulation cost (seconds per cycle, or execute time without a
+rate metric) and recommends settings: a balanced choice, the best of each
+objective and the balanced choice per --vpi-depth. The recommendations are
+also kept per host and design in --tune-file.
+
+Usage:
+    python run_scaling.py --design rtlmeter_tests/BlackParrot
+    python run_scaling.py --design rtlmeter_tests/BlackParrot --config 1x1 --config 2x2
+    python run_scaling.py --design rtlmeter_tests/BlackParrot --output results/scaling.json
+    python run_scaling.py --design rtlmeter_tests/Vortex --sweep -v
+    python run_scaling.py --design rtlmeter_tests/Vortex --grid NUM_CORES=1,2,4 --grid NUM_THREADS=4,8
+    python run_scaling.py --design rtlmeter_tests/VeeR-EL2 --tune -v
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import re
+import shutil
+import socket
+import statistics
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import yaml
+
+from harness.buildinfo import CPP_SUFFIXES
+from harness.proc import run_measured
+from harness.sysmon import Timeline, add_timeline_arguments, render_ascii, write_html
+from run_benchmarks import get_ryusim_version
+from tb_common.metrics import ENV_VAR as METRICS_ENV_VAR, read_metrics
+
+DEFAULT_DESIGN = Path("rtlmeter_tests/BlackParrot")
+DEFAULT_TESTCASE = "test_scaling_workload"
+DEFAULT_RATE_METRIC = "cycles_per_sec"
+DEFAULT_TIMEOUT = 7200  # a 16-core build can take well over an hour
+SUPERLINEAR_EXPONENT = 1.1  # local exponents above this are flagged
+METRICS_FILE = "tb_metrics.json"
+
+# Costs fitted against core count (or a sweep axis); cycles_per_sec is a throughput, so its
+# exponent is reported for the cost per simulated cycle instead
+CURVES = ("compile_seconds", "compile_peak_rss_kb", "binary_bytes",
+          "generated_cpp_bytes", "seconds_per_cycle")
+
+# --tune: RyuSim flags the rtlmeter Makefiles take as make variables
+TUNE_VPI_DEPTHS = (1, 2, 4)
+TUNE_OBJECTIVES = ("compile_seconds", "compile_peak_rss_kb", "sim_cost")
+DEFAULT_TUNE_FILE = Path("results/tuning.json")
+
+
+def build_size(sim_build):
+    """Return the sizes of a build directory's contents.
+
+    "binary_bytes" is the largest executable file, "generated_cpp_bytes" and
+    "generated_cpp_files" cover the C++ sources and headers.
+    """
+    sizes = {"binary_bytes": 0, "build_bytes": 0, "generated_cpp_bytes": 0, "generated_cpp_files": 0}
+    if not Path(sim_build).exists():
+        return sizes
+    for path in Path(sim_build).rglob("*"):
+        if not path.is_file() or path.is_symlink():
+            continue
+        size = path.stat().st_size
+        sizes["build_bytes"] += size
+        if path.suffix in CPP_SUFFIXES:
+            sizes["generated_cpp_bytes"] += size
+            sizes["generated_cpp_files"] += 1
+        elif os.access(path, os.X_OK):
+            sizes["binary_bytes"] = max(sizes["binary_bytes"], size)
+    return sizes
+
+
+def build_dir_name(name):
+    """Return the sim_build directory name for a configuration name."""
+    return "sim_build_" + re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_").lower()
+
+
+def grid_configurations(grid):
+    """Expand {VARIABLE: [values]} into configurations named "VAR=v,VAR=v"."""
+    keys = list(grid)
+    configurations = {}
+    for combo in itertools.product(*(grid[key] for key in keys)):
+        defines = dict(zip(keys, combo))
+        name = ",".join(f"{key}={value}" for key, value in defines.items())
+        configurations[name] = {"defines": defines}
+    return configurations
+
+
+def parse_grid(specs):
+    """Parse repeated --grid VAR=v1,v2 arguments into {VAR: [values]}."""
+    grid = {}
+    for spec in specs:
+        key, sep, values = spec.partition("=")
+        if not sep or not key or not values:
+            raise ValueError(f"--grid expects VAR=v1,v2,..., got {spec!r}")
+        grid[key] = [int(v) if v.isdigit() else v for v in values.split(",")]
+    return grid
+
+
+def run_configuration(design_path, name, config, testcase, timeout, clean=True,
+                      rate_metric=DEFAULT_RATE_METRIC, timeline=None):
+    """Build and run one configuration; returns its result dict.
+
+    Without a `testcase` the design's whole test module runs and the first
+    test reporting `rate_metric` provides the rate. `timeline` ({"interval",
+    "dir"}) adds the sampled process-tree series and writes its HTML chart.
+    """
+    sim_build = design_path / build_dir_name(name)
+    if clean and sim_build.exists():
+        shutil.rmtree(sim_build)
+
+    metrics_file = (sim_build / METRICS_FILE).resolve()
+    env = {**os.environ, METRICS_ENV_VAR: str(metrics_file)}
+    if testcase:
+        # cocotb 1.x and 2.x spellings of the test selection
+        env.update(TESTCASE=testcase, COCOTB_TEST_FILTER=testcase)
+    cmd = ["make", f"SIM_BUILD={sim_build.name}"]
+    cmd += [f"{key}={value}" for key, value in (config.get("defines") or {}).items()]
+
+    try:
+        run = run_measured(cmd, cwd=str(design_path), env=env, timeout=timeout,
+                           timeline=Timeline(timeline["interval"]) if timeline else None)
+    except FileNotFoundError:
+        return {
+            "design": design_path.name,
+            "path": str(design_path),
+            "configuration": name,
+            "cores": config.get("cores"),
+            "status": "error",
+            "duration": 0,
+            "stderr": "make not found on PATH",
+        }
+
+    if run["timed_out"]:
+        status = "timeout"
+    else:
+        status = "passed" if run["returncode"] == 0 else "failed"
+
+    sizes = build_size(sim_build)
+    metrics = read_metrics(metrics_file)
+    if testcase:
+        cycles_per_sec = metrics.get(testcase, {}).get(rate_metric)
+    else:
+        cycles_per_sec = next((m[rate_metric] for m in metrics.values() if rate_metric in m), None)
+
+    result = {
+        "design": design_path.name,
+        "path": str(design_path),
+        "configuration": name,
+        "cores": config.get("cores"),
+        "defines": config.get("defines") or {},
+        "status": status,
+        "duration": run["elapsed"],
+        "compile": run["phases"]["compile"],
+        "execute": run["phases"]["execute"],
+        "peak_rss_kb": run["peak_rss_kb"],
+        **sizes,
+        "cycles_per_sec": cycles_per_sec,
+        "metrics": metrics,
+        "stdout": run["stdout"][-20000:],
+    }
+    if run["timeline"]:
+        result["timeline"] = run["timeline"]
+        result["timeline_html"] = write_html(run["timeline"], timeline["dir"], f"{design_path.name}-{name}")
+    return result
+
+
+def curve_point(result):
+    """Return the fitted quantities of one result (missing ones as None)."""
+    rate = result.get("cycles_per_sec")
+    return {
+        "compile_seconds": (result.get("compile") or {}).get("elapsed"),
+        "compile_peak_rss_kb": (result.get("compile") or {}).get("peak_rss_kb"),
+        "binary_bytes": result.get("binary_bytes"),
+        "generated_cpp_bytes": result.get("generated_cpp_bytes"),
+        "seconds_per_cycle": 1.0 / rate if rate else None,
+    }
+
+
+def exponent(v1, v2, x1, x2):
+    """Return k such that v2 / v1 = (x2 / x1) ** k, or None if undefined."""
+    if not v1 or not v2 or x1 == x2 or x1 <= 0 or x2 <= 0:
+        return None
+    return math.log(v2 / v1) / math.log(x2 / x1)
+
+
+def scaling_curve(results):
+    """Return the scaling curve of passing results, ordered by core count.
+
+    Each point carries its values, the ratio to the smallest configuration
+    and the local exponent log(v2/v1) / log(c2/c1) to the previous point.
+    """
+    points = sorted(
+        (r for r in results if r["status"] == "passed" and r.get("cores")),
+        key=lambda r: r["cores"],
+    )
+    curve = []
+    superlinear = []
+    base = None
+    previous = None
+    for result in points:
+        values = curve_point(result)
+        entry = {
+            "configuration": result["configuration"],
+            "cores": result["cores"],
+            "cycles_per_sec": result.get("cycles_per_sec"),
+            "values": values,
+            "ratio": {},
+            "exponent": {},
+        }
+        if base is None:
+            base = (result["cores"], values)
+        for key in CURVES:
+            value, base_value = values[key], base[1][key]
+            if value and base_value:
+                entry["ratio"][key] = value / base_value
+            k = None
+            if previous is not None:
+                k = exponent(previous[1][key], value, previous[0], result["cores"])
+            if k is not None:
+                entry["exponent"][key] = k
+                if k > SUPERLINEAR_EXPONENT:
+                    superlinear.append({
+                        "metric": key,
+                        "from": previous[2],
+                        "to": result["configuration"],
+                        "exponent": k,
+                    })
+        curve.append(entry)
+        previous = (result["cores"], values, result["configuration"])
+    return {"points": curve, "superlinear": superlinear, "threshold": SUPERLINEAR_EXPONENT}
+
+
+def axis_scaling(results, axes):
+    """Return per-axis exponents for a grid sweep.
+
+    For every pair of passing points that differ only in one axis (adjacent
+    values on that axis), the exponent of each cost is computed; the summary
+    per axis is the median over all such pairs, and individual pairs above
+    SUPERLINEAR_EXPONENT are listed.
+    """
+    passing = [r for r in results if r["status"] == "passed"]
+    by_defines = {tuple(sorted(r["defines"].items())): r for r in passing}
+    summary = {}
+    superlinear = []
+    for axis in axes:
+        values = sorted({r["defines"][axis] for r in passing})
+        pairs = {key: [] for key in CURVES}
+        for result in passing:
+            index = values.index(result["defines"][axis])
+            if index + 1 == len(values):
+                continue
+            neighbour_defines = {**result["defines"], axis: values[index + 1]}
+            neighbour = by_defines.get(tuple(sorted(neighbour_defines.items())))
+            if neighbour is None:
+                continue
+            low, high = curve_point(result), curve_point(neighbour)
+            for key in CURVES:
+                k = exponent(low[key], high[key], values[index], values[index + 1])
+                if k is None:
+                    continue
+                pairs[key].append(k)
+                if k > SUPERLINEAR_EXPONENT:
+                    superlinear.append({
+                        "axis": axis,
+                        "metric": key,
+                        "from": result["configuration"],
+                        "to": neighbour["configuration"],
+                        "exponent": k,
+                    })
+        summary[axis] = {
+            key: {"median_exponent": statistics.median(ks), "max_exponent": max(ks), "pairs": len(ks)}
+            for key, ks in pairs.items() if ks
+        }
+    return {"axes": summary, "superlinear": superlinear, "threshold": SUPERLINEAR_EXPONENT}
+
+
+def jobs_values(cpus):
+    """Return the --jobs values tried on a host with `cpus` CPUs.
+
+    The Makefiles' CI default of 4, the powers of two above it and the CPU
+    count itself.
+    """
+    values = {min(4, cpus), cpus}
+    value = 8
+    while value < cpus:
+        values.add(value)
+        value *= 2
+    return sorted(values)
+
+
+def tune_grid(cpus=None):
+    """Return the default --tune grid for this host."""
+    return {"RYUSIM_VPI_DEPTH": list(TUNE_VPI_DEPTHS), "RYUSIM_JOBS": jobs_values(cpus or os.cpu_count() or 1)}
+
+
+def tune_point(result, sim_cost):
+    """Return the lower-is-better objectives of one result.
+
+    `sim_cost` is "seconds_per_cycle" (from the testbench rate) or
+    "execute_seconds" (the execute phase) for designs without a rate.
+    """
+    point = curve_point(result)
+    if sim_cost == "seconds_per_cycle":
+        sim = point["seconds_per_cycle"]
+    else:
+        sim = (result.get("execute") or {}).get("elapsed")
+    return {
+        "compile_seconds": point["compile_seconds"],
+        "compile_peak_rss_kb": point["compile_peak_rss_kb"],
+        "sim_cost": sim,
+    }
+
+
+def pareto_front(points):
+    """Return the names of `points` ({name: objectives}) no other point dominates."""
+    def dominates(a, b):
+        return all(a[k] <= b[k] for k in TUNE_OBJECTIVES) and any(a[k] < b[k] for k in TUNE_OBJECTIVES)
+
+    return [name for name, point in points.items()
+            if not any(dominates(other, point) for other_name, other in points.items() if other_name != name)]
+
+
+def tuning_report(results):
+    """Return the Pareto front of compile time, compile memory and simulation cost, and recommendations.
+
+    Every recommendation is a set of make variables. "balanced" minimises
+    the sum of each objective relative to its best value; "by_vpi_depth"
+    gives the balanced choice for each --vpi-depth, for when a given debug
+    visibility is required.
+    """
+    passing = [r for r in results if r["status"] == "passed"]
+    sim_cost = "seconds_per_cycle" if passing and all(r.get("cycles_per_sec") for r in passing) else "execute_seconds"
+    points = {r["configuration"]: tune_point(r, sim_cost) for r in passing}
+    points = {name: point for name, point in points.items() if all(point[k] for k in TUNE_OBJECTIVES)}
+    report = {"objectives": list(TUNE_OBJECTIVES), "sim_cost": sim_cost, "pareto": [], "recommended": None}
+    if not points:
+        return report
+
+    settings = {r["configuration"]: r["defines"] for r in passing}
+    best = {k: min(point[k] for point in points.values()) for k in TUNE_OBJECTIVES}
+
+    def score(name):
+        return sum(points[name][k] / best[k] for k in TUNE_OBJECTIVES)
+
+    def entry(name):
+        return {"configuration": name, "settings": settings[name], **points[name], "score": score(name)}
+
+    front = sorted(pareto_front(points), key=lambda name: points[name]["compile_seconds"])
+    by_depth = {}
+    for name in points:
+        depth = settings[name].get("RYUSIM_VPI_DEPTH")
+        if depth is not None and (depth not in by_depth or score(name) < score(by_depth[depth])):
+            by_depth[depth] = name
+    report["pareto"] = [entry(name) for name in front]
+    report["recommended"] = {
+        "host": socket.gethostname(),
+        "cpus": os.cpu_count(),
+        "balanced": entry(min(front, key=score)),
+        "fastest_compile": entry(min(front, key=lambda name: points[name]["compile_seconds"])),
+        "lowest_memory": entry(min(front, key=lambda name: points[name]["compile_peak_rss_kb"])),
+        "fastest_sim": entry(min(front, key=lambda name: points[name]["sim_cost"])),
+        "by_vpi_depth": {str(depth): entry(name) for depth, name in sorted(by_depth.items())},
+    }
+    return report
+
+
+def update_tuning_file(path, design, report, ryusim_version, timestamp):
+    """Store `report`'s recommendations under {host: {design: ...}} in the JSON file at `path`."""
+    recommended = report["recommended"]
+    path = Path(path)
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        data = {}
+    data.setdefault(recommended["host"], {})[design] = {
+        "timestamp": timestamp,
+        "ryusim_version": ryusim_version,
+        "cpus": recommended["cpus"],
+        "balanced": recommended["balanced"]["settings"],
+        "by_vpi_depth": {depth: item["settings"] for depth, item in recommended["by_vpi_depth"].items()},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build and run each configuration (or sweep point) of a design and report how cost scales",
+    )
+    parser.add_argument("--design", type=str, default=str(DEFAULT_DESIGN),
+                        help=f"Design directory (default: {DEFAULT_DESIGN})")
+    parser.add_argument("--config", action="append", dest="configs",
+                        help="Configuration name from config.yaml (repeatable; default: all)")
+    parser.add_argument("--sweep", action="store_true",
+                        help="Build every combination of the config.yaml `sweep` grid instead of `configurations`")
+    parser.add_argument("--grid", action="append", default=[], metavar="VAR=V1,V2",
+                        help="Sweep axis (repeatable); replaces the config.yaml grid and implies --sweep")
+    parser.add_argument("--tune", action="store_true",
+                        help="Sweep RYUSIM_VPI_DEPTH x RYUSIM_JOBS (or --grid) and report the Pareto front "
+                             "of compile time, compile memory and simulation speed")
+    parser.add_argument("--tune-file", type=str, default=str(DEFAULT_TUNE_FILE),
+                        help=f"JSON file collecting --tune recommendations per host and design "
+                             f"(default: {DEFAULT_TUNE_FILE})")
+    parser.add_argument("--testcase", type=str,
+                        help=f"Workload test to run in every configuration (default: sweep.testcase or "
+                             f"{DEFAULT_TESTCASE}; with --tune, sweep.testcase or every test)")
+    parser.add_argument("--rate-metric", type=str,
+                        help=f"Metric of the workload test holding simulated cycles/s "
+                             f"(default: sweep.rate_metric or {DEFAULT_RATE_METRIC})")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT,
+                        help=f"Per-configuration timeout in seconds (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--keep-builds", action="store_true",
+                        help="Reuse existing sim_build_<name> directories (compile times are then incremental)")
+    parser.add_argument("--output", type=str, help="Output JSON file path")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Print per-configuration progress to stderr")
+    add_timeline_arguments(parser)
+    args = parser.parse_args()
+
+    design_path = Path(args.design)
+    config_file = design_path / "config.yaml"
+    if not config_file.exists():
+        print(f"Error: {config_file} not found", file=sys.stderr)
+        sys.exit(1)
+    with open(config_file) as f:
+        design_config = yaml.safe_load(f) or {}
+
+    sweep = design_config.get("sweep") or {}
+    sweeping = args.sweep or bool(args.grid) or args.tune
+    if args.tune:
+        testcase = args.testcase or sweep.get("testcase")  # None: the whole test module
+    else:
+        testcase = args.testcase or (sweep.get("testcase") if sweeping else None) or DEFAULT_TESTCASE
+    rate_metric = (args.rate_metric or (sweep.get("rate_metric") if sweeping else None)
+                   or DEFAULT_RATE_METRIC)
+
+    if sweeping:
+        try:
+            if args.grid:
+                grid = parse_grid(args.grid)
+            else:
+                grid = tune_grid() if args.tune else (sweep.get("grid") or {})
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        if not grid:
+            print(f"Error: {config_file} has no sweep grid; pass --grid VAR=V1,V2", file=sys.stderr)
+            sys.exit(1)
+        configurations = grid_configurations(grid)
+    else:
+        configurations = design_config.get("configurations") or {}
+        if not configurations:
+            print(f"Error: {config_file} has no configurations", file=sys.stderr)
+            sys.exit(1)
+
+    names = args.configs or list(configurations)
+    unknown = [name for name in names if name not in configurations]
+    if unknown:
+        print(f"Error: unknown configuration(s) {', '.join(unknown)}; "
+              f"available: {', '.join(configurations)}", file=sys.stderr)
+        sys.exit(1)
+
+    ryusim_version = get_ryusim_version()
+    timestamp = datetime.now(timezone.utc).isoformat()
+
+    results = []
+    for name in names:
+        if args.verbose:
+            print(f"  building {design_path.name} {name}...", file=sys.stderr)
+        result = run_configuration(design_path, name, configurations[name], testcase,
+                                   args.timeout, clean=not args.keep_builds, rate_metric=rate_metric,
+                                   timeline={"interval": args.timeline_interval / 1000, "dir": args.timeline_dir}
+                                   if args.timeline else None)
+        results.append(result)
+        if args.verbose:
+            rate = result.get("cycles_per_sec")
+            print(
+                f"  {name}: {result['status']} "
+                f"(compile {(result.get('compile') or {}).get('elapsed', 0):.1f}s, "
+                f"{(result.get('compile') or {}).get('peak_rss_kb', 0) / 1024:.0f} MiB, "
+                f"binary {result.get('binary_bytes', 0) / 1e6:.1f} MB, "
+                f"C++ {result.get('generated_cpp_bytes', 0) / 1e6:.1f} MB, "
+                f"{f'{rate:.0f} cycles/s' if rate else 'no rate'})",
+                file=sys.stderr,
+            )
+            if result.get("timeline"):
+                print(render_ascii(result["timeline"]), file=sys.stderr)
+
+    summary = {
+        "runner": "run_scaling",
+        "design": design_path.name,
+        "mode": "tune" if args.tune else "sweep" if sweeping else "configurations",
+        "testcase": testcase,
+        "rate_metric": rate_metric,
+        "total": len(results),
+        "passed": sum(1 for r in results if r["status"] == "passed"),
+        "failed": sum(1 for r in results if r["status"] == "failed"),
+        "error": sum(1 for r in results if r["status"] in ("error", "timeout")),
+        "ryusim_version": ryusim_version,
+        "timestamp": timestamp,
+        "scaling": axis_scaling(results, list(grid)) if sweeping else scaling_curve(results),
+        "results": results,
+    }
+    if args.tune:
+        summary["tuning"] = tuning_report(results)
+        if summary["tuning"]["recommended"]:
+            update_tuning_file(args.tune_file, design_path.name, summary["tuning"], ryusim_version, timestamp)
+            if args.verbose:
+                for label in ("balanced", "fastest_compile", "lowest_memory", "fastest_sim"):
+                    item = summary["tuning"]["recommended"][label]
+                    print(f"  {label}: {item['configuration']} (compile {item['compile_seconds']:.1f}s, "
+                          f"{item['compile_peak_rss_kb'] / 1024:.0f} MiB)", file=sys.stderr)
+
+    print(json.dumps(summary, indent=2))
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(summary, indent=2) + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+    if summary["failed"] > 0 or summary["error"] > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""run_synthetic_scaling.py — Sweep synthetic design sizes and plot compile cost against size.
+
+Each axis (a harness/synthetic.py parameter) is swept on its own, the other
+parameters staying at their base values. For every point the design is
+generated under --work-dir, built from scratch and run with
+run_scaling.run_configuration(): the cocotb test checks the outputs against
+the generator's model, then runs the workload that reports cycles/s.
+
+The "scaling" section fits, per axis and cost (compile time, peak compile
+RSS, binary size, generated C++ size, seconds per simulated cycle):
+
+    local exponents   log(c2/c1) / log(s2/s1) between successive sizes s;
+                      values above 1.1 are listed as superlinear
+    slope             least-squares slope over all points in log-log space
+
+against the --size-measure of the design (operators by default). The HTML
+plot draws every cost against size on log-log axes with a linear reference
+line, so a bend away from it shows at a glance. The default axes cover three
+orders of magnitude; the same parameters and seed regenerate the same
+designs, so a curve can be reproduced on another host or RyuSim version.
+
+Usage:
+    python run_synthetic_scaling.py -v
+    python run_synthetic_scaling.py --axis instances=1,10,100,1000 --depth 8
+    python run_synthetic_scaling.py --axis lanes=1,16,256 --axis fanout=1,2,4,8 --output results/synthetic.json
+"""
+
+import argparse
+import html
+import json
+import math
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from generate_synthetic import DEFAULT_OUTPUT_ROOT, add_param_arguments
+from harness.sysmon import add_timeline_arguments, render_ascii
+from harness.synthetic import PARAMS, design_name, generate
+from run_benchmarks import get_ryusim_version
+from run_scaling import CURVES, SUPERLINEAR_EXPONENT, curve_point, exponent, parse_grid, run_configuration
+
+DEFAULT_AXES = {
+    "instances": [1, 4, 16, 64, 256, 1024],
+    "modules": [1, 4, 16, 64, 256],
+    "lanes": [1, 8, 64, 512],
+}
+SIZE_MEASURES = ("operators", "flop_bits", "sv_bytes")
+DEFAULT_SIZE_MEASURE = "operators"
+DEFAULT_TIMEOUT = 3600
+DEFAULT_CYCLES = 10000
+DEFAULT_PLOT = Path("results/synthetic_scaling.html")
+
+# (curve, title, unit, scale) for the plot
+PLOTS = (
+    ("compile_seconds", "Compile time", "s", 1),
+    ("compile_peak_rss_kb", "Peak compile RSS", "MiB", 1 / 1024),
+    ("generated_cpp_bytes", "Generated C++", "MB", 1e-6),
+    ("binary_bytes", "Binary size", "MB", 1e-6),
+    ("seconds_per_cycle", "Simulation cost", "µs/cycle", 1e6),
+)
+COLOURS = ("#2a6", "#36c", "#c63", "#939", "#c33", "#088")
+
+
+def loglog_slope(points):
+    """Return the least-squares slope of log(y) over log(x), or None with fewer than two points."""
+    logs = [(math.log(x), math.log(y)) for x, y in points if x and y and x > 0 and y > 0]
+    if len(logs) < 2:
+        return None
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    spread = sum((x - mean_x) ** 2 for x, _ in logs)
+    if not spread:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in logs) / spread
+
+
+def size_scaling(results, axes, size_measure):
+    """Return per-axis curves: points ordered by size, local exponents and log-log slopes."""
+    summary = {}
+    superlinear = []
+    for axis in axes:
+        points = sorted(
+            (r for r in results if r["axis"] == axis and r["status"] == "passed"),
+            key=lambda r: r["size"][size_measure],
+        )
+        curve = []
+        previous = None
+        for result in points:
+            size = result["size"][size_measure]
+            values = curve_point(result)
+            entry = {"value": result["value"], "size": size, "values": values, "exponent": {}}
+            for key in CURVES:
+                if previous is None:
+                    continue
+                k = exponent(previous[1][key], values[key], previous[0], size)
+                if k is None:
+                    continue
+                entry["exponent"][key] = k
+                if k > SUPERLINEAR_EXPONENT:
+                    superlinear.append({
+                        "axis": axis,
+                        "metric": key,
+                        "from": previous[2],
+                        "to": result["value"],
+                        "exponent": k,
+                    })
+            curve.append(entry)
+            previous = (size, values, result["value"])
+        summary[axis] = {
+            "points": curve,
+            "slope": {
+                key: slope for key in CURVES
+                if (slope := loglog_slope([(p["size"], p["values"][key]) for p in curve])) is not None
+            },
+        }
+    return {
+        "size_measure": size_measure,
+        "axes": summary,
+        "superlinear": superlinear,
+        "threshold": SUPERLINEAR_EXPONENT,
+    }
+
+
+def _log_range(values):
+    low = math.floor(math.log10(min(values)))
+    high = math.ceil(math.log10(max(values)))
+    return low, max(high, low + 1)
+
+
+def render_chart(title, unit, series, size_measure, width=640, height=320):
+    """Return one log-log SVG chart; `series` is {label: [(size, value), ...]}."""
+    series = {label: [(x, y) for x, y in points if x and y and x > 0 and y > 0] for label, points in series.items()}
+    series = {label: points for label, points in series.items() if points}
+    if not series:
+        return f"<h2>{html.escape(title)}</h2><p>No data.</p>"
+
+    left, right, top, bottom = 60, 20, 10, 40
+    x_low, x_high = _log_range([x for points in series.values() for x, _ in points])
+    y_low, y_high = _log_range([y for points in series.values() for _, y in points])
+
+    def px(x):
+        return left + (math.log10(x) - x_low) / (x_high - x_low) * (width - left - right)
+
+    def py(y):
+        return height - bottom - (math.log10(y) - y_low) / (y_high - y_low) * (height - top - bottom)
+
+    parts = []
+    for decade in range(x_low, x_high + 1):
+        x = px(10 ** decade)
+        parts.append(f'<line x1="{x:.1f}" y1="{top}" x2="{x:.1f}" y2="{height - bottom}" stroke="#ddd"/>'
+                     f'<text x="{x:.1f}" y="{height - bottom + 16}" text-anchor="middle">1e{decade}</text>')
+    for decade in range(y_low, y_high + 1):
+        y = py(10 ** decade)
+        parts.append(f'<line x1="{left}" y1="{y:.1f}" x2="{width - right}" y2="{y:.1f}" stroke="#ddd"/>'
+                     f'<text x="{left - 6}" y="{y + 4:.1f}" text-anchor="end">1e{decade}</text>')
+    parts.append(f'<text x="{(left + width - right) / 2:.0f}" y="{height - 6}" text-anchor="middle">'
+                 f'{html.escape(size_measure)}</text>')
+
+    # Linear reference through the smallest point: cost proportional to size
+    x0, y0 = min((p for points in series.values() for p in points), key=lambda p: p[0])
+    x1 = 10 ** x_high
+    y1 = min(y0 * x1 / x0, 10 ** y_high)
+    x1 = x0 * y1 / y0
+    parts.append(f'<line x1="{px(x0):.1f}" y1="{py(y0):.1f}" x2="{px(x1):.1f}" y2="{py(y1):.1f}" '
+                 f'stroke="#999" stroke-dasharray="4 3"/>')
+
+    legend = ['<span style="color:#999">- - linear</span>']
+    for (label, points), colour in zip(sorted(series.items()), COLOURS * len(series)):
+        coords = " ".join(f"{px(x):.1f},{py(y):.1f}" for x, y in points)
+        parts.append(f'<polyline fill="none" stroke="{colour}" stroke-width="1.5" points="{coords}"/>')
+        parts += [f'<circle cx="{px(x):.1f}" cy="{py(y):.1f}" r="3" fill="{colour}"/>' for x, y in points]
+        legend.append(f'<span style="color:{colour}">&#9679; {html.escape(label)}</span>')
+    return (
+        f"<h2>{html.escape(title)} ({html.escape(unit)})</h2><p>{' &nbsp; '.join(legend)}</p>"
+        f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" font-size="11">'
+        + "".join(parts) + "</svg>"
+    )
+
+
+def render_plot(summary):
+    """Return the HTML page of a run_synthetic_scaling summary."""
+    scaling = summary["scaling"]
+    size_measure = scaling["size_measure"]
+    charts = []
+    for key, title, unit, scale in PLOTS:
+        series = {
+            axis: [(p["size"], p["values"][key] * scale if p["values"][key] else None) for p in curve["points"]]
+            for axis, curve in scaling["axes"].items()
+        }
+        slopes = ", ".join(f"{axis} {curve['slope'][key]:.2f}"
+                           for axis, curve in scaling["axes"].items() if key in curve["slope"])
+        charts.append(render_chart(title, unit, series, size_measure)
+                      + (f"<p>log-log slope: {html.escape(slopes)}</p>" if slopes else ""))
+    base = ", ".join(f"{name}={value}" for name, value in summary["base"].items())
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>RyuSim synthetic scaling</title><style>"
+        "body{font-family:sans-serif;margin:1.5em}svg{border:1px solid #ccc}"
+        "</style></head><body><h1>RyuSim synthetic scaling</h1>"
+        f"<p>RyuSim {html.escape(summary['ryusim_version'] or 'unknown')}, {html.escape(summary['timestamp'])}. "
+        f"Base parameters: {html.escape(base)}; one series per swept axis.</p>"
+        + "".join(charts)
+        + "</body></html>\n"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sweep synthetic design sizes and report compile time and memory against size",
+    )
+    parser.add_argument("--axis", action="append", default=[], metavar="PARAM=V1,V2",
+                        help="Parameter to sweep and its values (repeatable; default: "
+                             + "; ".join(f"{k}={','.join(map(str, v))}" for k, v in DEFAULT_AXES.items()) + ")")
+    add_param_arguments(parser)
+    parser.add_argument("--size-measure", choices=SIZE_MEASURES, default=DEFAULT_SIZE_MEASURE,
+                        help=f"Design size the costs are fitted against (default: {DEFAULT_SIZE_MEASURE})")
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES,
+                        help=f"Workload cycles per design (SYNTH_CYCLES, default: {DEFAULT_CYCLES})")
+    parser.add_argument("--work-dir", type=str, default=str(DEFAULT_OUTPUT_ROOT),
+                        help=f"Where the designs are generated (default: {DEFAULT_OUTPUT_ROOT})")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT,
+                        help=f"Per-point timeout in seconds (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--keep-builds", action="store_true",
+                        help="Reuse existing build directories (compile times are then incremental)")
+    parser.add_argument("--plot", type=str, default=str(DEFAULT_PLOT),
+                        help=f"HTML plot to write (default: {DEFAULT_PLOT})")
+    parser.add_argument("--output", type=str, help="Output JSON file path")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Print per-point progress to stderr")
+    add_timeline_arguments(parser)
+    args = parser.parse_args()
+
+    base = {name: getattr(args, name) for name in PARAMS}
+    try:
+        axes = parse_grid(args.axis) if args.axis else DEFAULT_AXES
+        for axis, values in axes.items():
+            if axis not in PARAMS:
+                raise ValueError(f"unknown axis {axis!r}; choose from {', '.join(PARAMS)}")
+            for value in values:
+                design_name({**base, axis: value})
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    os.environ["SYNTH_CYCLES"] = str(args.cycles)
+    ryusim_version = get_ryusim_version()
+    timestamp = datetime.now(timezone.utc).isoformat()
+
+    results = []
+    built = {}  # design name -> result, for points shared between axes
+    for axis, values in axes.items():
+        for value in values:
+            params = {**base, axis: value}
+            name = design_name(params)
+            if name not in built:
+                design_dir = Path(args.work_dir) / name
+                size = generate(params, design_dir)
+                if args.verbose:
+                    print(f"  building {name} ({size[args.size_measure]} {args.size_measure})...", file=sys.stderr)
+                result = run_configuration(design_dir, "default", {"defines": {}}, None, args.timeout,
+                                           clean=not args.keep_builds,
+                                           timeline={"interval": args.timeline_interval / 1000,
+                                                     "dir": args.timeline_dir} if args.timeline else None)
+                result["size"] = size
+                built[name] = result
+                if args.verbose:
+                    compile_phase = result.get("compile") or {}
+                    rate = result.get("cycles_per_sec")
+                    print(
+                        f"  {name}: {result['status']} "
+                        f"(compile {compile_phase.get('elapsed', 0):.1f}s, "
+                        f"{compile_phase.get('peak_rss_kb', 0) / 1024:.0f} MiB, "
+                        f"C++ {result.get('generated_cpp_bytes', 0) / 1e6:.1f} MB, "
+                        f"{f'{rate:.0f} cycles/s' if rate else 'no rate'})",
+                        file=sys.stderr,
+                    )
+                    if result.get("timeline"):
+                        print(render_ascii(result["timeline"]), file=sys.stderr)
+            results.append({**built[name], "axis": axis, "value": value, "params": params})
+
+    summary = {
+        "runner": "run_synthetic_scaling",
+        "base": base,
+        "axes": axes,
+        "cycles": args.cycles,
+        "total": len(built),
+        "passed": sum(1 for r in built.values() if r["status"] == "passed"),
+        "failed": sum(1 for r in built.values() if r["status"] == "failed"),
+        "error": sum(1 for r in built.values() if r["status"] in ("error", "timeout")),
+        "ryusim_version": ryusim_version,
+        "timestamp": timestamp,
+        "scaling": size_scaling(results, list(axes), args.size_measure),
+        "results": results,
+    }
+
+    print(json.dumps(summary, indent=2))
+
+    plot = Path(args.plot)
+    plot.parent.mkdir(parents=True, exist_ok=True)
+    plot.write_text(render_plot(summary))
+    print(f"Plot written to {plot}", file=sys.stderr)
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(summary, indent=2) + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+    if summary["failed"] > 0 or summary["error"] > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
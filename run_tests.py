@@ -3,6 +3,7 @@
 
 import argparse
 import json
+import os
 import subprocess
 import sys
 import time
@@ -11,6 +12,12 @@ from pathlib import Path
 
 import yaml
 
+from harness.ccache import CompilerCache, add_ccache_arguments
+from harness.pyprofile import PythonProfile, add_profile_arguments
+from harness.resultsdb import add_db_arguments, record_run
+from harness.sharding import add_shard_arguments, merge_results, select_shard
+from harness.timeouts import TimeoutPlanner, add_timeout_arguments, describe
+
 TESTS_DIR = Path("uhdm_tests")
 
 CATEGORIES = [
@@ -21,6 +28,15 @@ CATEGORIES = [
     "unsupported",
 ]
 
+# Fixed timeouts (seconds) used without enough duration history, and the
+# (floor, ceiling) clamp applied to history-derived budgets, per step
+STEP_TIMEOUTS = {
+    "make": (300, (30, 1800)),
+    "compile": (300, (30, 1800)),
+    "sim": (60, (10, 600)),
+    "vcddiff": (60, (10, 600)),
+}
+
 
 def get_ryusim_version():
     """Get the installed ryusim version string."""
@@ -60,18 +76,37 @@ def discover_tests(category=None):
     return tests
 
 
-def run_test(test_path, level=1):
+def step_budget(timeouts, test_path, step, override=None):
+    """Return the timeout budget for one step of a test (see STEP_TIMEOUTS)."""
+    default, (floor, ceiling) = STEP_TIMEOUTS[step]
+    return timeouts.budget(
+        test_path, step, default, floor, ceiling,
+        override=override, primary=step in ("make", "compile"),
+    )
+
+
+def run_test(test_path, level=1, timeouts=None, profile=None, ccache=None):
     """Run a single SV construct test.
 
     For supported tests: runs `make` in the test directory (cocotb with SIM=ryusim).
     For unsupported tests: runs `ryusim compile` and asserts it fails.
     For level 2: additionally runs vcddiff against golden VCD.
+    `profile` ({"dir", "top"}) profiles the cocotb Python of supported tests.
+    `ccache` (a harness.ccache.CompilerCache) routes the C++ compile of both
+    kinds through ccache; the result's "ccache" holds the hit statistics.
+
+    Timeouts come from `timeouts` (a TimeoutPlanner): config.yaml `timeout`
+    overrides the compile/make step, otherwise budgets follow recorded
+    durations, falling back to STEP_TIMEOUTS.
 
     Returns a dict with test results.
     """
     category = test_path.relative_to(TESTS_DIR).parts[0]
     test_name = str(test_path.relative_to(TESTS_DIR))
     start_time = time.perf_counter()
+    if timeouts is None:
+        timeouts = TimeoutPlanner(adaptive=False)
+    steps = {}
 
     # Read config.yaml
     config_file = test_path / "config.yaml"
@@ -90,7 +125,14 @@ def run_test(test_path, level=1):
             "stderr": "config.yaml not found",
         }
 
+    base_env = dict(os.environ)
+    ccache_before = None
+    if ccache:
+        base_env = ccache.env(base_env)
+        ccache_before = ccache.stats()
+
     top_module = config.get("top_module", "dut")
+    config_timeout = config.get("timeout")
     is_unsupported = category == "unsupported" or config.get("expect_fail", False)
 
     if is_unsupported:
@@ -113,13 +155,16 @@ def run_test(test_path, level=1):
             }
 
         dut_file = sv_files[0].name  # just "dut.sv" — cwd is already set to the test directory
+        budget = step_budget(timeouts, test_path, "compile", override=config_timeout)
+        step_start = time.perf_counter()
         try:
             result = subprocess.run(
                 ["ryusim", "compile", dut_file, "--top", top_module],
                 capture_output=True,
                 text=True,
                 cwd=str(test_path),
-                timeout=300,
+                timeout=budget["budget"],
+                env=base_env,
             )
         except subprocess.TimeoutExpired:
             return {
@@ -129,8 +174,9 @@ def run_test(test_path, level=1):
                 "level": level,
                 "status": "error",
                 "duration": time.perf_counter() - start_time,
+                "timeout": budget,
                 "stdout": "",
-                "stderr": "Compile timed out (300s)",
+                "stderr": f"Compile timed out ({describe(budget)})",
             }
         except FileNotFoundError:
             return {
@@ -143,6 +189,7 @@ def run_test(test_path, level=1):
                 "stdout": "",
                 "stderr": "ryusim not found on PATH",
             }
+        steps["compile"] = time.perf_counter() - step_start
 
         expected_warning_file = test_path / "expected_warning.txt"
         expected_error_file = test_path / "expected_error.txt"
@@ -158,15 +205,30 @@ def run_test(test_path, level=1):
             # Compilation succeeded — run the standalone sim and check for
             # the expected runtime warning.
             sim_exe = Path("obj_dir") / "build" / f"{top_module}_sim"
+            sim_budget = step_budget(timeouts, test_path, "sim")
+            step_start = time.perf_counter()
             try:
                 sim_result = subprocess.run(
                     [str(sim_exe)],
                     capture_output=True,
                     text=True,
                     cwd=str(test_path),
-                    timeout=60,
+                    timeout=sim_budget["budget"],
                 )
-            except (FileNotFoundError, subprocess.TimeoutExpired) as exc:
+            except subprocess.TimeoutExpired:
+                return {
+                    "test": test_name,
+                    "path": str(test_path),
+                    "category": category,
+                    "level": level,
+                    "status": "error",
+                    "duration": time.perf_counter() - start_time,
+                    "steps": steps,
+                    "timeout": sim_budget,
+                    "stdout": result.stdout,
+                    "stderr": f"Sim exe timed out ({describe(sim_budget)})",
+                }
+            except FileNotFoundError as exc:
                 return {
                     "test": test_name,
                     "path": str(test_path),
@@ -174,9 +236,11 @@ def run_test(test_path, level=1):
                     "level": level,
                     "status": "error",
                     "duration": time.perf_counter() - start_time,
+                    "steps": steps,
                     "stdout": result.stdout,
                     "stderr": f"Sim exe failed: {exc}",
                 }
+            steps["sim"] = time.perf_counter() - step_start
 
             # Sim completed — that's enough to count as expected_fail.
             # If the warning text is present, even better.
@@ -194,25 +258,37 @@ def run_test(test_path, level=1):
 
         duration = time.perf_counter() - start_time
 
-        return {
+        test_result = {
             "test": test_name,
             "path": str(test_path),
             "category": category,
             "level": level,
             "status": status,
             "duration": duration,
+            "steps": steps,
             "stdout": result.stdout,
             "stderr": result.stderr,
         }
+        if ccache:
+            test_result["ccache"] = ccache.report(ccache_before, str(test_path), steps["compile"])
+        return test_result
 
     # Supported tests: run make (cocotb with SIM=ryusim)
+    budget = step_budget(timeouts, test_path, "make", override=config_timeout)
+    make_cmd, env = ["make"], base_env
+    python_profile = None
+    if profile:
+        python_profile = PythonProfile(test_path, test_name, profile["dir"], profile["top"])
+        make_cmd = python_profile.command(make_cmd)
+        env = python_profile.env(env)
     try:
         result = subprocess.run(
-            ["make"],
+            make_cmd,
             capture_output=True,
             text=True,
             cwd=str(test_path),
-            timeout=300,
+            timeout=budget["budget"],
+            env=env,
         )
     except subprocess.TimeoutExpired:
         return {
@@ -222,8 +298,9 @@ def run_test(test_path, level=1):
             "level": level,
             "status": "error",
             "duration": time.perf_counter() - start_time,
+            "timeout": budget,
             "stdout": "",
-            "stderr": "Test timed out (300s)",
+            "stderr": f"Test timed out ({describe(budget)})",
         }
     except FileNotFoundError:
         return {
@@ -238,7 +315,9 @@ def run_test(test_path, level=1):
         }
 
     duration = time.perf_counter() - start_time
+    steps["make"] = duration
     status = "passed" if result.returncode == 0 else "failed"
+    vcddiff_timeout = None
 
     # Level 2: VCD comparison against golden reference
     if level >= 2 and status == "passed":
@@ -250,30 +329,103 @@ def run_test(test_path, level=1):
             # Find the output VCD (not in golden/)
             output_vcds = [v for v in vcd_files if "golden" not in v.parts]
             if output_vcds:
+                vcd_budget = step_budget(timeouts, test_path, "vcddiff")
+                step_start = time.perf_counter()
                 try:
                     vcd_result = subprocess.run(
                         ["vcddiff", str(output_vcds[0]), str(golden_vcds[0])],
                         capture_output=True,
                         text=True,
                         cwd=str(test_path),
-                        timeout=60,
+                        timeout=vcd_budget["budget"],
                     )
+                    steps["vcddiff"] = time.perf_counter() - step_start
                     if vcd_result.returncode != 0:
                         status = "failed"
-                except (FileNotFoundError, subprocess.TimeoutExpired):
-                    # vcddiff not available or timed out; don't fail the test
+                except subprocess.TimeoutExpired:
+                    # vcddiff timed out; don't fail the test, but record the budget
+                    vcddiff_timeout = vcd_budget
+                except FileNotFoundError:
+                    # vcddiff not available; don't fail the test
                     pass
 
-    return {
+    test_result = {
         "test": test_name,
         "path": str(test_path),
         "category": category,
         "level": level,
         "status": status,
         "duration": duration,
+        "steps": steps,
         "stdout": result.stdout,
         "stderr": result.stderr,
     }
+    if python_profile:
+        test_result["python_profile"] = python_profile.collect()
+    if ccache:
+        test_result["ccache"] = ccache.report(ccache_before, str(test_path), steps["make"])
+    if vcddiff_timeout:
+        test_result["timeout"] = vcddiff_timeout
+        test_result["stderr"] += f"\nvcddiff timed out ({describe(vcddiff_timeout)})"
+    return test_result
+
+
+def build_summary(results, level, ryusim_version, timestamp, shard=None):
+    """Build the summary dict written to stdout and --output."""
+    # Group by category for summary
+    categories = {}
+    for r in results:
+        cat = r["category"]
+        if cat not in categories:
+            categories[cat] = {"total": 0, "passed": 0, "failed": 0, "expected_fail": 0, "error": 0}
+        categories[cat]["total"] += 1
+        categories[cat][r["status"]] = categories[cat].get(r["status"], 0) + 1
+
+    summary = {
+        "runner": "run_tests",
+        "total": len(results),
+        "passed": sum(1 for r in results if r["status"] == "passed"),
+        "failed": sum(1 for r in results if r["status"] == "failed"),
+        "expected_fail": sum(1 for r in results if r["status"] == "expected_fail"),
+        "error": sum(1 for r in results if r["status"] == "error"),
+        "level": level,
+        "ryusim_version": ryusim_version,
+        "timestamp": timestamp,
+        "categories": categories,
+        "results": results,
+    }
+    if shard:
+        summary["shard"] = shard
+    return summary
+
+
+def write_summary(summary, output=None):
+    """Print the summary, optionally write it to a file, and exit 1 on failures."""
+    print(json.dumps(summary, indent=2))
+
+    if output:
+        output_path = Path(output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(summary, indent=2) + "\n")
+        print(f"Results written to {output}", file=sys.stderr)
+
+    if summary["failed"] > 0 or summary.get("error", 0) > 0:
+        sys.exit(1)
+
+
+def merge_main(args):
+    """Combine per-shard JSON outputs into a single summary."""
+    summaries = [json.loads(Path(p).read_text()) for p in args.inputs]
+    levels = {s.get("level", 1) for s in summaries}
+    if len(levels) > 1:
+        print(f"Error: cannot merge shards run at different levels: {sorted(levels)}", file=sys.stderr)
+        sys.exit(1)
+    results, ryusim_version, timestamp = merge_results(summaries)
+    level = levels.pop() if levels else 1
+    summary = build_summary(results, level, ryusim_version, timestamp)
+    configuration = next((s["configuration"] for s in summaries if s.get("configuration")), f"level{level}")
+    record_run(summary, args, configuration)
+    write_summary(summary, args.output)
 
 
 def main():
@@ -288,8 +440,22 @@ def main():
     parser.add_argument("--ryusim-version", type=str, help="Expected RyuSim version")
     parser.add_argument("--limit", type=int, help="Max number of tests to run")
     parser.add_argument("--verbose", "-v", action="store_true", help="Print per-test progress to stderr")
+    add_shard_arguments(parser)
+    add_timeout_arguments(parser)
+    add_profile_arguments(parser)
+    add_ccache_arguments(parser)
+    add_db_arguments(parser)
+
+    subparsers = parser.add_subparsers(dest="command")
+    merge_parser = subparsers.add_parser("merge", help="Combine per-shard JSON outputs into one summary")
+    merge_parser.add_argument("inputs", nargs="+", help="Per-shard JSON files")
+    merge_parser.add_argument("--output", type=str, help="Output JSON file path")
     args = parser.parse_args()
 
+    if args.command == "merge":
+        merge_main(args)
+        return
+
     if not args.all and not args.category and not args.test:
         parser.print_help()
         sys.exit(0)
@@ -306,14 +472,42 @@ def main():
     if args.limit:
         tests = tests[: args.limit]
 
+    if args.shard:
+        try:
+            tests = select_shard(tests, args.shard, args.history, runner="run_tests")
+        except ValueError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            sys.exit(1)
+
     ryusim_version = get_ryusim_version()
     if args.ryusim_version and ryusim_version and args.ryusim_version != ryusim_version:
         print(f"Warning: expected ryusim {args.ryusim_version}, got {ryusim_version}", file=sys.stderr)
     timestamp = datetime.now(timezone.utc).isoformat()
 
+    timeouts = TimeoutPlanner(
+        history=args.history,
+        runner="run_tests",
+        factor=args.timeout_factor,
+        adaptive=not args.no_adaptive_timeouts,
+    )
+
+    ccache = None
+    if args.ccache:
+        try:
+            ccache = CompilerCache(args.ccache_dir, args.ccache_max_size)
+        except FileNotFoundError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            sys.exit(1)
+
     results = []
     for test in tests:
-        result = run_test(test, level=args.level)
+        result = run_test(
+            test,
+            level=args.level,
+            timeouts=timeouts,
+            profile={"dir": args.profile_dir, "top": args.profile_top} if args.profile_python else None,
+            ccache=ccache,
+        )
         results.append(result)
         if args.verbose:
             print(
@@ -321,38 +515,11 @@ def main():
                 file=sys.stderr,
             )
 
-    # Group by category for summary
-    categories = {}
-    for r in results:
-        cat = r["category"]
-        if cat not in categories:
-            categories[cat] = {"total": 0, "passed": 0, "failed": 0, "expected_fail": 0, "error": 0}
-        categories[cat]["total"] += 1
-        categories[cat][r["status"]] = categories[cat].get(r["status"], 0) + 1
-
-    summary = {
-        "total": len(results),
-        "passed": sum(1 for r in results if r["status"] == "passed"),
-        "failed": sum(1 for r in results if r["status"] == "failed"),
-        "expected_fail": sum(1 for r in results if r["status"] == "expected_fail"),
-        "error": sum(1 for r in results if r["status"] == "error"),
-        "level": args.level,
-        "ryusim_version": ryusim_version,
-        "timestamp": timestamp,
-        "categories": categories,
-        "results": results,
-    }
-
-    print(json.dumps(summary, indent=2))
-
-    if args.output:
-        output_path = Path(args.output)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(json.dumps(summary, indent=2) + "\n")
-        print(f"Results written to {args.output}", file=sys.stderr)
-
-    if summary["failed"] > 0 or summary.get("error", 0) > 0:
-        sys.exit(1)
+    summary = build_summary(results, args.level, ryusim_version, timestamp, shard=args.shard)
+    configuration = ",".join([f"level{args.level}"] + (["ccache"] if args.ccache else [])
+                             + (["profile-python"] if args.profile_python else []))
+    record_run(summary, args, configuration)
+    write_summary(summary, args.output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,11 @@
+"""tb_common — shared cocotb testbench helpers for RyuSim validation.
+
+Modules in this package run inside the simulator's Python interpreter.
+Testbenches import them with the repository root on PYTHONPATH.
+"""
+
+from tb_common import vpistats
+
+# Counts VPI accesses per signal when TB_VPI_STATS_FILE is set; must run
+# before the importing test module applies @cocotb.test
+vpistats.install()
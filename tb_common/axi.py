@@ -0,0 +1,211 @@
+"""Cocotb AXI4 slave backed by a SparseMemory.
+
+One coroutine per slave services all five channels on the rising clock
+edge. Handles are resolved once at construction, master signals are only
+read when the corresponding handshake can complete, and slave outputs are
+only written when their value changes, so an idle bus costs three VPI reads
+per cycle and a data beat a handful more.
+
+Supported:
+  - FIXED, INCR and WRAP bursts of any AXI4 length and size up to the bus width
+  - Multiple outstanding reads and writes with independent IDs; responses for
+    one ID stay in order, responses for different IDs may be reordered
+  - Configurable read/write response latency in clock cycles
+  - Write hooks on address ranges (e.g. a mailbox register)
+
+Usage:
+
+    mem = SparseMemory()
+    mem.load_segments(segments)
+    ifu = AxiSlave(dut, "ifu_axi", dut.clk, mem, read_latency=4).start()
+
+AXI4 has no write ID on the W channel, so write data is matched to write
+addresses in acceptance order, as the spec requires.
+"""
+
+import random
+from collections import deque
+
+import cocotb
+from cocotb.triggers import RisingEdge
+
+from tb_common.values import read_int as _read
+
+BURST_FIXED = 0
+BURST_INCR = 1
+BURST_WRAP = 2
+
+RESP_OKAY = 0
+
+
+def burst_addresses(addr, length, size, burst):
+    """Return the start address of every beat in an AXI burst.
+
+    Args:
+        addr: AxADDR
+        length: AxLEN (beats - 1)
+        size: AxSIZE (log2 bytes per beat)
+        burst: AxBURST
+    """
+    beats = length + 1
+    step = 1 << size
+    if burst == BURST_FIXED:
+        return [addr] * beats
+    if burst == BURST_WRAP:
+        total = step * beats
+        lower = addr & ~(total - 1)
+        return [lower + ((addr - lower + i * step) % total) for i in range(beats)]
+    aligned = addr & ~(step - 1)
+    return [addr] + [aligned + i * step for i in range(1, beats)]
+
+
+class AxiSlave:
+    """AXI4 slave on the signals `<prefix>_ar*`, `<prefix>_r*`, etc."""
+
+    def __init__(self, dut, prefix, clock, memory, read_latency=1, write_latency=1,
+                 max_outstanding=8, reorder=False, seed=None):
+        def sig(name):
+            return getattr(dut, f"{prefix}_{name}")
+
+        self.name = prefix
+        self.clock = clock
+        self.memory = memory
+        self.read_latency = read_latency
+        self.write_latency = write_latency
+        self.max_outstanding = max_outstanding
+        self.reorder = reorder
+        self.rng = random.Random(seed)
+
+        self.arvalid, self.arready = sig("arvalid"), sig("arready")
+        self.arid, self.araddr = sig("arid"), sig("araddr")
+        self.arlen, self.arsize, self.arburst = sig("arlen"), sig("arsize"), sig("arburst")
+        self.rvalid, self.rready = sig("rvalid"), sig("rready")
+        self.rid, self.rdata = sig("rid"), sig("rdata")
+        self.rresp, self.rlast = sig("rresp"), sig("rlast")
+        self.awvalid, self.awready = sig("awvalid"), sig("awready")
+        self.awid, self.awaddr = sig("awid"), sig("awaddr")
+        self.awlen, self.awsize, self.awburst = sig("awlen"), sig("awsize"), sig("awburst")
+        self.wvalid, self.wready = sig("wvalid"), sig("wready")
+        self.wdata, self.wstrb, self.wlast = sig("wdata"), sig("wstrb"), sig("wlast")
+        self.bvalid, self.bready = sig("bvalid"), sig("bready")
+        self.bid, self.bresp = sig("bid"), sig("bresp")
+
+        self.data_bytes = len(self.rdata) // 8
+        self.lane_mask = ~(self.data_bytes - 1)
+
+        self.hooks = []
+        self.read_beats = 0
+        self.write_beats = 0
+        self._driven = {}
+        self._task = None
+
+    def add_write_hook(self, base, size, callback):
+        """Call `callback(addr, data, strobe)` for every write beat in [base, base+size).
+
+        The beat is still written to memory; `addr` is the bus-aligned address.
+        """
+        self.hooks.append((base, base + size, callback))
+
+    def start(self):
+        """Start servicing the bus; returns self."""
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def _drive(self, handle, value):
+        if self._driven.get(handle) != value:
+            handle.value = value
+            self._driven[handle] = value
+
+    def _next_read(self, reads, cycle):
+        """Pick the read burst to respond to next, or None."""
+        if not self.reorder:
+            head = reads[0]
+            return head if head[0] <= cycle else None
+        # Only the oldest burst of each ID may respond
+        seen = set()
+        ready = []
+        for burst in reads:
+            if burst[1] in seen:
+                continue
+            seen.add(burst[1])
+            if burst[0] <= cycle:
+                ready.append(burst)
+        return self.rng.choice(ready) if ready else None
+
+    async def _run(self):
+        edge = RisingEdge(self.clock)
+        memory = self.memory
+        nbytes = self.data_bytes
+        lane_mask = self.lane_mask
+
+        reads = []            # [ready_cycle, id, addresses, next beat index]
+        active = None         # read burst currently on the R channel
+        writes = deque()      # [id, addresses, next beat index] awaiting W data
+        responses = deque()   # (ready_cycle, id) awaiting B handshake
+        bvalid = False
+        cycle = 0
+
+        for handle in (self.rvalid, self.bvalid, self.rresp, self.bresp, self.rlast):
+            self._drive(handle, 0)
+
+        while True:
+            await edge
+            cycle += 1
+
+            # Handshakes that completed on this edge
+            if active is not None and _read(self.rready):
+                self.read_beats += 1
+                active[3] += 1
+                if active[3] == len(active[2]):
+                    reads.remove(active)
+                    active = None
+
+            if bvalid and _read(self.bready):
+                responses.popleft()
+                bvalid = False
+
+            if self._driven.get(self.arready) and _read(self.arvalid):
+                addresses = burst_addresses(
+                    _read(self.araddr), _read(self.arlen), _read(self.arsize), _read(self.arburst))
+                reads.append([cycle + self.read_latency, _read(self.arid), addresses, 0])
+
+            if self._driven.get(self.awready) and _read(self.awvalid):
+                addresses = burst_addresses(
+                    _read(self.awaddr), _read(self.awlen), _read(self.awsize), _read(self.awburst))
+                writes.append([_read(self.awid), addresses, 0])
+
+            if self._driven.get(self.wready) and _read(self.wvalid):
+                burst = writes[0]
+                addr = burst[1][burst[2]] & lane_mask
+                data = _read(self.wdata)
+                strobe = _read(self.wstrb)
+                memory.write_word(addr, data, nbytes, strobe)
+                for lo, hi, callback in self.hooks:
+                    if lo <= addr < hi:
+                        callback(addr, data, strobe)
+                self.write_beats += 1
+                burst[2] += 1
+                if burst[2] == len(burst[1]):
+                    writes.popleft()
+                    responses.append((cycle + self.write_latency, burst[0]))
+
+            # Outputs for the next edge
+            self._drive(self.arready, 1 if len(reads) < self.max_outstanding else 0)
+            self._drive(self.awready, 1 if len(writes) < self.max_outstanding else 0)
+            self._drive(self.wready, 1 if writes else 0)
+
+            if active is None and reads:
+                active = self._next_read(reads, cycle)
+            if active is not None:
+                index = active[3]
+                self._drive(self.rvalid, 1)
+                self._drive(self.rid, active[1])
+                self._drive(self.rdata, memory.read_word(active[2][index] & lane_mask, nbytes))
+                self._drive(self.rlast, 1 if index == len(active[2]) - 1 else 0)
+            else:
+                self._drive(self.rvalid, 0)
+
+            if not bvalid and responses and responses[0][0] <= cycle:
+                self._drive(self.bid, responses[0][1])
+                bvalid = True
+            self._drive(self.bvalid, 1 if bvalid else 0)
@@ -0,0 +1,404 @@
+"""Cocotb models for the BlackParrot BedRock memory interfaces.
+
+These replace the upstream nonsynth testbench modules:
+
+  - BedrockCodec: packs and unpacks bp_bedrock_mem_{fwd,rev}_header_s with a
+    precomputed (shift, mask) table, so a header is one int per message
+  - load_config(): the bp_nonsynth_cfg_loader sequence, sent as BedRock
+    writes on mem_fwd_*_i with each acknowledgement taken from mem_rev_*_o
+  - HostModel: the bp_nonsynth_host I/O device on mem_fwd_*_o/mem_rev_*_i
+    (putchar, putch_core, finish, getchar)
+  - DramModel: the bp_nonsynth_dram backing store on the L2 DMA ports
+    (dma_pkt_o, dma_data_i/o), including bp_me_dram_hash_decode
+
+Field widths follow the header structs in bp_common_bedrock_if.svh. The
+lce_id width depends on the configuration, so it is derived from the width
+of the header port. Defaults match e_bp_default_cfg (the wrapper's default
+parameter): 40-bit paddr, 3-bit did, 8-way caches, 128-bit fill, two L2
+slices of one bank and 32 sets with 64-byte blocks.
+"""
+
+import cocotb
+from cocotb.triggers import Event, RisingEdge
+
+from tb_common.values import read_int as _read
+
+# bp_common_bedrock_pkgdef.svh
+MEM_RD = 0b0000
+MEM_WR = 0b0001
+MEM_AMO = 0b0010
+MEM_PRE = 0b1000
+
+COH_I = 0b000
+
+# bp_common_addr_pkgdef.svh / bp_common_host_pkgdef.svh / bp_common_cfg_bus_pkgdef.svh
+DRAM_BASE = 0x80000000
+HOST_BASE = 0x00100000
+CFG_BASE = 0x00200000
+TILE_SHIFT = 24
+
+GETCHAR = 0x00000
+PUTCHAR = 0x01000
+FINISH = 0x02000
+PUTCH_CORE = 0x03000
+DEV_MATCH_MASK = 0xFF000
+
+CFG_REG_FREEZE = 0x0008
+CFG_REG_NPC = 0x0010
+CFG_REG_ICACHE_MODE = 0x0208
+CFG_REG_DCACHE_MODE = 0x0408
+CFG_REG_CCE_MODE = 0x0608
+CFG_MEM_CCE_UCODE_BASE = 0x8000
+
+LCE_MODE_NORMAL = 1
+CCE_MODE_NORMAL = 1
+
+
+def size_code(nbytes):
+    """Return the bp_bedrock_msg_size_e code for a power-of-two byte count."""
+    return nbytes.bit_length() - 1
+
+
+class BedrockCodec:
+    """Encode/decode BedRock mem headers as plain ints.
+
+    Fields are listed LSB first; each is (name, width). encode() and
+    decode() do one shift and mask per field, no per-bit work.
+    """
+
+    def __init__(self, header_width, paddr_width=40, did_width=3, lce_assoc=8):
+        way_width = max(1, (lce_assoc - 1).bit_length())
+        fixed = 4 + 4 + paddr_width + 3 + 1 + 1 + 1 + did_width + way_width + 3
+        lce_id_width = header_width - fixed
+        if lce_id_width < 1:
+            raise ValueError(f"header width {header_width} too small for paddr_width={paddr_width}")
+
+        fields = [
+            ("msg_type", 4),
+            ("subop", 4),
+            ("addr", paddr_width),
+            ("size", 3),
+            # payload (bp_bedrock_mem_fwd_payload_s), LSB first
+            ("speculative", 1),
+            ("uncached", 1),
+            ("prefetch", 1),
+            ("src_did", did_width),
+            ("lce_id", lce_id_width),
+            ("way_id", way_width),
+            ("state", 3),
+        ]
+        self.width = header_width
+        self.fields = []
+        shift = 0
+        for name, width in fields:
+            self.fields.append((name, shift, (1 << width) - 1))
+            shift += width
+        self._index = {name: (shift, mask) for name, shift, mask in self.fields}
+
+    def encode(self, **values):
+        """Return the header int for the given field values (others are 0)."""
+        header = 0
+        for name, shift, mask in self.fields:
+            header |= (values.get(name, 0) & mask) << shift
+        return header
+
+    def decode(self, header):
+        """Return a dict of field values from a header int."""
+        return {name: (header >> shift) & mask for name, shift, mask in self.fields}
+
+    def field(self, header, name):
+        """Extract a single field."""
+        shift, mask = self._index[name]
+        return (header >> shift) & mask
+
+
+def replicate(value, nbytes, width):
+    """Replicate an `nbytes` value across a `width`-bit data bus."""
+    chunk = value & ((1 << (8 * nbytes)) - 1)
+    data = 0
+    for offset in range(0, width, 8 * nbytes):
+        data |= chunk << offset
+    return data & ((1 << width) - 1)
+
+
+def config_writes(npc=DRAM_BASE, ucode=()):
+    """Return the [(cfg register, value)] sequence of bp_nonsynth_cfg_loader.
+
+    Freeze the core, load CCE microcode (ucode-based CCEs only), switch the
+    caches and CCE to normal mode, set the boot PC and unfreeze.
+    """
+    writes = [(CFG_REG_FREEZE, 1)]
+    writes += [(CFG_MEM_CCE_UCODE_BASE + 8 * i, inst) for i, inst in enumerate(ucode)]
+    writes += [
+        (CFG_REG_ICACHE_MODE, LCE_MODE_NORMAL),
+        (CFG_REG_DCACHE_MODE, LCE_MODE_NORMAL),
+        (CFG_REG_CCE_MODE, CCE_MODE_NORMAL),
+        (CFG_REG_NPC, npc),
+        (CFG_REG_FREEZE, 0),
+    ]
+    return writes
+
+
+async def load_config(dut, clock, codec, writes, host_did, tile=0):
+    """Send cfg register writes on mem_fwd_*_i, one at a time.
+
+    Each write is acknowledged on mem_rev_*_o; responses are routed back to
+    the I/O port because src_did is the host's did.
+    """
+    edge = RisingEdge(clock)
+    fill_width = len(dut.mem_fwd_data_i)
+    dut.mem_rev_ready_and_i.value = 1
+    for reg, value in writes:
+        dut.mem_fwd_header_i.value = codec.encode(
+            msg_type=MEM_WR,
+            addr=(tile << TILE_SHIFT) | CFG_BASE | reg,
+            size=size_code(8),
+            src_did=host_did,
+        )
+        dut.mem_fwd_data_i.value = replicate(value, 8, fill_width)
+        dut.mem_fwd_v_i.value = 1
+        while True:
+            await edge
+            if _read(dut.mem_fwd_ready_and_o):
+                break
+        dut.mem_fwd_v_i.value = 0
+        while True:
+            await edge
+            if _read(dut.mem_rev_v_o):
+                break
+    dut.mem_rev_ready_and_i.value = 0
+
+
+class HostModel:
+    """Host I/O device answering the processor's mem_fwd_*_o requests.
+
+    Every request gets a response that echoes its header (fwd and rev
+    headers share the same layout and type encoding); reads return
+    `read_value(addr)` (default 0). Character output is collected in
+    `output`; a store to FINISH sets `exit_code` and fires `finished`.
+    """
+
+    def __init__(self, dut, clock, codec, read_value=None):
+        self.dut = dut
+        self.clock = clock
+        self.codec = codec
+        self.read_value = read_value or (lambda addr: 0)
+        self.fill_width = len(dut.mem_fwd_data_o)
+        self.output = bytearray()
+        self.exit_code = None
+        self.finished = Event()
+        self._task = None
+
+    def start(self):
+        """Start servicing requests; returns self."""
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def _handle(self, header, data):
+        fields = self.codec.decode(header)
+        offset = fields["addr"] & DEV_MATCH_MASK
+        nbytes = 1 << fields["size"]
+        value = data & ((1 << (8 * min(nbytes, 8))) - 1)
+        if fields["msg_type"] == MEM_WR:
+            if offset in (PUTCHAR, PUTCH_CORE):
+                self.output.append(value & 0xFF)
+            elif offset == FINISH:
+                self.exit_code = value
+                self.finished.set()
+            return 0
+        return replicate(self.read_value(fields["addr"]), min(nbytes, 8), self.fill_width)
+
+    async def _run(self):
+        dut = self.dut
+        edge = RisingEdge(self.clock)
+        responses = []
+        beats_left = 0
+        first = 0
+        driving = False
+
+        dut.mem_fwd_ready_and_i.value = 1
+        dut.mem_rev_v_i.value = 0
+        while True:
+            await edge
+            if driving and _read(dut.mem_rev_ready_and_o):
+                responses.pop(0)
+                driving = False
+
+            if _read(dut.mem_fwd_v_o):
+                header = _read(dut.mem_fwd_header_o)
+                if beats_left == 0:
+                    nbytes = 1 << self.codec.field(header, "size")
+                    is_write = self.codec.field(header, "msg_type") == MEM_WR
+                    beats_left = max(1, nbytes * 8 // self.fill_width) if is_write else 1
+                    first = self._handle(header, _read(dut.mem_fwd_data_o))
+                beats_left -= 1
+                if beats_left == 0:
+                    responses.append((header, first))
+
+            if not driving and responses:
+                header, data = responses[0]
+                dut.mem_rev_header_i.value = header
+                dut.mem_rev_data_i.value = data
+                driving = True
+            dut.mem_rev_v_i.value = 1 if driving else 0
+
+
+def dram_hash_decode(daddr, block_bits=6, cce_bits=0, slice_bits=1, bank_bits=0, set_bits=5):
+    """Invert bp_me_dram_hash_encode: DMA address -> physical address.
+
+    Encoded: [tag][bank][slice][cce][set][block]
+    Physical: [tag][set][bank][slice][cce][block]
+    """
+    block = daddr & ((1 << block_bits) - 1)
+    shift = block_bits
+    sets = (daddr >> shift) & ((1 << set_bits) - 1)
+    shift += set_bits
+    cce = (daddr >> shift) & ((1 << cce_bits) - 1)
+    shift += cce_bits
+    slc = (daddr >> shift) & ((1 << slice_bits) - 1)
+    shift += slice_bits
+    bank = (daddr >> shift) & ((1 << bank_bits) - 1)
+    shift += bank_bits
+    tag = daddr >> shift
+
+    paddr = block
+    shift = block_bits
+    paddr |= cce << shift
+    shift += cce_bits
+    paddr |= slc << shift
+    shift += slice_bits
+    paddr |= bank << shift
+    shift += bank_bits
+    paddr |= sets << shift
+    shift += set_bits
+    return paddr | tag << shift
+
+
+class DramModel:
+    """Backing memory for the L2 DMA channels (bsg_cache_dma_pkt_s).
+
+    All channels share one coroutine because their valid/ready bits are
+    packed into common vectors. A read packet is answered with a block of
+    fill-width beats after `latency` cycles; a write packet consumes a block
+    of beats from dma_data_o and writes the words enabled by its mask.
+    """
+
+    def __init__(self, dut, clock, memory, channels=2, daddr_width=33,
+                 block_bytes=64, latency=10, hash_bits=None):
+        self.dut = dut
+        self.clock = clock
+        self.memory = memory
+        self.channels = channels
+        self.latency = latency
+        self.hash_bits = hash_bits or {}
+
+        self.fill_width = len(dut.dma_data_i) // channels
+        self.fill_bytes = self.fill_width // 8
+        self.beats = block_bytes // self.fill_bytes
+        self.pkt_width = len(dut.dma_pkt_o) // channels
+        self.mask_width = self.pkt_width - 1 - daddr_width
+        self.daddr_mask = (1 << daddr_width) - 1
+        self.words_per_beat = max(1, self.mask_width // self.beats)
+        self.word_bytes = max(1, self.fill_bytes // self.words_per_beat)
+
+        self.reads = 0
+        self.writes = 0
+        self.cycle = 0
+        self._task = None
+
+    def start(self):
+        """Start servicing DMA channels; returns self."""
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def _paddr(self, daddr):
+        return dram_hash_decode(daddr, **self.hash_bits)
+
+    async def _run(self):
+        dut = self.dut
+        edge = RisingEdge(self.clock)
+        memory = self.memory
+        fill_bytes = self.fill_bytes
+        fill_mask = (1 << self.fill_width) - 1
+        pkt_mask = (1 << self.pkt_width) - 1
+        channels = range(self.channels)
+        words_per_beat = self.words_per_beat
+        beat_bits = (1 << words_per_beat) - 1
+        word_enable = (1 << self.word_bytes) - 1
+        # byte enable of a fill beat for each combination of its word mask bits
+        byteen = [
+            sum(word_enable << (i * self.word_bytes) for i in range(words_per_beat) if bits >> i & 1)
+            for bits in range(1 << words_per_beat)
+        ]
+
+        reads = [[] for _ in channels]     # per channel: [ready cycle, paddr, beat]
+        writes = [[] for _ in channels]    # per channel: [paddr, mask, beat]
+        rd_valid = 0
+        data_in = 0
+
+        dut.dma_pkt_ready_and_i.value = (1 << self.channels) - 1
+        dut.dma_data_v_i.value = 0
+        dut.dma_data_ready_and_i.value = 0
+        while True:
+            await edge
+            self.cycle += 1
+            cycle = self.cycle
+
+            # Read data beats accepted by the cache
+            if rd_valid:
+                taken = rd_valid & _read(dut.dma_data_ready_and_o)
+                for ch in channels:
+                    if taken >> ch & 1:
+                        burst = reads[ch][0]
+                        burst[2] += 1
+                        if burst[2] == self.beats:
+                            reads[ch].pop(0)
+
+            # Write data beats from the cache
+            wr_ready = sum(1 << ch for ch in channels if writes[ch])
+            if wr_ready:
+                wr_valid = wr_ready & _read(dut.dma_data_v_o)
+                if wr_valid:
+                    data_out = _read(dut.dma_data_o)
+                    for ch in channels:
+                        if wr_valid >> ch & 1:
+                            burst = writes[ch][0]
+                            beat = burst[2]
+                            word = (data_out >> (ch * self.fill_width)) & fill_mask
+                            enable = byteen[(burst[1] >> (beat * words_per_beat)) & beat_bits]
+                            if enable:
+                                memory.write_word(burst[0] + beat * fill_bytes, word, fill_bytes, enable)
+                            burst[2] += 1
+                            if burst[2] == self.beats:
+                                writes[ch].pop(0)
+
+            # New packets
+            pkt_valid = _read(dut.dma_pkt_v_o)
+            if pkt_valid:
+                pkts = _read(dut.dma_pkt_o)
+                for ch in channels:
+                    if pkt_valid >> ch & 1:
+                        pkt = (pkts >> (ch * self.pkt_width)) & pkt_mask
+                        mask = pkt & ((1 << self.mask_width) - 1)
+                        daddr = (pkt >> self.mask_width) & self.daddr_mask
+                        paddr = self._paddr(daddr)
+                        if pkt >> (self.pkt_width - 1):
+                            writes[ch].append([paddr, mask, 0])
+                            self.writes += 1
+                        else:
+                            reads[ch].append([cycle + self.latency, paddr, 0])
+                            self.reads += 1
+
+            # Drive read data for the next edge
+            rd_valid = 0
+            data_in = 0
+            for ch in channels:
+                if reads[ch] and reads[ch][0][0] <= cycle:
+                    burst = reads[ch][0]
+                    word = memory.read_word(burst[1] + burst[2] * fill_bytes, fill_bytes)
+                    data_in |= word << (ch * self.fill_width)
+                    rd_valid |= 1 << ch
+            dut.dma_data_v_i.value = rd_valid
+            if rd_valid:
+                dut.dma_data_i.value = data_in
+            dut.dma_data_ready_and_i.value = sum(1 << ch for ch in channels if writes[ch])
@@ -0,0 +1,35 @@
+"""Stimulus generation and record layout shared by the fuzzer and its runner.
+
+Kept free of cocotb imports so fuzz_constructs.py can regenerate the exact
+vectors a simulator saw when it needs to report a mismatch.
+"""
+
+# Fraction of vectors that use a width-aware corner value instead of a
+# uniform random one (0, 1, all-ones, MSB only, all-ones minus MSB)
+CORNER_RATE = 0.125
+
+
+def corner_values(width):
+    """Return the corner-case values for a port of the given width."""
+    mask = (1 << width) - 1
+    msb = 1 << (width - 1)
+    return sorted({0, 1 & mask, mask, msb, mask ^ msb})
+
+
+def generate_block(rng, widths, corners, count):
+    """Generate `count` input vectors as tuples of ints, one per input port."""
+    getrandbits = rng.getrandbits
+    rand = rng.random
+    choice = rng.choice
+    block = []
+    for _ in range(count):
+        block.append(tuple(
+            choice(corner) if rand() < CORNER_RATE else getrandbits(width)
+            for width, corner in zip(widths, corners)
+        ))
+    return block
+
+
+def record_layout(widths):
+    """Return (per-output byte counts, mask byte count) for a sample record."""
+    return [(w + 7) // 8 for w in widths], (len(widths) + 7) // 8
@@ -0,0 +1,232 @@
+"""Program image loader for $readmemh and Intel HEX files.
+
+Both formats are parsed into contiguous (base address, bytes) segments. The
+result is cached next to the source as a memory-mappable binary named
+`.<source name>.<digest>.hexcache`, where the digest is the SHA-256 of the
+source text. Later loads hash the source, map the cache and hand out
+zero-copy views, so no text is parsed after the first run. Caches for an
+older version of the same source are removed when a new one is written.
+
+Cache layout (little-endian):
+
+    8 bytes   magic b"HEXCACHE"
+    4 bytes   format version
+    4 bytes   segment count N
+    N x 16    (u64 base address, u32 payload offset, u32 length)
+    ...       segment payloads
+
+Usage:
+
+    segments = load_program("programs/coremark.hex")
+    memory.load_segments(segments)
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+MAGIC = b"HEXCACHE"
+VERSION = 1
+CACHE_SUFFIX = ".hexcache"
+
+_HEADER = struct.Struct("<8sII")
+_ENTRY = struct.Struct("<QII")
+
+
+def coalesce(chunks):
+    """Merge (address, bytes) chunks into sorted, contiguous segments.
+
+    Later chunks overwrite earlier ones where they overlap.
+    """
+    image = {}
+    for addr, data in chunks:
+        for i, byte in enumerate(data):
+            image[addr + i] = byte
+    segments = []
+    base = None
+    current = bytearray()
+    for addr in sorted(image):
+        if base is not None and addr == base + len(current):
+            current.append(image[addr])
+            continue
+        if base is not None:
+            segments.append((base, bytes(current)))
+        base = addr
+        current = bytearray([image[addr]])
+    if base is not None:
+        segments.append((base, bytes(current)))
+    return segments
+
+
+def parse_readmemh(text):
+    """Parse $readmemh text into segments.
+
+    `@addr` sets the address in words; each data token is one word whose size
+    is set by its digit count (two digits = one byte, so the VeeR byte-wide
+    images are byte-addressed). Words are stored little-endian.
+    """
+    chunks = []
+    addr = 0
+    word_bytes = None
+    run = bytearray()
+    run_start = 0
+    for line in text.splitlines():
+        line = line.split("//", 1)[0]
+        for token in line.split():
+            if token.startswith("@"):
+                if run:
+                    chunks.append((run_start, bytes(run)))
+                    run = bytearray()
+                addr = int(token[1:], 16)
+                continue
+            token = token.replace("_", "")
+            if word_bytes is None:
+                word_bytes = (len(token) + 1) // 2
+            if not run:
+                run_start = addr * word_bytes
+            run += int(token, 16).to_bytes(word_bytes, "little")
+            addr += 1
+    if run:
+        chunks.append((run_start, bytes(run)))
+    return coalesce(chunks)
+
+
+def parse_ihex(text):
+    """Parse Intel HEX text into segments.
+
+    Handles data (00), end-of-file (01), extended segment (02) and extended
+    linear (04) address records; start address records are ignored.
+
+    Raises ValueError on a malformed record or checksum mismatch.
+    """
+    chunks = []
+    upper = 0
+    for lineno, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith(":"):
+            raise ValueError(f"line {lineno}: not an Intel HEX record")
+        try:
+            record = bytes.fromhex(line[1:])
+        except ValueError:
+            raise ValueError(f"line {lineno}: invalid hex digits") from None
+        if len(record) < 5 or len(record) != record[0] + 5:
+            raise ValueError(f"line {lineno}: bad record length")
+        if sum(record) & 0xFF:
+            raise ValueError(f"line {lineno}: checksum mismatch")
+        count, offset, kind = record[0], int.from_bytes(record[1:3], "big"), record[3]
+        data = record[4:4 + count]
+        if kind == 0x00:
+            chunks.append((upper + offset, data))
+        elif kind == 0x01:
+            break
+        elif kind == 0x02:
+            upper = int.from_bytes(data, "big") << 4
+        elif kind == 0x04:
+            upper = int.from_bytes(data, "big") << 16
+    return coalesce(chunks)
+
+
+def parse_hex(text):
+    """Parse either format, detected from the first non-blank character."""
+    if text.lstrip().startswith(":"):
+        return parse_ihex(text)
+    return parse_readmemh(text)
+
+
+def cache_path(source, digest):
+    """Return the cache file path for a source file and its digest."""
+    source = Path(source)
+    return source.with_name(f".{source.name}.{digest[:16]}{CACHE_SUFFIX}")
+
+
+def write_cache(path, segments):
+    """Atomically write segments to a cache file."""
+    offset = _HEADER.size + _ENTRY.size * len(segments)
+    table = bytearray(_HEADER.pack(MAGIC, VERSION, len(segments)))
+    for base, data in segments:
+        table += _ENTRY.pack(base, offset, len(data))
+        offset += len(data)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(table)
+            for _, data in segments:
+                f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def read_cache(path):
+    """Map a cache file and return segments as memoryviews into the mapping.
+
+    Returns None if the file is missing or not a valid cache.
+    """
+    try:
+        with open(path, "rb") as f:
+            image = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(image) < _HEADER.size:
+        return None
+    magic, version, count = _HEADER.unpack_from(image, 0)
+    if magic != MAGIC or version != VERSION:
+        return None
+    view = memoryview(image)
+    segments = []
+    for i in range(count):
+        base, offset, length = _ENTRY.unpack_from(image, _HEADER.size + i * _ENTRY.size)
+        if offset + length > len(image):
+            return None
+        segments.append((base, view[offset:offset + length]))
+    return segments
+
+
+def load_program(source, use_cache=True):
+    """Return the segments of a hex program, using the binary cache if possible.
+
+    A missing or unwritable cache directory only costs the text parse.
+    """
+    source = Path(source)
+    raw = source.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    path = cache_path(source, digest)
+
+    if use_cache:
+        segments = read_cache(path)
+        if segments is not None:
+            return segments
+
+    segments = parse_hex(raw.decode("ascii"))
+    if use_cache:
+        for stale in source.parent.glob(f".{source.name}.*{CACHE_SUFFIX}"):
+            if stale != path:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+        try:
+            write_cache(path, segments)
+        except OSError:
+            pass
+    return segments
+
+
+def main(argv=None):
+    """Warm the cache for the given hex files and print their segments."""
+    for name in (argv if argv is not None else sys.argv[1:]):
+        segments = load_program(name)
+        print(f"{name}:")
+        for base, data in segments:
+            print(f"  0x{base:08x}  {len(data):8d} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Sparse, page-allocated byte memory for cocotb bus models.
+
+Pages are bytearrays created on first write, so a 4 GiB address space with a
+few hundred KiB of program and data costs a few pages. Reads of untouched
+memory return zeros without allocating. Word accesses that stay inside one
+page (the common case for aligned bus beats) take a single slice.
+"""
+
+DEFAULT_PAGE_BITS = 16  # 64 KiB pages
+
+
+class SparseMemory:
+    """Little-endian byte-addressed memory backed by lazily allocated pages."""
+
+    def __init__(self, page_bits=DEFAULT_PAGE_BITS):
+        self.page_bits = page_bits
+        self.page_size = 1 << page_bits
+        self.page_mask = self.page_size - 1
+        self.pages = {}
+
+    def _page(self, index):
+        page = self.pages.get(index)
+        if page is None:
+            page = self.pages[index] = bytearray(self.page_size)
+        return page
+
+    def read(self, addr, length):
+        """Return `length` bytes starting at `addr`."""
+        out = bytearray()
+        while length > 0:
+            offset = addr & self.page_mask
+            chunk = min(length, self.page_size - offset)
+            page = self.pages.get(addr >> self.page_bits)
+            out += page[offset:offset + chunk] if page is not None else bytes(chunk)
+            addr += chunk
+            length -= chunk
+        return bytes(out)
+
+    def write(self, addr, data):
+        """Write a bytes-like object starting at `addr`."""
+        data = memoryview(data)
+        while len(data):
+            offset = addr & self.page_mask
+            chunk = min(len(data), self.page_size - offset)
+            self._page(addr >> self.page_bits)[offset:offset + chunk] = data[:chunk]
+            addr += chunk
+            data = data[chunk:]
+
+    def read_word(self, addr, nbytes):
+        """Return `nbytes` at `addr` as an unsigned little-endian int."""
+        offset = addr & self.page_mask
+        if offset + nbytes <= self.page_size:
+            page = self.pages.get(addr >> self.page_bits)
+            if page is None:
+                return 0
+            return int.from_bytes(page[offset:offset + nbytes], "little")
+        return int.from_bytes(self.read(addr, nbytes), "little")
+
+    def write_word(self, addr, value, nbytes, strobe=None):
+        """Write `nbytes` of `value` at `addr`, honouring a byte-enable mask.
+
+        `strobe` has one bit per byte (bit 0 = lowest address); None writes
+        every byte.
+        """
+        full = (1 << nbytes) - 1
+        data = value.to_bytes(nbytes, "little")
+        if strobe is None or strobe & full == full:
+            offset = addr & self.page_mask
+            if offset + nbytes <= self.page_size:
+                self._page(addr >> self.page_bits)[offset:offset + nbytes] = data
+            else:
+                self.write(addr, data)
+            return
+        for i in range(nbytes):
+            if strobe >> i & 1:
+                a = addr + i
+                self._page(a >> self.page_bits)[a & self.page_mask] = data[i]
+
+    def load_segments(self, segments):
+        """Write (base address, bytes) segments, e.g. from tb_common.hexload."""
+        for base, data in segments:
+            self.write(base, data)
@@ -0,0 +1,39 @@
+"""Testbench-reported performance metrics.
+
+A cocotb test calls record_metrics() to report numbers the harness cannot
+see from outside the simulator (simulated cycles per second, instructions
+retired, ...). run_benchmarks.py names a JSON file through the
+TB_METRICS_FILE environment variable and copies its contents into the
+result's "metrics" field:
+
+    {"test_kernel": {"gpu_cycles": 31512, "gpu_cycles_per_sec": 20410.5}}
+
+Without TB_METRICS_FILE (e.g. a plain `make`), record_metrics() does nothing.
+"""
+
+import json
+import os
+from pathlib import Path
+
+ENV_VAR = "TB_METRICS_FILE"
+
+
+def read_metrics(path):
+    """Return the metrics stored at `path`, or {} if absent or unreadable."""
+    try:
+        data = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def record_metrics(group, **values):
+    """Merge `values` into metrics[group] in the file named by TB_METRICS_FILE."""
+    path = os.environ.get(ENV_VAR)
+    if not path:
+        return
+    metrics = read_metrics(path)
+    metrics.setdefault(group, {}).update(values)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(metrics, indent=2))
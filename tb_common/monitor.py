@@ -0,0 +1,171 @@
+"""Batched signal sampling for per-cycle monitors.
+
+A hand-written monitor typically does, every cycle:
+
+    await RisingEdge(dut.clk)
+    try:
+        if int(dut.mem_req_valid.value) == 1: ...
+    except ValueError:
+        pass
+
+which re-resolves the handle, builds a new trigger and pays for an
+exception whenever a bit is X/Z. SignalSampler resolves handles once,
+reuses a single trigger and appends raw ints into preallocated per-signal
+arrays; X/Z bits are recorded in a parallel mask instead of raising.
+
+Modes:
+  - every=N (default 1): sample all signals every N clock edges
+  - mode="change": sample a signal whenever it changes (one value-change
+    callback per signal, nothing at all while it is stable)
+  - mode="edge": sample all signals on the rising (or falling) edge of
+    `trigger`, e.g. a valid strobe
+
+Usage:
+
+    sampler = SignalSampler(dut.clk, [dut.mem_req_valid, dut.busy], every=1).start()
+    await ClockCycles(dut.clk, 100)
+    sampler.stop()
+    if sampler["mem_req_valid"].any(): ...
+
+Every sample is stamped with the simulation time in simulator steps.
+"""
+
+from array import array
+
+import cocotb
+from cocotb.triggers import ClockCycles, FallingEdge, RisingEdge
+from cocotb.utils import get_sim_time
+
+try:
+    from cocotb.triggers import ValueChange
+except ImportError:     # cocotb 1.x
+    from cocotb.triggers import Edge as ValueChange
+
+from tb_common.values import _RESOLVE
+
+# 9-state characters that are X/Z: the unknown-bit mask
+_UNKNOWN = str.maketrans("01xXzZuUwW-lLhH", "001111111110000")
+
+MODES = ("every", "change", "edge")
+
+
+class Trace:
+    """Samples of one signal: parallel `stamps`, `values` and `xz` arrays.
+
+    Only the first `count` entries are valid. Signals up to 64 bits wide
+    are stored in array('Q'); wider ones in preallocated lists.
+    """
+
+    def __init__(self, handle, capacity):
+        self.handle = handle
+        self.name = handle._name
+        self.width = len(handle)
+        self.count = 0
+        self.stamps = array("Q", bytes(8 * capacity))
+        if self.width <= 64:
+            self.values = array("Q", bytes(8 * capacity))
+            self.xz = array("Q", bytes(8 * capacity))
+        else:
+            self.values = [0] * capacity
+            self.xz = [0] * capacity
+
+    def _grow(self):
+        extra = len(self.stamps)
+        self.stamps.extend(array("Q", bytes(8 * extra)))
+        if isinstance(self.values, array):
+            self.values.extend(array("Q", bytes(8 * extra)))
+            self.xz.extend(array("Q", bytes(8 * extra)))
+        else:
+            self.values.extend([0] * extra)
+            self.xz.extend([0] * extra)
+
+    def record(self, stamp):
+        """Read the handle and append one sample."""
+        i = self.count
+        if i == len(self.stamps):
+            self._grow()
+        value = self.handle.value
+        self.stamps[i] = stamp
+        if value.is_resolvable:
+            self.values[i] = int(value)
+        else:
+            text = str(value)
+            self.values[i] = int(text.translate(_RESOLVE), 2)
+            self.xz[i] = int(text.translate(_UNKNOWN), 2)
+        self.count = i + 1
+
+    def samples(self):
+        """Return the recorded samples as (stamp, value, xz mask) tuples."""
+        n = self.count
+        return list(zip(self.stamps[:n], self.values[:n], self.xz[:n]))
+
+    def any(self):
+        """Return True if any sample had a known non-zero bit."""
+        values, xz = self.values, self.xz
+        return any(values[i] & ~xz[i] for i in range(self.count))
+
+    def unknown(self):
+        """Return the number of samples with at least one X/Z bit."""
+        xz = self.xz
+        return sum(1 for i in range(self.count) if xz[i])
+
+
+class SignalSampler:
+    """Sample a declared set of signals into Traces, indexed by signal name."""
+
+    def __init__(self, clock, signals, mode="every", every=1, trigger=None,
+                 edge="rising", capacity=4096):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        if mode == "edge" and trigger is None:
+            raise ValueError("mode='edge' needs a trigger signal")
+        self.clock = clock
+        self.mode = mode
+        self.every = every
+        self.trigger = trigger
+        self.edge = edge
+        self.traces = [Trace(handle, capacity) for handle in signals]
+        self._by_name = {trace.name: trace for trace in self.traces}
+        self._running = False
+        self._tasks = []
+
+    def __getitem__(self, name):
+        return self._by_name[name]
+
+    def start(self):
+        """Start sampling; returns self."""
+        self._running = True
+        if self.mode == "change":
+            self._tasks = [cocotb.start_soon(self._watch(trace)) for trace in self.traces]
+        else:
+            self._tasks = [cocotb.start_soon(self._sample_all())]
+        return self
+
+    def stop(self):
+        """Stop sampling after the current trigger; recorded data is kept."""
+        self._running = False
+
+    async def _sample_all(self):
+        if self.mode == "edge":
+            wait = (RisingEdge if self.edge == "rising" else FallingEdge)(self.trigger)
+        elif self.every == 1:
+            wait = RisingEdge(self.clock)
+        else:
+            wait = ClockCycles(self.clock, self.every)
+        traces = self.traces
+        while True:
+            await wait
+            if not self._running:
+                return
+            stamp = get_sim_time("step")
+            for trace in traces:
+                trace.record(stamp)
+
+    async def _watch(self, trace):
+        wait = ValueChange(trace.handle)
+        trace.record(get_sim_time("step"))
+        while True:
+            await wait
+            if not self._running:
+                return
+            trace.record(get_sim_time("step"))
@@ -0,0 +1,105 @@
+"""Declarative port initialization from a per-design ports.yaml.
+
+Large tops have a hundred or more inputs that reset_dut() must drive to a
+known value. Writing them as `dut.<name>.value = 0` one by one repeats a
+VPI handle lookup for every port on every reset and copies the same list
+into each testbench. A ports.yaml lists them once, per phase:
+
+    templates:            # optional, added to TEMPLATES below
+      my_bus: {valid: 0, ready: 1}
+    phases:
+      reset:
+        ports:
+          rst_l: 0
+          rst_vec: 0x40000000     # 0x80000000 >> 1, port is [31:1]
+        templates:
+          axi_slave_idle: [lsu_axi, ifu_axi, sb_axi]
+      release:
+        ports: {rst_l: 1}
+
+A template maps port suffixes to values and is applied to each listed
+prefix as `<prefix>_<suffix>`. load_ports() resolves every handle once per
+simulation and caches the result, so later resets only assign values:
+
+    ports = load_ports(dut, PORTS)
+    ports.apply("reset")
+    await ClockCycles(dut.clk, 5)
+    ports.apply("release")
+"""
+
+from pathlib import Path
+
+import yaml
+
+# Inputs of an AXI4 port when the testbench plays an idle slave
+AXI_SLAVE_IDLE = {
+    name: 0 for name in (
+        "awready", "wready", "bvalid", "bresp", "bid",
+        "arready", "rvalid", "rid", "rdata", "rresp", "rlast",
+    )
+}
+
+# Inputs of an AXI4 port when the testbench plays an idle master
+AXI_MASTER_IDLE = {
+    name: 0 for name in (
+        "awvalid", "awid", "awaddr", "awsize", "awprot", "awlen", "awburst",
+        "wvalid", "wdata", "wstrb", "wlast", "bready",
+        "arvalid", "arid", "araddr", "arsize", "arprot", "arlen", "arburst",
+        "rready",
+    )
+}
+
+TEMPLATES = {
+    "axi_slave_idle": AXI_SLAVE_IDLE,
+    "axi_master_idle": AXI_MASTER_IDLE,
+}
+
+_cache = {}
+
+
+def expand(spec):
+    """Return {phase: [(port name, value)]} from a parsed ports.yaml.
+
+    Raises ValueError for an unknown template name.
+    """
+    templates = {**TEMPLATES, **(spec.get("templates") or {})}
+    phases = {}
+    for phase, body in (spec.get("phases") or {}).items():
+        assignments = list((body.get("ports") or {}).items())
+        for name, prefixes in (body.get("templates") or {}).items():
+            if name not in templates:
+                raise ValueError(f"phase {phase!r}: unknown template {name!r}")
+            for prefix in prefixes:
+                assignments += [(f"{prefix}_{suffix}", value)
+                                for suffix, value in templates[name].items()]
+        phases[phase] = assignments
+    return phases
+
+
+class PortMap:
+    """Resolved (handle, value) lists for each phase of a ports.yaml."""
+
+    def __init__(self, dut, phases):
+        self.phases = {
+            phase: [(getattr(dut, name), value) for name, value in assignments]
+            for phase, assignments in phases.items()
+        }
+
+    def __len__(self):
+        return sum(len(assignments) for assignments in self.phases.values())
+
+    def apply(self, phase):
+        """Assign every port of `phase`; the writes land in one scheduler pass."""
+        for handle, value in self.phases[phase]:
+            handle.value = value
+
+
+def load_ports(dut, path):
+    """Return the PortMap for `path`, resolving handles on first use only."""
+    key = (id(dut), Path(path).resolve())
+    ports = _cache.get(key)
+    if ports is None:
+        with open(path) as f:
+            spec = yaml.safe_load(f) or {}
+        ports = _cache[key] = PortMap(dut, expand(spec))
+    return ports
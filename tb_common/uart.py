@@ -0,0 +1,114 @@
+"""Edge-driven UART transmit monitor.
+
+Polling a TX pin every clock from Python costs one VPI read per cycle for
+the whole run. UartMonitor instead waits for the falling edge of a start
+bit and then reads the pin only at the middle of each bit, using timers
+computed from the bit period: ten reads per 8N1 character and nothing while
+the line is idle. Each start bit resynchronises the timing, so the bit
+period only has to be accurate to a few percent over one character.
+
+The bit period is given in clock cycles of the clock that drives the UART.
+Designs record it in config.yaml as the SoC clock frequency the software
+assumes and the baud rate it programs:
+
+    uart:
+      tx: o_pad_uart0_sout
+      clock_hz: 100000000
+      baud: 115200
+
+Usage:
+
+    settings = uart_config(DESIGN_DIR / "config.yaml")
+    console = UartMonitor(getattr(dut, settings["tx"]), 10, settings["clocks_per_bit"],
+                          log=dut._log).start()
+    await console.wait_for("Hello World")
+"""
+
+import cocotb
+import yaml
+from cocotb.triggers import Event, FallingEdge, Timer
+
+from tb_common.values import read_int as _read
+
+_PS_PER_UNIT = {"fs": 1e-3, "ps": 1, "ns": 1e3, "us": 1e6, "ms": 1e9, "sec": 1e12}
+
+
+def uart_config(path):
+    """Return the `uart` section of a config.yaml with clocks_per_bit added, or None."""
+    with open(path) as f:
+        config = yaml.safe_load(f) or {}
+    settings = config.get("uart")
+    if not settings:
+        return None
+    settings = dict(settings)
+    settings["clocks_per_bit"] = settings["clock_hz"] / settings["baud"]
+    return settings
+
+
+class UartMonitor:
+    """Decode 8N1 (or `data_bits`-N-1) characters transmitted on `pin`.
+
+    Received bytes are appended to `output`; complete lines are logged
+    through `log` if given. `framing_errors` counts characters whose stop
+    bit was low.
+    """
+
+    def __init__(self, pin, clock_period, clocks_per_bit, units="ns", data_bits=8, log=None):
+        self.pin = pin
+        self.data_bits = data_bits
+        self.log = log
+        # Whole picoseconds so the timers need no rounding by the simulator
+        self.bit_ps = round(clock_period * clocks_per_bit * _PS_PER_UNIT[units])
+
+        self.output = bytearray()
+        self.framing_errors = 0
+        self._line = bytearray()
+        self._received = Event()
+        self._task = None
+
+    @property
+    def text(self):
+        """Everything received so far, decoded as ASCII."""
+        return self.output.decode("ascii", errors="replace")
+
+    def start(self):
+        """Start monitoring the pin; returns self."""
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    async def wait_for(self, text):
+        """Wait until `text` appears in the received output."""
+        needle = text.encode("ascii")
+        while needle not in self.output:
+            self._received.clear()
+            await self._received.wait()
+
+    def _receive(self, byte):
+        self.output.append(byte)
+        if byte == 0x0A:
+            if self.log is not None:
+                self.log.info("uart: %s", self._line.decode("ascii", errors="replace"))
+            self._line.clear()
+        elif byte != 0x0D:
+            self._line.append(byte)
+        self._received.set()
+
+    async def _run(self):
+        pin = self.pin
+        start = FallingEdge(pin)
+        half_bit = Timer(self.bit_ps // 2, units="ps")
+        bit = Timer(self.bit_ps, units="ps")
+        while True:
+            await start
+            await half_bit
+            if _read(pin):
+                continue    # glitch, not a start bit
+            value = 0
+            for i in range(self.data_bits):
+                await bit
+                value |= _read(pin) << i
+            await bit
+            if not _read(pin):
+                self.framing_errors += 1
+            self._receive(value)
+
@@ -0,0 +1,20 @@
+"""Conversions of cocotb signal values that tolerate X/Z bits."""
+
+# 9-state characters that do not resolve to a bit value read as 0; weak
+# drivers read as their strong counterpart
+_RESOLVE = str.maketrans("xXzZuUwW-lLhH", "0000000000011")
+
+
+def to_int(value):
+    """Return a signal value as an unsigned int with X/Z bits read as 0.
+
+    Fully resolvable values (the common case) take the fast path.
+    """
+    if value.is_resolvable:
+        return int(value)
+    return int(str(value).translate(_RESOLVE), 2)
+
+
+def read_int(handle):
+    """Read a handle and return its value as with to_int()."""
+    return to_int(handle.value)
@@ -0,0 +1,82 @@
+"""AXI memory and program runner shared by the VeeR EL2, EH1 and EH2 testbenches.
+
+All three wrappers expose the same IFU, LSU and SB AXI4 ports, and the
+upstream tb_top of each reports program results through the same mailbox,
+so only the reset vector differs between them:
+
+  - attach_memory(): serves the IFU, LSU and SB ports from one
+    tb_common.memory.SparseMemory through tb_common.axi.AxiSlave, optionally
+    with a self-jump at the reset vector to keep the core fetching
+  - run_program(): loads a programs/*.hex image through tb_common.hexload
+    and collects the mailbox output until the program passes or fails
+
+The design's own reset_dut() (its port defaults come from ports.yaml) runs
+before either.
+"""
+
+from cocotb.triggers import ClockCycles, Event, First
+
+from tb_common.axi import AxiSlave
+from tb_common.hexload import load_program
+from tb_common.memory import SparseMemory
+
+# Upstream tb_top mailbox: byte stores print, 0xff passes, 0x01 fails
+MAILBOX = 0xD0580000
+
+# RV32 "jal x0, 0": an infinite loop on itself
+JUMP_SELF = 0x0000006F
+
+AXI_PORTS = ("ifu", "lsu", "sb")
+
+
+def attach_memory(dut, reset_vector=None, memory=None, latency=2):
+    """Serve the IFU, LSU and SB AXI ports from one sparse memory.
+
+    Call after reset; the slaves take over the response signals reset tied
+    to idle. With `reset_vector`, a JUMP_SELF is written there so the core
+    keeps fetching the same line. Returns (memory, {"ifu": slave, ...}).
+    """
+    if memory is None:
+        memory = SparseMemory()
+    if reset_vector is not None:
+        memory.write_word(reset_vector, JUMP_SELF, 4)
+    slaves = {
+        bus: AxiSlave(dut, f"{bus}_axi", dut.clk, memory,
+                      read_latency=latency, write_latency=latency).start()
+        for bus in AXI_PORTS
+    }
+    return memory, slaves
+
+
+async def run_program(dut, program, max_cycles):
+    """Load a hex program, run it and collect its mailbox output.
+
+    Call after reset. Follows the upstream tb_top mailbox protocol: each
+    byte stored to MAILBOX is a character of output, 0xff ends the run with
+    success and 0x01 with failure. Wider stores are read one strobed byte
+    lane at a time, lowest first; a store with no lanes enabled is ignored.
+    Returns (output text, passed).
+    """
+    memory, slaves = attach_memory(dut)
+    memory.load_segments(load_program(program))
+
+    output = bytearray()
+    result = []
+    done = Event()
+
+    def on_mailbox(addr, data, strobe):
+        for lane in range(strobe.bit_length()):
+            if result or not strobe >> lane & 1:
+                continue
+            byte = data >> (8 * lane) & 0xFF
+            if byte in (0xFF, 0x01):
+                result.append(byte == 0xFF)
+                done.set()
+            else:
+                output.append(byte)
+
+    slaves["lsu"].add_write_hook(MAILBOX, 8, on_mailbox)
+    await First(done.wait(), ClockCycles(dut.clk, max_cycles))
+    text = output.decode("ascii", errors="replace")
+    assert result, f"{program.name} did not finish within {max_cycles} cycles; output: {text!r}"
+    return text, result[0]
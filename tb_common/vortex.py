@@ -0,0 +1,144 @@
+"""Cocotb models for the Vortex GPU's memory and DCR interfaces.
+
+VortexMemory answers the top-level mem_req_*/mem_rsp_* ports from a
+SparseMemory. Requests carry a line address (mem_req_addr counts
+VX_MEM_DATA_WIDTH-bit lines) and a tag; reads are answered with the line and
+the same tag after a configurable latency, optionally out of order, which
+the Vortex caches must tolerate since they match responses by tag. Writes
+are posted: they update memory through mem_req_byteen and get no response.
+
+write_dcrs() drives the device configuration register port. The startup
+address and argument DCRs are sampled by the warp scheduler on reset, so
+the usual sequence is: reset, write DCRs, reset again, run until busy falls.
+"""
+
+import random
+
+import cocotb
+from cocotb.triggers import RisingEdge
+
+from tb_common.values import read_int as _read
+
+# VX_types.vh
+DCR_BASE_STARTUP_ADDR0 = 0x001
+DCR_BASE_STARTUP_ADDR1 = 0x002
+DCR_BASE_STARTUP_ARG0 = 0x003
+DCR_BASE_STARTUP_ARG1 = 0x004
+DCR_BASE_MPM_CLASS = 0x005
+
+# VX_config.vh (32-bit)
+STARTUP_ADDR = 0x80000000
+IO_COUT_ADDR = 0x00000040
+
+
+def startup_dcrs(addr=STARTUP_ADDR, arg=0):
+    """Return the [(dcr address, value)] writes that set the kernel entry point."""
+    return [
+        (DCR_BASE_STARTUP_ADDR0, addr & 0xFFFFFFFF),
+        (DCR_BASE_STARTUP_ADDR1, addr >> 32),
+        (DCR_BASE_STARTUP_ARG0, arg & 0xFFFFFFFF),
+        (DCR_BASE_STARTUP_ARG1, arg >> 32),
+    ]
+
+
+async def write_dcrs(dut, clock, writes):
+    """Drive one DCR write per clock cycle, then deassert dcr_wr_valid."""
+    edge = RisingEdge(clock)
+    for addr, value in writes:
+        dut.dcr_wr_valid.value = 1
+        dut.dcr_wr_addr.value = addr
+        dut.dcr_wr_data.value = value
+        await edge
+    dut.dcr_wr_valid.value = 0
+
+
+class VortexMemory:
+    """Memory-side responder for the Vortex mem_req_*/mem_rsp_* ports."""
+
+    def __init__(self, dut, clock, memory, latency=8, max_outstanding=32,
+                 reorder=False, seed=None):
+        self.clock = clock
+        self.memory = memory
+        self.latency = latency
+        self.max_outstanding = max_outstanding
+        self.reorder = reorder
+        self.rng = random.Random(seed)
+
+        self.req_valid, self.req_ready = dut.mem_req_valid, dut.mem_req_ready
+        self.req_rw, self.req_byteen = dut.mem_req_rw, dut.mem_req_byteen
+        self.req_addr, self.req_data = dut.mem_req_addr, dut.mem_req_data
+        self.req_tag = dut.mem_req_tag
+        self.rsp_valid, self.rsp_ready = dut.mem_rsp_valid, dut.mem_rsp_ready
+        self.rsp_data, self.rsp_tag = dut.mem_rsp_data, dut.mem_rsp_tag
+
+        self.line_bytes = len(self.req_data) // 8
+
+        self.hooks = []
+        self.reads = 0
+        self.writes = 0
+        self.cycle = 0
+        self._driven = {}
+        self._task = None
+
+    def add_write_hook(self, base, size, callback):
+        """Call `callback(addr, data, byteen)` for every line write into [base, base+size)."""
+        self.hooks.append((base, base + size, callback))
+
+    def start(self):
+        """Start servicing requests; returns self."""
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def _drive(self, handle, value):
+        if self._driven.get(handle) != value:
+            handle.value = value
+            self._driven[handle] = value
+
+    async def _run(self):
+        edge = RisingEdge(self.clock)
+        memory = self.memory
+        nbytes = self.line_bytes
+
+        pending = []      # [ready cycle, tag, line data]
+        active = None     # response currently driven on mem_rsp_*
+
+        self._drive(self.rsp_valid, 0)
+
+        while True:
+            await edge
+            self.cycle += 1
+            cycle = self.cycle
+
+            if active is not None and _read(self.rsp_ready):
+                pending.remove(active)
+                active = None
+
+            if self._driven.get(self.req_ready) and _read(self.req_valid):
+                addr = _read(self.req_addr) * nbytes
+                if _read(self.req_rw):
+                    data = _read(self.req_data)
+                    byteen = _read(self.req_byteen)
+                    memory.write_word(addr, data, nbytes, byteen)
+                    for lo, hi, callback in self.hooks:
+                        if lo <= addr < hi:
+                            callback(addr, data, byteen)
+                    self.writes += 1
+                else:
+                    pending.append([cycle + self.latency, _read(self.req_tag),
+                                    memory.read_word(addr, nbytes)])
+                    self.reads += 1
+
+            self._drive(self.req_ready, 1 if len(pending) < self.max_outstanding else 0)
+
+            if active is None and pending:
+                if self.reorder:
+                    ready = [p for p in pending if p[0] <= cycle]
+                    active = self.rng.choice(ready) if ready else None
+                elif pending[0][0] <= cycle:
+                    active = pending[0]
+            if active is not None:
+                self._drive(self.rsp_valid, 1)
+                self._drive(self.rsp_tag, active[1])
+                self._drive(self.rsp_data, active[2])
+            else:
+                self._drive(self.rsp_valid, 0)
@@ -0,0 +1,236 @@
+"""Per-signal VPI access counting for cocotb testbenches.
+
+`int(dut.x.value)` in a loop costs a handle lookup (cached after the first
+one), a VPI value read and a Python object per iteration; RisingEdge(clk)
+registers a VPI callback each time it is awaited. Neither shows up in a
+wall-clock number on its own. With TB_VPI_STATS_FILE set, install() wraps
+cocotb's Python layer and counts, per signal path and per cocotb test:
+
+    lookups   `dut.x` child-handle resolutions (cache hits included)
+    handles   the subset that had to ask the simulator for a new handle
+    reads     `.value` reads
+    writes    `.value` assignments
+    triggers  callback registrations (edge/value-change per signal, plus
+              "<timer>", "<readonly>", "<readwrite>" and "<nextstep>")
+
+and the time spent inside each kind in aggregate (lookup time includes
+the handle creation it triggered). The counts are written to the file
+after every test:
+
+    {"tests": {"test_kernel": {"totals": {"reads": 912004, "reads_seconds": 1.9, ...},
+                               "signals": {"Vortex.mem_req_valid": {"reads": 31512, ...}}}}}
+
+tb_common/__init__.py calls install() when the variable is set, so any
+testbench that imports tb_common is covered without changes; install()
+must run before the test module's @cocotb.test decorators. Everything is
+counted at the cocotb Python level, so the seconds include cocotb's own
+conversion work around each VPI call, and the counting adds overhead of
+its own: compare runs with the same setting only.
+"""
+
+import functools
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ENV_VAR = "TB_VPI_STATS_FILE"
+KINDS = ("lookups", "handles", "reads", "writes", "triggers")
+
+# register_*_callback functions of cocotb's simulator module; value-change
+# callbacks are attributed to their signal, the rest to a pseudo-signal
+_CALLBACKS = {
+    "register_value_change_callback": None,
+    "register_timed_callback": "<timer>",
+    "register_readonly_callback": "<readonly>",
+    "register_rwsynch_callback": "<readwrite>",
+    "register_nextstep_callback": "<nextstep>",
+}
+
+_installed = False
+_current = {"test": None, "signals": {}, "seconds": dict.fromkeys(KINDS, 0.0)}
+_handle_names = {}
+
+
+def _count(path, kind, seconds):
+    signal = _current["signals"].get(path)
+    if signal is None:
+        signal = _current["signals"][path] = dict.fromkeys(KINDS, 0)
+    signal[kind] += 1
+    _current["seconds"][kind] += seconds
+
+
+def _wrap_value(cls):
+    prop = cls.__dict__["value"]
+    fget, fset = prop.fget, prop.fset
+
+    def get(self):
+        start = time.perf_counter()
+        try:
+            return fget(self)
+        finally:
+            _count(self._path, "reads", time.perf_counter() - start)
+
+    def put(self, value):
+        start = time.perf_counter()
+        try:
+            fset(self, value)
+        finally:
+            _count(self._path, "writes", time.perf_counter() - start)
+
+    setattr(cls, "value", property(get, put if fset else None, prop.fdel, prop.__doc__))
+
+
+def _wrap_getattr(cls):
+    original = cls.__dict__["__getattr__"]
+
+    @functools.wraps(original)
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            return original(self, name)
+        start = time.perf_counter()
+        try:
+            return original(self, name)
+        finally:
+            _count(f"{self._path}.{name}", "lookups", time.perf_counter() - start)
+
+    cls.__getattr__ = __getattr__
+
+
+def _wrap_factory(module, name):
+    # SimHandle() (cocotb 1.x) / _make_sim_object() (2.x) build each new
+    # handle the simulator returned; cached lookups never reach them
+    original = getattr(module, name)
+
+    @functools.wraps(original)
+    def factory(handle, path, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(handle, path, *args, **kwargs)
+        finally:
+            _count(path, "handles", time.perf_counter() - start)
+            _handle_names[id(handle)] = path  # names value-change triggers
+
+    setattr(module, name, factory)
+
+
+def _handle_name(handle):
+    name = _handle_names.get(id(handle))
+    if name is None:
+        try:
+            name = handle.get_name_string()
+        except Exception:
+            name = "<signal>"
+        _handle_names[id(handle)] = name
+    return name
+
+
+def _wrap_callback(simulator, name, label):
+    original = getattr(simulator, name)
+
+    @functools.wraps(original)
+    def register(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            _count(label or _handle_name(args[0]), "triggers", time.perf_counter() - start)
+
+    setattr(simulator, name, register)
+
+
+def _flush():
+    path = os.environ.get(ENV_VAR)
+    if not path or _current["test"] is None:
+        return
+    stats = read_stats(path)
+    totals = {kind: sum(s[kind] for s in _current["signals"].values()) for kind in KINDS}
+    totals.update({f"{kind}_seconds": _current["seconds"][kind] for kind in KINDS})
+    stats.setdefault("tests", {})[_current["test"]] = {"totals": totals, "signals": _current["signals"]}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(stats))
+
+
+def _wrap_test_decorator(cocotb):
+    original = cocotb.test
+
+    def scoped(func):
+        @functools.wraps(func)
+        async def run(*args, **kwargs):
+            _current.update(test=func.__qualname__, signals={}, seconds=dict.fromkeys(KINDS, 0.0))
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _flush()
+        return run
+
+    @functools.wraps(original)
+    def test(*args, **kwargs):
+        if len(args) == 1 and not kwargs and callable(args[0]):
+            return original(scoped(args[0]))  # bare @cocotb.test
+        decorator = original(*args, **kwargs)
+        return lambda func: decorator(scoped(func))
+
+    cocotb.test = test
+
+
+def install():
+    """Start counting; a no-op without TB_VPI_STATS_FILE, outside a simulator
+    (cocotb.simulator not loaded, e.g. in the harness) or when already installed.
+    """
+    global _installed
+    if _installed or not os.environ.get(ENV_VAR) or "cocotb.simulator" not in sys.modules:
+        return
+    _installed = True
+
+    import cocotb
+    import cocotb.handle
+    from cocotb import simulator
+
+    for cls in vars(cocotb.handle).values():
+        if not isinstance(cls, type) or cls.__module__ != cocotb.handle.__name__:
+            continue
+        if isinstance(cls.__dict__.get("value"), property):
+            _wrap_value(cls)
+        if "__getattr__" in cls.__dict__ and hasattr(cls, "_child_path"):
+            _wrap_getattr(cls)
+    for name in ("SimHandle", "_make_sim_object"):
+        if callable(getattr(cocotb.handle, name, None)):
+            _wrap_factory(cocotb.handle, name)
+    for name, label in _CALLBACKS.items():
+        if callable(getattr(simulator, name, None)):
+            _wrap_callback(simulator, name, label)
+    _wrap_test_decorator(cocotb)
+
+
+def read_stats(path):
+    """Return the stats stored at `path`, or {} if absent or unreadable."""
+    try:
+        data = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def summarize(stats, top=20):
+    """Return design totals, per-test totals and the `top` busiest signals.
+
+    A signal's rank is its total count over all kinds and tests.
+    """
+    totals = {}
+    signals = {}
+    for test in (stats.get("tests") or {}).values():
+        for key, value in test["totals"].items():
+            totals[key] = totals.get(key, 0) + value
+        for path, counts in test["signals"].items():
+            merged = signals.setdefault(path, dict.fromkeys(KINDS, 0))
+            for kind in KINDS:
+                merged[kind] += counts.get(kind, 0)
+    busiest = sorted(signals.items(), key=lambda item: sum(item[1].values()), reverse=True)
+    return {
+        "totals": totals,
+        "tests": {name: test["totals"] for name, test in (stats.get("tests") or {}).items()},
+        "top_signals": [{"signal": path, **counts} for path, counts in busiest[:top]],
+    }